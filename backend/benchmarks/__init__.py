@@ -0,0 +1,6 @@
+"""
+Reproducible backend benchmarks.
+
+    python -m benchmarks.run --sizes 1000 100000 1000000 --output bench.json
+    python -m benchmarks.compare old.json new.json
+"""
@@ -0,0 +1,51 @@
+"""
+Compare two benchmark result files by median time.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Exits with status 1 when any benchmark got slower by more than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report['meta'], {
+        (r['name'], r['rows']): r for r in report['results'] if 'median' in r
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed slowdown in percent')
+    args = parser.parse_args(argv)
+
+    base_meta, base = load(args.baseline)
+    cand_meta, cand = load(args.candidate)
+    print(f"baseline {base_meta.get('commit')}  vs  candidate {cand_meta.get('commit')}")
+    print(f"{'benchmark':<24}{'rows':>10}{'baseline':>12}{'candidate':>12}{'change':>10}")
+
+    regressions = []
+    for key in sorted(base.keys() & cand.keys(), key=lambda k: (k[1], k[0])):
+        old, new = base[key]['median'], cand[key]['median']
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print(f'{key[0]:<24}{key[1]:>10,}{old * 1000:>10.1f}ms{new * 1000:>10.1f}ms{change:>+9.1f}%{flag}')
+
+    for key in sorted(base.keys() ^ cand.keys()):
+        print(f'{key[0]:<24}{key[1]:>10,}  only in {"baseline" if key in base else "candidate"}')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Seeded synthetic CSV generator for the ChemViz equipment schema."""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from chemviz_core.units import header_unit
+
+EQUIPMENT_TYPES = {
+    # type: (flowrate mean, pressure mean, temperature mean)
+    'Pump': (120.0, 8.0, 45.0),
+    'Valve': (60.0, 5.0, 40.0),
+    'Heat Exchanger': (200.0, 6.5, 110.0),
+    'Column': (150.0, 2.5, 120.0),
+    'Reactor': (90.0, 15.0, 150.0),
+    'Separator': (180.0, 10.0, 80.0),
+    'Dryer': (40.0, 1.2, 95.0),
+    'Pressure Vessel': (0.0, 25.0, 60.0),
+    'Storage Tank': (20.0, 1.0, 30.0),
+    'Cooling Tower': (450.0, 1.5, 35.0),
+    'Compressor': (300.0, 20.0, 90.0),
+}
+
+HEADER_VARIANTS = {
+    'standard': ['Equipment Name', 'Type', 'Flowrate (L/min)', 'Pressure (bar)', 'Temperature (°C)'],
+    'snake': ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature'],
+    'messy': ['  Name ', 'Equipment Type', 'Flow (L/min)', 'Pressure(bar)', ' Temp (°C)'],
+    'upper': ['EQUIPMENT NAME', 'TYPE', 'FLOW', 'PRESSURE', 'TEMP'],
+    # Converted to the canonical units on ingest.
+    'imperial': ['Equipment Name', 'Type', 'Flowrate (gal/min)', 'Pressure (psi)', 'Temperature (°F)'],
+}
+TIMESTAMP_HEADER = 'Timestamp'
+
+
+def generate_frame(rows, seed=0, types=None, header_variant='standard',
+                   bad_fraction=0.0, timestamps=False, equipment_count=None):
+    """
+    Build a DataFrame of ``rows`` readings. The same arguments always yield the
+    same frame. ``bad_fraction`` of the numeric cells are replaced with junk
+    strings; ``timestamps`` adds one reading per second per equipment item.
+    """
+    rng = np.random.default_rng(seed)
+    type_names = list(types or EQUIPMENT_TYPES)
+    means = np.array([EQUIPMENT_TYPES.get(t, (100.0, 5.0, 60.0)) for t in type_names])
+
+    equipment_count = equipment_count or max(1, min(rows, 5000))
+    equipment_type_idx = rng.integers(0, len(type_names), size=equipment_count)
+    if timestamps:
+        equipment_idx = np.arange(rows) % equipment_count
+    else:
+        equipment_idx = rng.integers(0, equipment_count, size=rows)
+    type_idx = equipment_type_idx[equipment_idx]
+
+    names = np.array([f'{type_names[t]} {i:05d}' for i, t in enumerate(equipment_type_idx)], dtype=object)
+    base = means[type_idx]
+    noise = rng.normal(1.0, 0.15, size=(rows, 3))
+    values = np.round(np.clip(base * noise, 0, None), 2)
+
+    headers = HEADER_VARIANTS[header_variant]
+    for i, quantity in enumerate(('flowrate', 'pressure', 'temperature')):
+        unit = header_unit(headers[2 + i], quantity)
+        if unit is not None and not unit.is_canonical:
+            values[:, i] = np.round((values[:, i] - unit.offset) / unit.scale, 2)
+
+    df = pd.DataFrame({
+        headers[0]: names[equipment_idx],
+        headers[1]: np.array(type_names, dtype=object)[type_idx],
+        headers[2]: values[:, 0],
+        headers[3]: values[:, 1],
+        headers[4]: values[:, 2],
+    })
+
+    if bad_fraction:
+        for col in headers[2:]:
+            mask = rng.random(rows) < bad_fraction
+            df[col] = df[col].astype(object)
+            df.loc[mask, col] = rng.choice(['', 'n/a', '--', 'ERR'], size=int(mask.sum()))
+
+    if timestamps:
+        start = np.datetime64('2024-01-01T00:00:00')
+        offsets = np.arange(rows) // equipment_count
+        df.insert(0, TIMESTAMP_HEADER, pd.to_datetime(start + offsets.astype('timedelta64[s]'), utc=True))
+
+    return df
+
+
+def generate_csv(rows, **kwargs) -> str:
+    """Return a generated dataset as CSV text (see ``generate_frame``)."""
+    buffer = io.StringIO()
+    generate_frame(rows, **kwargs).to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def write_csv(path, rows, **kwargs):
+    generate_frame(rows, **kwargs).to_csv(path, index=False)
+    return path
@@ -0,0 +1,328 @@
+"""
+Concurrent multi-user load test against a locally started server.
+
+    cd backend
+    python -m benchmarks.loadtest --configs 1x1 2x4 4x8 asgi:4 --concurrency 4 16 64 --duration 20
+
+For every config, gunicorn ``WORKERSxTHREADS`` (chemical_project.wsgi) or
+uvicorn ``asgi:WORKERS`` (chemical_project.asgi), a fresh server is started
+on a throwaway database, ``max(--concurrency)`` users are registered through
+/api/auth/register/, and each concurrency level runs a weighted mix of
+uploads, history polls, detail fetches, report downloads and (when given a
+weight) CSV exports for ``--duration`` seconds. Per-endpoint throughput, p50/p95/p99 latency, error
+rates and bytes per request are printed and written as JSON; the saturation
+point is the first level whose throughput gain over the previous level falls
+below ``--saturation-gain``. Pass ``--accept-encoding gzip`` (or ``br``) to
+measure compressed responses.
+
+Pass ``--url`` to target an already running server instead (``--configs`` is
+then ignored).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from benchmarks.generator import generate_csv
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = {'upload': 1, 'history': 5, 'detail': 3, 'report': 1}
+ENDPOINTS = (*DEFAULT_MIX, 'export')
+
+
+class Client:
+    """One keep-alive HTTP connection per virtual user."""
+
+    def __init__(self, base_url, token=None, accept_encoding=None):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.token = token
+        self.accept_encoding = accept_encoding
+        self.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        """Return ``(status, body)``; the body is left as sent, compressed or not."""
+        headers = dict(headers or {})
+        if self.token:
+            headers['Authorization'] = f'Token {self.token}'
+        if self.accept_encoding:
+            headers['Accept-Encoding'] = self.accept_encoding
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=120)
+            try:
+                self.conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+    def post_json(self, path, payload):
+        return self.request('POST', path, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+
+    def post_file(self, path, filename, content):
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: text/csv\r\n\r\n'
+        ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+        return self.request('POST', path, body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = defaultdict(int)
+
+    def record(self, endpoint, seconds, ok, size=0):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            self.bytes[endpoint] += size
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            arr = np.asarray(samples) * 1000
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'throughput_rps': round(len(samples) / elapsed, 2),
+                'p50_ms': round(float(np.percentile(arr, 50)), 1),
+                'p95_ms': round(float(np.percentile(arr, 95)), 1),
+                'p99_ms': round(float(np.percentile(arr, 99)), 1),
+                'error_rate': round(self.errors[endpoint] / len(samples), 4),
+                'bytes_per_request': round(self.bytes[endpoint] / len(samples)),
+            }
+        total = sum(len(s) for s in self.latencies.values())
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'throughput_rps': round(total / elapsed, 2),
+            'error_rate': round(sum(self.errors.values()) / total, 4) if total else 0.0,
+            'endpoints': endpoints,
+        }
+
+
+def register_users(base_url, count, run_id):
+    tokens = []
+    client = Client(base_url)
+    for i in range(count):
+        status, body = client.post_json('/auth/register/', {
+            'username': f'load-{run_id}-{i}', 'email': f'load{i}@example.com', 'password': 'load-password-1',
+        })
+        if status != 201:
+            raise RuntimeError(f'Registering user {i} failed ({status}): {body[:200]!r}')
+        tokens.append(json.loads(body)['token'])
+    return tokens
+
+
+def virtual_user(base_url, token, mix, args, stats, stop, seed, upload_base):
+    rng = random.Random(seed)
+    client = Client(base_url, token, args.accept_encoding)
+    endpoints, weights = zip(*mix.items())
+    dataset_ids = []
+
+    def timed(endpoint, fn):
+        start = time.perf_counter()
+        try:
+            status, body = fn()
+        except OSError:
+            status, body = 599, b''
+        stats.record(endpoint, time.perf_counter() - start, 200 <= status < 300, len(body))
+        return status, body
+
+    while not stop.is_set():
+        endpoint = rng.choices(endpoints, weights)[0]
+        if endpoint in ('detail', 'report', 'export') and not dataset_ids:
+            endpoint = 'upload'
+
+        if endpoint == 'upload':
+            # One unique trailing row keeps content-hash deduplication out of the way.
+            content = upload_base + f'Load {uuid.uuid4().hex},Pump,1,1,1\n'.encode()
+            status, body = timed('upload', lambda: client.post_file('/upload/', 'load.csv', content))
+            if status == 201:
+                dataset_ids.append(json.loads(body)['id'])
+                del dataset_ids[:-5]
+        elif endpoint == 'history':
+            timed('history', lambda: client.request('GET', '/history/'))
+        elif endpoint == 'detail':
+            ds = rng.choice(dataset_ids)
+            status, _ = timed('detail', lambda: client.request('GET', f'/dataset/{ds}/'))
+            if status == 404:
+                dataset_ids.remove(ds)
+        elif endpoint == 'report':
+            ds = rng.choice(dataset_ids)
+            timed('report', lambda: client.request('GET', f'/dataset/{ds}/report/'))
+        elif endpoint == 'export':
+            ds = rng.choice(dataset_ids)
+            timed('export', lambda: client.request('GET', f'/dataset/{ds}/export/'))
+
+
+def run_level(base_url, tokens, concurrency, mix, args):
+    stats, stop = Stats(), threading.Event()
+    # Generated once so the load generator spends its CPU on requests, not on CSVs.
+    upload_base = generate_csv(args.upload_rows, seed=args.seed).encode()
+    threads = [
+        threading.Thread(
+            target=virtual_user,
+            args=(base_url, tokens[i], mix, args, stats, stop, args.seed + i, upload_base),
+            daemon=True,
+        )
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return stats.summary(time.perf_counter() - start)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_command(config, port):
+    """gunicorn with sync or threaded workers for ``WORKERSxTHREADS``, uvicorn for ``asgi:WORKERS``."""
+    if config.lower().startswith('asgi:'):
+        workers = int(config.split(':', 1)[1])
+        return f'uvicorn {workers}', [
+            sys.executable, '-m', 'uvicorn', 'chemical_project.asgi:application', '--host', '127.0.0.1',
+            '--port', str(port), '--workers', str(workers), '--log-level', 'warning', '--no-access-log',
+        ]
+    workers, threads = (int(n) for n in config.lower().split('x'))
+    return f'gunicorn {config}', [
+        sys.executable, '-m', 'gunicorn', 'chemical_project.wsgi', '-b', f'127.0.0.1:{port}',
+        '-w', str(workers), '--threads', str(threads), '--timeout', '300', '--log-level', 'warning',
+    ]
+
+
+def start_server(config):
+    """Start the config's server on a fresh throwaway database; returns (process, label, base_url, bench_dir)."""
+    bench_dir = tempfile.mkdtemp(prefix='chemviz-load-')
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='benchmarks.settings', CHEMVIZ_BENCH_DIR=bench_dir)
+    subprocess.run([sys.executable, 'manage.py', 'migrate', '-v0'], cwd=BACKEND_DIR, env=env, check=True)
+
+    port = free_port()
+    label, command = server_command(config, port)
+    # A session of its own, so stop_server also reaches the server's worker-pool processes.
+    proc = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, start_new_session=True)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return proc, label, f'http://127.0.0.1:{port}/api', bench_dir
+        except OSError:
+            time.sleep(0.2)
+    stop_server(proc)
+    raise RuntimeError(f'{label} did not start within 30s')
+
+
+def stop_server(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+def run_config(base_url, label, args, mix):
+    run_id = uuid.uuid4().hex[:8]
+    tokens = register_users(base_url, max(args.concurrency), run_id)
+    levels, previous = [], None
+    saturation = None
+    for concurrency in args.concurrency:
+        summary = run_level(base_url, tokens, concurrency, mix, args)
+        summary['concurrency'] = concurrency
+        levels.append(summary)
+        print_level(label, summary)
+        if previous and saturation is None:
+            gain = summary['throughput_rps'] / previous['throughput_rps'] - 1 if previous['throughput_rps'] else 0
+            if gain < args.saturation_gain:
+                saturation = previous['concurrency']
+        previous = summary
+    print(f'{label}: saturation at concurrency {saturation or "not reached"}\n')
+    return {'config': label, 'levels': levels, 'saturation_concurrency': saturation}
+
+
+def print_level(label, summary):
+    print(f"{label}  c={summary['concurrency']:<4} {summary['throughput_rps']:>8.1f} req/s  "
+          f"errors {summary['error_rate']:.2%}")
+    for endpoint, s in summary['endpoints'].items():
+        print(f"    {endpoint:<8} {s['requests']:>6} req {s['throughput_rps']:>8.1f}/s  "
+              f"p50 {s['p50_ms']:>8.1f}  p95 {s['p95_ms']:>8.1f}  p99 {s['p99_ms']:>8.1f} ms  "
+              f"err {s['error_rate']:.2%}  {s['bytes_per_request']:>9,} B/req")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, weight = part.split('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f'unknown endpoint {name!r}')
+        mix[name] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target a running server, e.g. http://127.0.0.1:8000/api')
+    parser.add_argument('--configs', nargs='+', default=['1x1', '2x4', '4x4'],
+                        help='gunicorn WORKERSxTHREADS or uvicorn asgi:WORKERS')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds per concurrency level')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='endpoint weights, e.g. upload=1,history=5,detail=3,report=1,export=1')
+    parser.add_argument('--upload-rows', type=int, default=1000)
+    parser.add_argument('--saturation-gain', type=float, default=0.05,
+                        help='throughput gain below which a level counts as saturated')
+    parser.add_argument('--accept-encoding', help="e.g. 'gzip' or 'br' to measure compressed responses")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='loadtest.json')
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.url:
+        results.append(run_config(args.url.rstrip('/'), args.url, args, args.mix))
+    else:
+        for config in args.configs:
+            proc, label, base_url, bench_dir = start_server(config)
+            try:
+                results.append(run_config(base_url, label, args, args.mix))
+            finally:
+                stop_server(proc)
+                shutil.rmtree(bench_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({'args': {k: v for k, v in vars(args).items()}, 'results': results}, f, indent=2)
+    print(f'Wrote {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Ingest throughput of one large CSV file on 1..N cores.
+
+    cd backend
+    python -m benchmarks.parallel --size-mb 1024 --workers 1 2 4 --output parallel.json
+
+A file of about ``--size-mb`` is written by repeating a generated block. It
+is parsed once chunk by chunk on one core (``serial``), then with
+``iter_parallel`` on a pool of each ``--workers`` size. Each configuration
+reports parse-only throughput (frames consumed and dropped) and, with
+``--ingest``, the end-to-end ``ingest_file`` time into a throwaway
+database, where the single DB writer usually becomes the limit.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.generator import generate_csv
+
+
+def write_file(path, size_mb, seed):
+    block = generate_csv(200_000, seed=seed)
+    header, _, body = block.partition('\n')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header + '\n')
+        while f.tell() < size_mb * 1024 * 1024:
+            f.write(body)
+    return os.path.getsize(path)
+
+
+def parse_serial(path):
+    from chemviz_core.parsing import iter_csv_chunks
+    return sum(len(chunk) for chunk, _ in iter_csv_chunks(path, memory_map=True))
+
+
+def parse_parallel(path, workers, range_bytes, queue_size):
+    from chemviz_core.parsing import iter_parallel
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pool.submit(int).result()  # start the workers outside the timing
+        start = time.perf_counter()
+        rows = sum(len(df) for df, _, _ in iter_parallel(path, pool, range_bytes, queue_size))
+        return rows, time.perf_counter() - start
+
+
+def ingest(path, user, workers):
+    """End-to-end ingest_file into a new dataset; ``workers=None`` forces the serial path."""
+    from django.conf import settings
+    from django.db import transaction
+    from equipment_api import views
+    from equipment_api.models import EquipmentDataset
+
+    if views._worker_pool is not None:
+        views._worker_pool.shutdown()
+        views._worker_pool = None
+    settings.BATCH_PARSE_WORKERS = workers
+    settings.PARALLEL_PARSE_MIN_BYTES = 64 * 1024 * 1024 if workers else float('inf')
+    if workers:
+        views.worker_pool().submit(int).result()
+
+    stats = {}
+    start = time.perf_counter()
+    with transaction.atomic():
+        dataset = EquipmentDataset.objects.create(user=user, name='parallel.csv')
+        views.ingest_file(dataset, path, stats)
+    elapsed = time.perf_counter() - start
+    dataset.delete()
+    return stats['rows'], elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--range-mb', type=float, default=8)
+    parser.add_argument('--queue', type=int, default=8)
+    parser.add_argument('--ingest', action='store_true', help='also time ingest_file into a throwaway database')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='parallel.json')
+    args = parser.parse_args(argv)
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    import django
+    django.setup()
+    from django.conf import settings
+
+    work_dir = tempfile.mkdtemp(prefix='chemviz-parallel-')
+    results = []
+    try:
+        path = os.path.join(work_dir, 'big.csv')
+        size = write_file(path, args.size_mb, args.seed)
+        mb = size / (1024 * 1024)
+        print(f'{mb:,.0f} MB file, {os.cpu_count()} CPUs', file=sys.stderr)
+
+        def report(entry):
+            entry['mb_per_s'] = round(mb / entry['seconds'], 1)
+            entry['seconds'] = round(entry['seconds'], 3)
+            results.append(entry)
+            print(f"{entry['stage']:<7} {entry['config']:<10} {entry['rows']:>12,} rows "
+                  f"{entry['seconds']:>9.2f} s {entry['mb_per_s']:>8.1f} MB/s")
+
+        start = time.perf_counter()
+        rows = parse_serial(path)
+        report({'stage': 'parse', 'config': 'serial', 'rows': rows, 'seconds': time.perf_counter() - start})
+        for workers in args.workers:
+            rows, seconds = parse_parallel(path, workers, int(args.range_mb * 1024 * 1024), args.queue)
+            report({'stage': 'parse', 'config': f'{workers} workers', 'rows': rows, 'seconds': seconds})
+
+        if args.ingest:
+            from django.contrib.auth.models import User
+            from django.core.management import call_command
+            call_command('migrate', verbosity=0)
+            user = User.objects.create_user('parallel', password='parallel-password')
+            settings.PARALLEL_PARSE_RANGE_BYTES = int(args.range_mb * 1024 * 1024)
+            settings.PARALLEL_PARSE_QUEUE = args.queue
+            for workers in [None, *args.workers]:
+                rows, seconds = ingest(path, user, workers)
+                report({'stage': 'ingest', 'config': f'{workers} workers' if workers else 'serial',
+                        'rows': rows, 'seconds': seconds})
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        shutil.rmtree(settings.BENCH_DIR, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({'args': vars(args), 'cpu_count': os.cpu_count(), 'bytes': size, 'results': results}, f, indent=2)
+    print(f'Wrote {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Run the backend benchmark suite against a throwaway database.
+
+    cd backend
+    python -m benchmarks.run --sizes 1000 100000 1000000 --repeat 3 --output bench.json
+
+Each benchmark is timed ``--repeat`` times per dataset size; the JSON output
+holds every sample plus min/median/mean so two runs can be compared with
+``python -m benchmarks.compare``.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def result(name, rows, samples, **extra):
+    entry = {
+        'name': name,
+        'rows': rows,
+        'samples': [round(s, 6) for s in samples],
+        'min': round(min(samples), 6),
+        'median': round(statistics.median(samples), 6),
+        'mean': round(statistics.fmean(samples), 6),
+    }
+    entry.update(extra)
+    return entry
+
+
+def run_size(rows, args, client, user):
+    # Imported here so Django is configured first.
+    from django.core.cache import caches
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from equipment_api.models import EquipmentDataset
+    import pandas as pd
+
+    from chemviz_core.parsing import coerce_frame, column_map, compute_summary, parse_csv
+    from chemviz_core.validation import validate_frame
+    from benchmarks.generator import generate_csv
+
+    results = []
+    log = lambda msg: print(f'[{rows:>9,} rows] {msg}', file=sys.stderr)  # noqa: E731
+
+    csv_text = generate_csv(rows, seed=args.seed, header_variant=args.header_variant,
+                            bad_fraction=args.bad_fraction)
+    csv_bytes = csv_text.encode('utf-8')
+
+    log('parse_csv')
+    results.append(result('parse_csv', rows, timed(lambda: parse_csv(csv_text), args.repeat),
+                          bytes=len(csv_bytes)))
+
+    # The validation stage alone, on a frame already read, renamed and coerced.
+    log('validate_frame')
+    read = pd.read_csv(io.StringIO(csv_text))
+    read.columns = read.columns.str.strip()
+    read = read.rename(columns=column_map(read.columns))
+    frame = {}
+
+    def coerce():
+        frame['df'] = read.copy()
+        frame['raw'] = coerce_frame(frame['df'])
+    samples = timed(lambda: validate_frame(frame['df'], frame['raw']), args.repeat, setup=coerce)
+    results.append(result('validate_frame', rows, samples,
+                          share_of_parse=round(statistics.median(samples) / results[-1]['median'], 3)))
+
+    df, _ = parse_csv(csv_text)
+    log('compute_summary')
+    results.append(result('compute_summary', rows, timed(lambda: compute_summary(df), args.repeat)))
+
+    def clear_datasets():
+        EquipmentDataset.objects.filter(user=user).delete()
+
+    uploaded = {}
+
+    def upload():
+        response = client.post(
+            '/api/upload/', {'file': SimpleUploadedFile('bench.csv', csv_bytes)}, format='multipart',
+        )
+        assert response.status_code == 201, response.content[:200]
+        uploaded['id'] = response.json()['id']
+
+    log('upload')
+    results.append(result('upload', rows, timed(upload, args.repeat, setup=clear_datasets),
+                          bytes=len(csv_bytes)))
+    detail_url = f"/api/dataset/{uploaded['id']}/"
+
+    def get(url, expect=200, **headers):
+        response = client.get(url, **headers)
+        assert response.status_code == expect, response.status_code
+        return response
+
+    clear_cache = caches['default'].clear
+    log('dataset_detail')
+    size = len(get(detail_url).content)
+    results.append(result('dataset_detail', rows, timed(lambda: get(detail_url), args.repeat, setup=clear_cache),
+                          response_bytes=size))
+    get(detail_url)
+    log('dataset_detail_cached')
+    results.append(result('dataset_detail_cached', rows, timed(lambda: get(detail_url), args.repeat),
+                          response_bytes=size))
+
+    # Bytes on the wire and latency (compression included) for each negotiated encoding.
+    for encoding in ('gzip', 'br'):
+        response = get(detail_url, HTTP_ACCEPT_ENCODING=encoding)
+        if response.get('Content-Encoding') != encoding:
+            results.append({'name': f'dataset_detail_{encoding}', 'rows': rows, 'skipped': f'{encoding} not available'})
+            continue
+        log(f'dataset_detail_{encoding}')
+        results.append(result(
+            f'dataset_detail_{encoding}', rows,
+            timed(lambda: get(detail_url, HTTP_ACCEPT_ENCODING=encoding), args.repeat),
+            response_bytes=len(response.content), uncompressed_bytes=size,
+        ))
+
+    log('history')
+    results.append(result('history', rows, timed(lambda: get('/api/history/'), args.repeat, setup=clear_cache)))
+
+    if rows <= args.pdf_max_rows:
+        log('report')
+        report_url = f"/api/dataset/{uploaded['id']}/report/"
+        content_type = get(report_url)['Content-Type']
+        results.append(result('report', rows, timed(lambda: get(report_url), args.repeat),
+                              content_type=content_type))
+    else:
+        results.append({'name': 'report', 'rows': rows, 'skipped': f'rows > --pdf-max-rows ({args.pdf_max_rows})'})
+
+    clear_datasets()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--header-variant', default='standard')
+    parser.add_argument('--bad-fraction', type=float, default=0.0)
+    parser.add_argument('--pdf-max-rows', type=int, default=100_000,
+                        help='skip the PDF report benchmark above this many rows')
+    parser.add_argument('--output', default='bench.json')
+    args = parser.parse_args(argv)
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from rest_framework.test import APIClient
+    import pandas as pd
+
+    from equipment_api.models import Token
+
+    try:
+        call_command('migrate', verbosity=0)
+        user = User.objects.create_user('bench', password='bench-password')
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        results = []
+        for rows in args.sizes:
+            results.extend(run_size(rows, args, client, user))
+    finally:
+        shutil.rmtree(settings.BENCH_DIR, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Wrote {len(results)} results to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Production settings pointed at a throwaway database and cache directory."""
+
+import os
+import tempfile
+
+from chemical_project.settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+# Shared through the environment so every gunicorn worker of a load test uses the same database.
+BENCH_DIR = os.environ.get('CHEMVIZ_BENCH_DIR') or tempfile.mkdtemp(prefix='chemviz-bench-')
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BENCH_DIR, 'bench.sqlite3'),
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BENCH_DIR, 'cache'),
+    }
+}
+
+# Measure the code, not the instrumentation: no tracemalloc, no slow-request log.
+PERF_MEMORY_VIEWS = []
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'loggers': {'chemviz.perf': {'level': 'ERROR'}},
+}
@@ -0,0 +1,15 @@
+"""
+ASGI config for chemical_project.
+
+    uvicorn chemical_project.asgi:application --workers 4
+
+Under ASGI the read-only endpoints and /api/events/ run as coroutines on the
+event loop, and DRF views run in a thread per request.
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chemical_project.settings')
+
+application = get_asgi_application()
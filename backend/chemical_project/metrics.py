@@ -0,0 +1,103 @@
+"""
+In-process request metrics, rendered in the Prometheus text exposition format.
+Each worker process keeps its own registry, so scrape every worker (or run a
+single worker) to see the full picture.
+"""
+
+import hmac
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.latency_buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+        self.latency_sum = defaultdict(float)
+        self.latency_count = defaultdict(int)
+        self.requests = defaultdict(int)
+        self.db_queries = defaultdict(int)
+        self.db_seconds = defaultdict(float)
+        self.response_bytes = defaultdict(int)
+        self.peak_memory = {}
+
+    def observe(self, view, status_code, seconds, queries, query_seconds, response_bytes, peak_memory=None):
+        with self._lock:
+            buckets = self.latency_buckets[view]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self.latency_sum[view] += seconds
+            self.latency_count[view] += 1
+            self.requests[(view, status_code)] += 1
+            self.db_queries[view] += queries
+            self.db_seconds[view] += query_seconds
+            self.response_bytes[view] += response_bytes
+            if peak_memory is not None:
+                self.peak_memory[view] = max(self.peak_memory.get(view, 0), peak_memory)
+
+    def render(self) -> str:
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            header('chemviz_request_duration_seconds', 'histogram', 'Request latency by view.')
+            for view in sorted(self.latency_count):
+                for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets[view]):
+                    lines.append(f'chemviz_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {count}')
+                lines.append(f'chemviz_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {self.latency_count[view]}')
+                lines.append(f'chemviz_request_duration_seconds_sum{{view="{view}"}} {self.latency_sum[view]:.6f}')
+                lines.append(f'chemviz_request_duration_seconds_count{{view="{view}"}} {self.latency_count[view]}')
+
+            header('chemviz_requests_total', 'counter', 'Requests by view and status code.')
+            for (view, code), count in sorted(self.requests.items()):
+                lines.append(f'chemviz_requests_total{{view="{view}",status="{code}"}} {count}')
+
+            header('chemviz_db_queries_total', 'counter', 'Database queries executed by view.')
+            for view, count in sorted(self.db_queries.items()):
+                lines.append(f'chemviz_db_queries_total{{view="{view}"}} {count}')
+
+            header('chemviz_db_query_seconds_total', 'counter', 'Time spent in database queries by view.')
+            for view, seconds in sorted(self.db_seconds.items()):
+                lines.append(f'chemviz_db_query_seconds_total{{view="{view}"}} {seconds:.6f}')
+
+            header('chemviz_response_bytes_total', 'counter', 'Response body bytes sent (after compression) by view.')
+            for view, size in sorted(self.response_bytes.items()):
+                lines.append(f'chemviz_response_bytes_total{{view="{view}"}} {size}')
+
+            header('chemviz_peak_memory_bytes', 'gauge', 'Largest Python heap growth seen in a sampled request, by view.')
+            for view, size in sorted(self.peak_memory.items()):
+                lines.append(f'chemviz_peak_memory_bytes{{view="{view}"}} {size}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def metrics_view(request):
+    """
+    Expose the registry to scrapers holding METRICS_TOKEN as a bearer token
+    or, when no token is configured, to local addresses only. Behind a
+    reverse proxy every request comes from the proxy's address, so set a
+    token there.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(credentials.strip().encode(), token.encode()):
+            return HttpResponseForbidden('A valid metrics token is required.')
+    elif request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1']):
+        return HttpResponseForbidden('Metrics are only available locally.')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,319 @@
+import gzip
+import itertools
+import logging
+import threading
+import time
+import tracemalloc
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from chemical_project.metrics import registry
+
+logger = logging.getLogger('chemviz.perf')
+
+_trace_lock = threading.Lock()
+_trace_users = 0
+_trace_counter = itertools.count()
+
+
+def _start_tracing():
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0:
+            tracemalloc.start()
+        _trace_users += 1
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _stop_tracing(baseline):
+    """Heap growth since ``baseline``; approximate when traced requests overlap."""
+    global _trace_users
+    with _trace_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _trace_users -= 1
+        if _trace_users == 0:
+            tracemalloc.stop()
+        else:
+            tracemalloc.reset_peak()
+    return max(peak - baseline, 0)
+
+
+def _count_bytes(chunks, done):
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+async def _acount_bytes(chunks, done):
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        done(size)
+
+
+class QueryRecorder:
+    """connection.execute_wrapper hook that times every query of a request."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def total_seconds(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def breakdown(self, limit=10):
+        """Slowest statements, grouped by SQL text."""
+        grouped = {}
+        for sql, seconds in self.queries:
+            count, total = grouped.get(sql, (0, 0.0))
+            grouped[sql] = (count + 1, total + seconds)
+        ranked = sorted(grouped.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            f'{total * 1000:8.1f} ms  x{count:<4} {sql[:200]}'
+            for sql, (count, total) in ranked[:limit]
+        ]
+
+
+def _watch_queries(recorder):
+    connection.execute_wrappers.append(recorder)
+
+
+def _unwatch_queries(recorder):
+    connection.execute_wrappers.remove(recorder)
+
+
+def _accepted_encodings(header):
+    """Parse Accept-Encoding into the set of codings with a non-zero q-value."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses with brotli (when the ``brotli`` package is
+    installed and the client accepts it) or gzip. Only content types matching
+    RESPONSE_COMPRESSION_TYPES are compressed, and regular responses only from
+    RESPONSE_COMPRESSION_MIN_BYTES up. Streaming responses are compressed
+    chunk by chunk with a flush after each one, so NDJSON progress lines still
+    reach the client as they are produced. Large bodies with a strong ETag
+    (the cached API responses) are compressed once and the result is kept in
+    the response cache under that ETag. Under ASGI, bodies worth compressing
+    are compressed off the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+    memo_min_bytes = 64 * 1024
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.min_bytes = getattr(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 1024)
+        self.content_types = tuple(getattr(settings, 'RESPONSE_COMPRESSION_TYPES', ('application/json', 'text/')))
+        self.gzip_level = getattr(settings, 'RESPONSE_COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = getattr(settings, 'RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if not response.streaming and len(response.content) >= self.min_bytes:
+            return await sync_to_async(self.process_response, thread_sensitive=False)(request, response)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.status_code in (204, 304) or response.has_header('Content-Encoding'):
+            return response
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response  # events are tiny, and a proxy may hold back a compressed stream
+        if not response.get('Content-Type', '').startswith(self.content_types):
+            return response
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted:
+            encoding = 'gzip'
+        else:
+            return response
+
+        if response.streaming:
+            compress = self._acompress_stream if response.is_async else self._compress_stream
+            response.streaming_content = compress(encoding, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed = self._compressed_body(encoding, response)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The body bytes changed, so a strong validator no longer applies (RFC 9110 8.8.3).
+        etag = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compressed_body(self, encoding, response):
+        etag = response.get('ETag', '')
+        if len(response.content) < self.memo_min_bytes or not etag or etag.startswith('W/'):
+            return self._compress(encoding, response.content)
+        level = self.brotli_quality if encoding == 'br' else self.gzip_level
+        key = f'chemviz:resp:enc:{encoding}{level}:{etag.strip(chr(34))}'
+        cache = caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = self._compress(encoding, response.content)
+            cache.set(key, compressed, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        return compressed
+
+    def _compress(self, encoding, data):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def _compress_stream(self, encoding, chunks):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            for chunk in chunks:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+
+    async def _acompress_stream(self, encoding, chunks):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            async for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            async for chunk in chunks:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+
+
+class PerformanceMiddleware:
+    """
+    Record per-view latency, DB query count and time, response size (as sent,
+    after CompressionMiddleware; streamed bodies are counted as they are sent
+    and recorded when the stream ends) and, for the views listed in
+    PERF_MEMORY_VIEWS, peak Python heap growth. tracemalloc slows a traced
+    request several times over, so only one in PERF_MEMORY_SAMPLE_EVERY of
+    those requests is traced. It only sees this process: work a view hands
+    to the worker pool is not included. Requests slower than SLOW_REQUEST_MS are logged
+    to 'chemviz.perf' with a query breakdown. Metrics are served by
+    chemical_project.metrics.metrics_view.
+
+    Under ASGI, a request's ORM calls and sync views all run in one thread
+    of its own, so the query recorder is installed on that thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'SLOW_REQUEST_MS', 500)
+        self.memory_views = set(getattr(settings, 'PERF_MEMORY_VIEWS', ()))
+        self.memory_sample_every = max(1, getattr(settings, 'PERF_MEMORY_SAMPLE_EVERY', 20))
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        return self.record(request, response, time.perf_counter() - start, recorder)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        await sync_to_async(_watch_queries)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_unwatch_queries)(recorder)
+        return self.record(request, response, time.perf_counter() - start, recorder)
+
+    def record(self, request, response, elapsed, recorder):
+        view = getattr(request, '_perf_view', 'unresolved')
+        baseline = getattr(request, '_perf_mem_baseline', None)
+        peak = _stop_tracing(baseline) if baseline is not None else None
+
+        def observe(size):
+            registry.observe(view, response.status_code, elapsed, len(recorder.queries),
+                             recorder.total_seconds, size, peak)
+            if elapsed * 1000 >= self.slow_ms:
+                logger.warning(
+                    'Slow request %s %s -> %s (%s) %.0f ms, %d queries in %.0f ms, %d bytes\n%s',
+                    request.method, request.path, response.status_code, view, elapsed * 1000,
+                    len(recorder.queries), recorder.total_seconds * 1000, size,
+                    '\n'.join(recorder.breakdown()),
+                )
+
+        if response.streaming:
+            # Streamed bodies are counted as they go out and recorded once the stream ends or is closed.
+            count = _acount_bytes if response.is_async else _count_bytes
+            response.streaming_content = count(response.streaming_content, observe)
+        else:
+            observe(len(response.content))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        request._perf_view = view_class.__name__ if view_class else view_func.__name__
+        if request._perf_view in self.memory_views and next(_trace_counter) % self.memory_sample_every == 0:
+            request._perf_mem_baseline = _start_tracing()
+        return None
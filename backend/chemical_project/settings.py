@@ -5,6 +5,8 @@ Django settings for chemical_project.
 import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-dev-key-replace-in-production-x9k#m$2p'
@@ -26,6 +28,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'chemical_project.middleware.PerformanceMiddleware',
+    'chemical_project.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -55,6 +59,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'chemical_project.wsgi.application'
+# ASGI servers load chemical_project.asgi.application.
 
 DATABASES = {
     'default': {
@@ -84,6 +89,10 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
 CORS_ALLOW_CREDENTIALS = True
+# The web client revalidates its cached reads with If-None-Match against the ETag,
+# and resumes the event stream with Last-Event-ID.
+CORS_ALLOW_HEADERS = (*default_headers, 'if-none-match', 'last-event-id')
+CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified']
 
 # REST Framework
 REST_FRAMEWORK = {
@@ -99,6 +108,89 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 50,
 }
 
+# Caches. The file-based backend is shared by all worker processes on a host,
+# which keeps the versioned response cache consistent without an external service.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    }
+}
+
+# History/detail response cache (equipment_api.caching)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Batch uploads (equipment_api.views.BatchUploadView). BATCH_PARSE_WORKERS sizes the
+# worker pool that also parses large single uploads and renders reports; None uses one
+# process per CPU.
+BATCH_PARSE_WORKERS = None
+BATCH_MAX_FILES = 50
+# Plain .csv uploads below INGEST_IN_MEMORY_MAX_BYTES are read and parsed in memory; larger
+# ones, like compressed and raw-body uploads, are parsed from disk in chunks.
+INGEST_IN_MEMORY_MAX_BYTES = 1024 * 1024
+# Streamed uploads of PARALLEL_PARSE_MIN_BYTES or more (plain .csv uploads too) are split into
+# PARALLEL_PARSE_RANGE_BYTES ranges parsed on the worker pool, with at most PARALLEL_PARSE_QUEUE
+# ranges parsed ahead of the database writer. PARALLEL_PARSE_QUEUE also caps the files of a
+# batch upload parsed ahead of the writer.
+PARALLEL_PARSE_MIN_BYTES = 64 * 1024 * 1024
+PARALLEL_PARSE_RANGE_BYTES = 8 * 1024 * 1024
+PARALLEL_PARSE_QUEUE = 8
+# Uploads and appends running at once per server process (equipment_api.views.IngestSlotMixin).
+INGEST_MAX_CONCURRENT = 2
+
+# Reading resampling (equipment_api.views.ReadingResampleView). Shorter intervals, or ones that
+# would give more than RESAMPLE_MAX_BUCKETS buckets across all equipment, are rejected with a 400.
+RESAMPLE_MIN_INTERVAL_SECONDS = 1
+RESAMPLE_MAX_BUCKETS = 100_000
+
+# Token authentication cache (equipment_api.authentication.TokenCache).
+# Set TOKEN_CACHE_ALIAS to a CACHES alias to share entries between worker processes.
+# Token deletes and user saves invalidate every process's entries through a generation
+# counter in TOKEN_CACHE_GENERATION_ALIAS, which all processes must share. Queryset
+# .update() calls send no signals; call token_cache.invalidate() after a bulk deactivation.
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAX_SIZE = 1024
+TOKEN_CACHE_ALIAS = None
+TOKEN_CACHE_GENERATION_ALIAS = 'default'
+
+# Request instrumentation (chemical_project.middleware.PerformanceMiddleware)
+SLOW_REQUEST_MS = 500
+# Views whose heap growth is sampled. Reports render in the worker pool, out of tracemalloc's sight.
+PERF_MEMORY_VIEWS = ['UploadCSVView']
+PERF_MEMORY_SAMPLE_EVERY = 20
+# /metrics requires METRICS_TOKEN as a bearer token when one is set. Without a token it only
+# answers METRICS_ALLOWED_IPS, which is no protection behind a reverse proxy: every request
+# then arrives from the proxy's address.
+METRICS_TOKEN = os.environ.get('CHEMVIZ_METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Event stream (equipment_api.events, /api/events/). Events live in the response cache.
+EVENTS_KEEP = 100
+EVENTS_TTL = 3600
+EVENTS_POLL_SECONDS = 0.5
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_LONG_POLL_SECONDS = 25
+EVENTS_RETRY_MS = 2000
+
+# Response compression (chemical_project.middleware.CompressionMiddleware).
+# Brotli is used when the 'brotli' package is installed and the client accepts it.
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+RESPONSE_COMPRESSION_TYPES = ['application/json', 'application/x-ndjson', 'text/']
+RESPONSE_COMPRESSION_GZIP_LEVEL = 6
+RESPONSE_COMPRESSION_BROTLI_QUALITY = 4
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'chemviz.perf': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
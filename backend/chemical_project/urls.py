@@ -3,8 +3,11 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from chemical_project.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api/auth/', include('equipment_api.auth_urls')),
     path('api/', include('equipment_api.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
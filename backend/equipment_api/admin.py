@@ -1,5 +1,5 @@
 from django.contrib import admin
-from equipment_api.models import EquipmentDataset, EquipmentRecord, Token
+from equipment_api.models import EquipmentDataset, EquipmentRecord, EquipmentReading, Token
 
 
 class EquipmentRecordInline(admin.TabularInline):
@@ -10,11 +10,11 @@ class EquipmentRecordInline(admin.TabularInline):
 
 @admin.register(EquipmentDataset)
 class EquipmentDatasetAdmin(admin.ModelAdmin):
-    list_display = ['name', 'user', 'uploaded_at', 'total_records', 'avg_flowrate', 'avg_pressure', 'avg_temperature']
+    list_display = ['name', 'user', 'uploaded_at', 'total_records', 'quarantined_records', 'avg_flowrate', 'avg_pressure', 'avg_temperature']
     list_filter = ['user', 'uploaded_at']
     search_fields = ['name', 'user__username']
     inlines = [EquipmentRecordInline]
-    readonly_fields = ['uploaded_at', 'total_records', 'avg_flowrate', 'avg_pressure', 'avg_temperature', 'type_distribution']
+    readonly_fields = ['uploaded_at', 'total_records', 'avg_flowrate', 'avg_pressure', 'avg_temperature', 'type_distribution', 'sum_flowrate', 'sum_pressure', 'sum_temperature', 'ingest_timings', 'quarantined_records', 'units', 'source_units']
 
 
 @admin.register(EquipmentRecord)
@@ -24,6 +24,13 @@ class EquipmentRecordAdmin(admin.ModelAdmin):
     search_fields = ['equipment_name']
 
 
+@admin.register(EquipmentReading)
+class EquipmentReadingAdmin(admin.ModelAdmin):
+    list_display = ['equipment_name', 'ts', 'flowrate', 'pressure', 'temperature', 'dataset']
+    list_filter = ['dataset']
+    search_fields = ['equipment_name']
+
+
 @admin.register(Token)
 class TokenAdmin(admin.ModelAdmin):
     list_display = ['key', 'user', 'created']
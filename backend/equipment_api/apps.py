@@ -5,3 +5,6 @@ class EquipmentApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'equipment_api'
     verbose_name = 'Equipment API'
+
+    def ready(self):
+        from equipment_api import signals  # noqa: F401
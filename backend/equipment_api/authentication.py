@@ -1,13 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.cache import caches
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from equipment_api.models import Token
 
 
+class TokenCache:
+    """
+    Process-local TTL + LRU cache of token key -> Token (with its user loaded).
+    When TOKEN_CACHE_ALIAS names a Django cache, entries are also shared there so
+    other worker processes skip the database too.
+
+    Every entry is stamped with the invalidation generation current when its
+    token was read from the database. The generation lives in the
+    TOKEN_CACHE_GENERATION_ALIAS cache, which all worker processes share;
+    invalidate() moves it on, so an entry cached by any process stops being
+    trusted at its next lookup. Reading the generation is one cache get per
+    request, still cheaper than the token/user join it saves.
+    """
+
+    def __init__(self, ttl, max_size, alias=None, generation_alias='default'):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.alias = alias
+        self.generation_alias = generation_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared(self):
+        return caches[self.alias] if self.alias else None
+
+    @staticmethod
+    def _shared_key(key):
+        return f'chemviz:token:{key}'
+
+    _generation_key = 'chemviz:token:generation'
+
+    def generation(self):
+        """The current invalidation generation; a missing (evicted) one is replaced by a new one."""
+        cache = caches[self.generation_alias]
+        generation = cache.get(self._generation_key)
+        if generation is None:
+            cache.add(self._generation_key, time.time_ns(), None)
+            generation = cache.get(self._generation_key)
+        return generation
+
+    def invalidate(self):
+        """Stop trusting every entry cached before now, in every process."""
+        caches[self.generation_alias].set(self._generation_key, time.time_ns(), None)
+        self.clear()
+
+    def get(self, key, generation=None):
+        """
+        The cached Token for ``key``, or None. ``generation`` is the current
+        generation when the caller has already read it.
+        """
+        if generation is None:
+            generation = self.generation()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                token, stamp, expires = entry
+                if stamp == generation and expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return token
+                del self._entries[key]
+
+        shared = self._shared()
+        if shared is not None:
+            entry = shared.get(self._shared_key(key))
+            if entry is not None and entry[1] == generation:
+                self._store(key, *entry)
+                return entry[0]
+        return None
+
+    def set(self, key, token, generation):
+        """Cache ``token``, read from the database under ``generation`` (taken before the read)."""
+        self._store(key, token, generation)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._shared_key(key), (token, generation), self.ttl)
+
+    def _store(self, key, token, generation):
+        with self._lock:
+            self._entries[key] = (token, generation, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        shared = self._shared()
+        if shared is not None:
+            shared.delete(self._shared_key(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(
+    ttl=getattr(settings, 'TOKEN_CACHE_TTL', 60),
+    max_size=getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 1024),
+    alias=getattr(settings, 'TOKEN_CACHE_ALIAS', None),
+    generation_alias=getattr(settings, 'TOKEN_CACHE_GENERATION_ALIAS', 'default'),
+)
+
+
 class TokenAuthentication(BaseAuthentication):
     """
     Custom Token authentication.
     Clients should authenticate by passing the token in the Authorization header:
         Authorization: Token <key>
+    Lookups are served from token_cache; equipment_api.signals invalidates it
+    in every process when a token is deleted or a user is saved or deleted.
+    Queryset .update()/.delete() calls send no signals: after one that
+    deactivates users or removes tokens, call token_cache.invalidate(), or
+    cached entries are trusted until TOKEN_CACHE_TTL runs out.
     """
 
     def authenticate(self, request):
@@ -21,9 +137,42 @@ class TokenAuthentication(BaseAuthentication):
         elif len(auth) > 2:
             raise AuthenticationFailed('Invalid token header. Token string should not contain spaces.')
 
-        try:
-            token = Token.objects.select_related('user').get(key=auth[1])
-        except Token.DoesNotExist:
-            raise AuthenticationFailed('Invalid token.')
+        generation = token_cache.generation()
+        token = token_cache.get(auth[1], generation)
+        if token is None:
+            try:
+                token = Token.objects.select_related('user').get(key=auth[1])
+            except Token.DoesNotExist:
+                raise AuthenticationFailed('Invalid token.')
+            token_cache.set(auth[1], token, generation)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
 
         return (token.user, token)
+
+
+async def authenticate_async(request):
+    """
+    TokenAuthentication for native async views, which DRF can't serve:
+    returns the token's user, else the session user, else None. Raises
+    AuthenticationFailed for the same bad tokens as authenticate().
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if not auth or auth[0].lower() != 'token':
+        user = await sync_to_async(get_user)(request)
+        return user if user.is_authenticated else None
+
+    if len(auth) != 2:
+        raise AuthenticationFailed('Invalid token header.')
+    generation = await sync_to_async(token_cache.generation)()
+    token = token_cache.get(auth[1], generation)
+    if token is None:
+        token = await Token.objects.select_related('user').filter(key=auth[1]).afirst()
+        if token is None:
+            raise AuthenticationFailed('Invalid token.')
+        token_cache.set(auth[1], token, generation)
+
+    if not token.user.is_active:
+        raise AuthenticationFailed('User inactive or deleted.')
+    return token.user
@@ -0,0 +1,112 @@
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def response_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _version_key(user_id):
+    return f'chemviz:resp:ver:{user_id}'
+
+
+def user_version(user_id) -> float:
+    """
+    Current cache version for a user's responses. The version is the time of
+    the last change to any of their datasets, so it doubles as the history
+    Last-Modified value.
+    """
+    cache = response_cache()
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), time.time(), None)
+        version = cache.get(_version_key(user_id))
+    return version
+
+
+def bump_user_version(user_id):
+    """Invalidate every cached response for a user by moving to a new version."""
+    response_cache().set(_version_key(user_id), time.time(), None)
+
+
+def response_key(request, version, parts, fmt):
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return ':'.join(['chemviz:resp', str(request.user.pk), repr(version), *map(str, parts), fmt, query])
+
+
+def cache_entry(response, last_modified):
+    return {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': '"%s"' % hashlib.blake2b(response.content, digest_size=16).hexdigest(),
+        'last_modified': int(last_modified),
+    }
+
+
+def entry_response(request, entry):
+    """The cached body, or a 304 when the client's validators still match it."""
+    not_modified = get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified'],
+    )
+    response = not_modified or HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve GET responses from the response cache, keyed by user, cache version,
+    the given key parts, the negotiated format and the query string. Responses
+    carry ETag/Last-Modified and short-circuit to 304 when the client is current.
+
+    ``build`` returns ``(response, last_modified)``; a ``None`` timestamp falls
+    back to the user's cache version.
+    """
+
+    def cached_response(self, request, parts, build):
+        version = user_version(request.user.pk)
+        key = response_key(request, version, parts, request.accepted_renderer.format)
+
+        cache = response_cache()
+        entry = cache.get(key)
+        if entry is None:
+            response, modified = build()
+            if response.status_code != 200:
+                return response
+            response = self.finalize_response(request, response)
+            response.render()
+            entry = cache_entry(response, modified or version)
+            cache.set(key, entry, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        return entry_response(request, entry)
+
+
+class AsyncCachedResponseMixin:
+    """
+    CachedResponseMixin for native async views. ``build`` is a coroutine
+    function returning an already rendered JSON response; entries share the
+    'json' format key with the DRF views, whose JSON renders byte for byte
+    the same.
+    """
+
+    async def cached_response(self, request, parts, build):
+        version = await sync_to_async(user_version)(request.user.pk)
+        key = response_key(request, version, parts, 'json')
+
+        cache = response_cache()
+        entry = await cache.aget(key)
+        if entry is None:
+            response, modified = await build()
+            if response.status_code != 200:
+                return response
+            entry = cache_entry(response, modified or version)
+            await cache.aset(key, entry, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        return entry_response(request, entry)
@@ -0,0 +1,110 @@
+"""
+Per-user event log behind /api/events/.
+
+Events are kept in the response cache, which every worker process shares, as
+a short ring per user plus one global ring of ``(user_id, event id)`` that
+tells streams which users have something new. The cache is used rather than
+the database so ingest progress is visible while the ingest transaction is
+still open. Publishing is a read-modify-write, so two processes publishing
+for the same user at the same instant can drop an event: clients treat events
+as hints and re-read /history/ when they (re)connect or get a ``resync``.
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from equipment_api.caching import response_cache
+
+EVENTS_KEEP = getattr(settings, 'EVENTS_KEEP', 100)
+EVENTS_TTL = getattr(settings, 'EVENTS_TTL', 3600)
+EVENTS_POLL_SECONDS = getattr(settings, 'EVENTS_POLL_SECONDS', 0.5)
+
+_RECENT_KEY = 'chemviz:events:recent'
+_publish_lock = threading.Lock()
+
+
+def _user_key(user_id):
+    return f'chemviz:events:{user_id}'
+
+
+def publish(user_id, kind, **data):
+    """Append an event for a user and return it. Ids are increasing microsecond timestamps."""
+    cache = response_cache()
+    with _publish_lock:
+        events = cache.get(_user_key(user_id)) or []
+        event_id = max(time.time_ns() // 1000, events[-1]['id'] + 1 if events else 0)
+        event = {'id': event_id, 'type': kind, 'data': data}
+        events.append(event)
+        cache.set(_user_key(user_id), events[-EVENTS_KEEP:], EVENTS_TTL)
+
+        recent = cache.get(_RECENT_KEY) or []
+        recent.append((user_id, event_id))
+        cache.set(_RECENT_KEY, recent[-EVENTS_KEEP * 10:], EVENTS_TTL)
+    return event
+
+
+def events_since(user_id, last_id):
+    """
+    Events after ``last_id``. A ``resync`` event comes first when older events
+    that the client has not seen were already dropped from the ring.
+    """
+    events = response_cache().get(_user_key(user_id)) or []
+    newer = [e for e in events if e['id'] > last_id]
+    if last_id and len(events) >= EVENTS_KEEP and events[0]['id'] > last_id + 1:
+        newer.insert(0, {'id': events[0]['id'] - 1, 'type': 'resync', 'data': {}})
+    return newer
+
+
+class EventBroker:
+    """
+    Wakes the streams of one event loop. A single task polls the global ring
+    every EVENTS_POLL_SECONDS and sets the asyncio.Event of each subscribed
+    user with something new, so idle streams cost one cache read per tick in
+    total rather than one each.
+    """
+
+    def __init__(self):
+        self.waiters = defaultdict(set)
+        self.task = None
+        self.last_seen = time.time_ns() // 1000
+
+    def subscribe(self, user_id):
+        wake = asyncio.Event()
+        self.waiters[user_id].add(wake)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._poll())
+        return wake
+
+    def unsubscribe(self, user_id, wake):
+        self.waiters[user_id].discard(wake)
+        if not self.waiters[user_id]:
+            del self.waiters[user_id]
+
+    async def _poll(self):
+        cache = response_cache()
+        while self.waiters:
+            recent = await cache.aget(_RECENT_KEY) or []
+            for user_id, event_id in recent:
+                if event_id > self.last_seen:
+                    for wake in self.waiters.get(user_id, ()):
+                        wake.set()
+            if recent:
+                self.last_seen = max(self.last_seen, recent[-1][1])
+            await asyncio.sleep(EVENTS_POLL_SECONDS)
+
+
+_brokers = {}
+
+
+def broker():
+    """The broker of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _brokers:
+        for stale in [l for l in _brokers if l.is_closed()]:
+            del _brokers[stale]
+        _brokers[loop] = EventBroker()
+    return _brokers[loop]
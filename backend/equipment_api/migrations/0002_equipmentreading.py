@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipment_name', models.CharField(max_length=255)),
+                ('ts', models.DateTimeField()),
+                ('flowrate', models.FloatField(default=0.0)),
+                ('pressure', models.FloatField(default=0.0)),
+                ('temperature', models.FloatField(default=0.0)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='readings', to='equipment_api.equipmentdataset')),
+            ],
+            options={
+                'ordering': ['equipment_name', 'ts'],
+                'indexes': [models.Index(fields=['dataset', 'equipment_name', 'ts'], name='reading_equipment_ts_idx'), models.Index(fields=['dataset', 'ts'], name='reading_dataset_ts_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_sums(apps, schema_editor):
+    EquipmentDataset = apps.get_model('equipment_api', 'EquipmentDataset')
+    for dataset in EquipmentDataset.objects.all():
+        totals = dataset.records.aggregate(
+            flowrate=Sum('flowrate'), pressure=Sum('pressure'), temperature=Sum('temperature'),
+        )
+        dataset.sum_flowrate = totals['flowrate'] or 0.0
+        dataset.sum_pressure = totals['pressure'] or 0.0
+        dataset.sum_temperature = totals['temperature'] or 0.0
+        dataset.save(update_fields=['sum_flowrate', 'sum_pressure', 'sum_temperature'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0002_equipmentreading'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='sum_flowrate',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='sum_pressure',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='sum_temperature',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.CreateModel(
+            name='DatasetAppend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('rows_appended', models.IntegerField(default=0)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='appends', to='equipment_api.equipmentdataset')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='datasetappend',
+            constraint=models.UniqueConstraint(fields=('dataset', 'key'), name='unique_append_key_per_dataset'),
+        ),
+        migrations.RunPython(backfill_sums, migrations.RunPython.noop),
+    ]
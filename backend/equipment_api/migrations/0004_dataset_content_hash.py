@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0003_dataset_sums_and_appends'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdataset',
+            index=models.Index(fields=['user', 'content_hash'], name='dataset_user_hash_idx'),
+        ),
+    ]
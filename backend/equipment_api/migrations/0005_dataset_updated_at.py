@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0004_dataset_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
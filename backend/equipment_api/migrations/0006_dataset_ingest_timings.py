@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0005_dataset_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='ingest_timings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
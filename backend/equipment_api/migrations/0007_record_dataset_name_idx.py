@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-19 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0006_dataset_ingest_timings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipmentrecord',
+            index=models.Index(fields=['dataset', 'equipment_name'], name='record_dataset_name_idx'),
+        ),
+    ]
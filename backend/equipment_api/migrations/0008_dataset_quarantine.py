@@ -0,0 +1,34 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0007_record_dataset_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='quarantined_records',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='QuarantinedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255)),
+                ('row', models.IntegerField()),
+                ('reasons', models.JSONField(default=list)),
+                ('values', models.JSONField(default=dict)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quarantined_rows', to='equipment_api.equipmentdataset')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['dataset', 'id'], name='quarantine_dataset_idx')],
+            },
+        ),
+    ]
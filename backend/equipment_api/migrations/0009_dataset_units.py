@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:29
+
+import equipment_api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0008_dataset_quarantine'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='source_units',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='equipmentdataset',
+            name='units',
+            field=models.JSONField(default=equipment_api.models.canonical_units),
+        ),
+    ]
@@ -3,6 +3,12 @@ from django.contrib.auth.models import User
 import binascii
 import os
 
+from chemviz_core.units import CANONICAL_UNITS
+
+
+def canonical_units():
+    return dict(CANONICAL_UNITS)
+
 
 class Token(models.Model):
     """Token model for API authentication."""
@@ -28,14 +34,31 @@ class EquipmentDataset(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='datasets')
     name = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     total_records = models.IntegerField(default=0)
     avg_flowrate = models.FloatField(default=0.0)
     avg_pressure = models.FloatField(default=0.0)
     avg_temperature = models.FloatField(default=0.0)
     type_distribution = models.JSONField(default=dict)
+    # Running sums behind the averages, so appends can update them incrementally.
+    sum_flowrate = models.FloatField(default=0.0)
+    sum_pressure = models.FloatField(default=0.0)
+    sum_temperature = models.FloatField(default=0.0)
+    # BLAKE2b of the uploaded bytes; blank once the dataset has been appended to.
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    # Per-stage timings of the upload that created this dataset (see equipment_api.profiling).
+    ingest_timings = models.JSONField(default=dict, blank=True)
+    # Rows that failed validation and were kept in QuarantinedRow instead of the records.
+    quarantined_records = models.IntegerField(default=0)
+    # Units of the stored numbers, and the units the uploaded file's header named (converted on ingest).
+    units = models.JSONField(default=canonical_units)
+    source_units = models.JSONField(default=dict, blank=True)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['user', 'content_hash'], name='dataset_user_hash_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.uploaded_at.strftime('%Y-%m-%d %H:%M')})"
@@ -52,6 +75,66 @@ class EquipmentRecord(models.Model):
 
     class Meta:
         ordering = ['equipment_name']
+        indexes = [
+            # Serves the name-ordered record pages without sorting the dataset.
+            models.Index(fields=['dataset', 'equipment_name'], name='record_dataset_name_idx'),
+        ]
 
     def __str__(self):
         return self.equipment_name
+
+
+class EquipmentReading(models.Model):
+    """Timestamped reading for one equipment item, from CSVs with a timestamp column."""
+    dataset = models.ForeignKey(EquipmentDataset, on_delete=models.CASCADE, related_name='readings')
+    equipment_name = models.CharField(max_length=255)
+    ts = models.DateTimeField()
+    flowrate = models.FloatField(default=0.0)
+    pressure = models.FloatField(default=0.0)
+    temperature = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ['equipment_name', 'ts']
+        indexes = [
+            models.Index(fields=['dataset', 'equipment_name', 'ts'], name='reading_equipment_ts_idx'),
+            models.Index(fields=['dataset', 'ts'], name='reading_dataset_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_name} @ {self.ts.isoformat()}"
+
+
+class QuarantinedRow(models.Model):
+    """A CSV row that failed validation (see chemviz_core.validation), kept as read with the reasons."""
+    dataset = models.ForeignKey(EquipmentDataset, on_delete=models.CASCADE, related_name='quarantined_rows')
+    # The uploaded or appended file the row came from, and its 1-based data row there (header excluded).
+    source = models.CharField(max_length=255)
+    row = models.IntegerField()
+    reasons = models.JSONField(default=list)
+    values = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Serves the validation report's pages in upload order.
+            models.Index(fields=['dataset', 'id'], name='quarantine_dataset_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.row}"
+
+
+class DatasetAppend(models.Model):
+    """Idempotency record for an append, so retried requests are not applied twice."""
+    dataset = models.ForeignKey(EquipmentDataset, on_delete=models.CASCADE, related_name='appends')
+    key = models.CharField(max_length=255)
+    rows_appended = models.IntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dataset', 'key'], name='unique_append_key_per_dataset'),
+        ]
+
+    def __str__(self):
+        return f"{self.dataset_id}:{self.key}"
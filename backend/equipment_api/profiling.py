@@ -0,0 +1,66 @@
+import time
+from contextlib import contextmanager
+
+
+class StageProfiler:
+    """
+    Wall-clock timers and row counters for the named stages of one ingestion
+    run. Each ``stage()`` block yields its entry so the body can record rows.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self._repeated = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        entry = {'name': name, 'rows': rows}
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['ms'] = round((time.perf_counter() - start) * 1000, 3)
+            self.stages.append(entry)
+
+    @contextmanager
+    def repeated(self, name, rows=None):
+        """
+        Like ``stage`` for work done once per chunk: every block with the
+        same name adds to one entry, which also counts its ``calls``.
+        """
+        entry = {'rows': rows}
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            self.add(name, time.perf_counter() - start, entry['rows'])
+
+    def add(self, name, seconds, rows=None, calls=1):
+        entry = self._repeated.get(name)
+        if entry is None:
+            entry = self._repeated[name] = {'name': name, 'rows': None, 'ms': 0.0, 'calls': 0}
+            self.stages.append(entry)
+        if rows is not None:
+            entry['rows'] = (entry['rows'] or 0) + rows
+        entry['ms'] = round(entry['ms'] + seconds * 1000, 3)
+        entry['calls'] += calls
+
+    def timed(self, name, iterable):
+        """Yield from ``iterable``, adding the time spent producing each item to the repeated stage ``name``."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - start, calls=0)
+                return
+            self.add(name, time.perf_counter() - start)
+            yield item
+
+    def as_dict(self) -> dict:
+        return {
+            'stages': list(self.stages),
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 3),
+        }
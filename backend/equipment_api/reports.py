@@ -0,0 +1,212 @@
+"""
+Report rendering for datasets.
+
+Like parsing, this module does not import Django: views render reports in
+the worker pool from a plain ``Report``, so a PDF build never holds the
+server's GIL.
+"""
+
+import io
+from datetime import datetime
+from typing import NamedTuple
+
+RECORD_FIELDS = ('equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature')
+
+
+class Report(NamedTuple):
+    name: str
+    username: str
+    total_records: int
+    avg_flowrate: float
+    avg_pressure: float
+    avg_temperature: float
+    type_distribution: dict
+    records: list  # tuples of RECORD_FIELDS
+
+
+def render_pdf(report):
+    """
+    Render a report as ``(content, content_type, filename)``: a PDF, or the
+    render_text fallback when reportlab is not installed.
+    """
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.colors import HexColor
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+        from reportlab.lib.units import inch
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    except ImportError:
+        # Fallback: generate a simple text-based PDF using basic bytes
+        return render_text(report)
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=0.6 * inch,
+        leftMargin=0.6 * inch,
+        topMargin=0.6 * inch,
+        bottomMargin=0.6 * inch,
+    )
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Title'],
+        fontSize=22,
+        textColor=HexColor('#1a2332'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold',
+    )
+    subtitle_style = ParagraphStyle(
+        'Subtitle',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=HexColor('#5a6a7a'),
+        spaceAfter=16,
+        alignment=TA_CENTER,
+    )
+    section_style = ParagraphStyle(
+        'Section',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=HexColor('#2c5f8a'),
+        spaceBefore=18,
+        spaceAfter=8,
+        fontName='Helvetica-Bold',
+    )
+    body_style = ParagraphStyle(
+        'Body',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=HexColor('#333333'),
+        spaceAfter=4,
+    )
+
+    story = []
+
+    # Title
+    story.append(Paragraph("Chemical Equipment Parameter Report", title_style))
+    story.append(Paragraph(f"Dataset: {report.name} &nbsp;|&nbsp; Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} &nbsp;|&nbsp; User: {report.username}", subtitle_style))
+    story.append(Spacer(1, 8))
+
+    # Summary Section
+    story.append(Paragraph("Summary Statistics", section_style))
+    summary_data = [
+        ['Metric', 'Value'],
+        ['Total Equipment', str(report.total_records)],
+        ['Avg Flowrate', f"{report.avg_flowrate} L/min"],
+        ['Avg Pressure', f"{report.avg_pressure} bar"],
+        ['Avg Temperature', f"{report.avg_temperature} °C"],
+    ]
+    summary_table = Table(summary_data, colWidths=[2.5 * inch, 2.5 * inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5f8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f0f4f8')),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#c8d6e0')),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]))
+    story.append(summary_table)
+    story.append(Spacer(1, 12))
+
+    # Type Distribution
+    story.append(Paragraph("Equipment Type Distribution", section_style))
+    dist_data = [['Equipment Type', 'Count', 'Percentage']]
+    total = report.total_records or 1
+    for etype, count in sorted(report.type_distribution.items()):
+        pct = round((count / total) * 100, 1)
+        dist_data.append([etype, str(count), f"{pct}%"])
+    dist_table = Table(dist_data, colWidths=[2.8 * inch, 1.0 * inch, 1.2 * inch])
+    dist_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5f8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+        ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f0f4f8')),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#f0f4f8'), HexColor('#ffffff')]),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9.5),
+        ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#c8d6e0')),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('LEFTPADDING', (0, 1), (0, -1), 8),
+    ]))
+    story.append(dist_table)
+
+    # Equipment Records Table
+    story.append(PageBreak())
+    story.append(Paragraph("Equipment Records", section_style))
+
+    header = ['#', 'Equipment Name', 'Type', 'Flowrate (L/min)', 'Pressure (bar)', 'Temp (°C)']
+    table_data = [header]
+    for i, (name, etype, flowrate, pressure, temperature) in enumerate(report.records, 1):
+        table_data.append([
+            str(i),
+            name,
+            etype,
+            f"{flowrate:.1f}",
+            f"{pressure:.1f}",
+            f"{temperature:.1f}",
+        ])
+
+    col_widths = [0.4 * inch, 2.2 * inch, 1.2 * inch, 1.1 * inch, 1.1 * inch, 1.0 * inch]
+    rec_table = Table(table_data, colWidths=col_widths, repeatRows=1)
+    rec_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5f8a')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+        ('ALIGN', (2, 1), (-1, -1), 'CENTER'),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#f7f9fb'), HexColor('#ffffff')]),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8.5),
+        ('GRID', (0, 0), (-1, -1), 0.4, HexColor('#c8d6e0')),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('LEFTPADDING', (1, 1), (1, -1), 6),
+    ]))
+    story.append(rec_table)
+
+    doc.build(story)
+
+    filename = f"report_{report.name.replace('.csv', '')}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+    return buffer.getvalue(), 'application/pdf', filename
+
+
+def render_text(report):
+    """Fallback plain-text PDF if reportlab is not installed."""
+    lines = []
+    lines.append("Chemical Equipment Parameter Report")
+    lines.append(f"Dataset: {report.name}")
+    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    lines.append("")
+    lines.append("=== Summary ===")
+    lines.append(f"Total Records: {report.total_records}")
+    lines.append(f"Avg Flowrate: {report.avg_flowrate} L/min")
+    lines.append(f"Avg Pressure: {report.avg_pressure} bar")
+    lines.append(f"Avg Temperature: {report.avg_temperature} °C")
+    lines.append("")
+    lines.append("=== Type Distribution ===")
+    for t, c in report.type_distribution.items():
+        lines.append(f"  {t}: {c}")
+    lines.append("")
+    lines.append("=== Records ===")
+    for name, etype, flowrate, pressure, temperature in report.records:
+        lines.append(f"  {name} | {etype} | Flow: {flowrate} | Press: {pressure} | Temp: {temperature}")
+
+    content = "\n".join(lines)
+    filename = f"report_{report.name.replace('.csv', '')}.txt"
+    return content.encode(), 'text/plain', filename
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from equipment_api.models import EquipmentDataset, EquipmentRecord, Token
+from equipment_api.models import EquipmentDataset, EquipmentRecord, EquipmentReading, QuarantinedRow, Token
 
 
 class RegisterSerializer(serializers.Serializer):
@@ -51,6 +51,18 @@ class EquipmentRecordSerializer(serializers.ModelSerializer):
         fields = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
 
 
+class EquipmentReadingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EquipmentReading
+        fields = ['equipment_name', 'ts', 'flowrate', 'pressure', 'temperature']
+
+
+class QuarantinedRowSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = QuarantinedRow
+        fields = ['source', 'row', 'reasons', 'values']
+
+
 class EquipmentDatasetSerializer(serializers.ModelSerializer):
     records = EquipmentRecordSerializer(many=True, read_only=True)
 
@@ -59,7 +71,7 @@ class EquipmentDatasetSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'uploaded_at', 'total_records',
             'avg_flowrate', 'avg_pressure', 'avg_temperature',
-            'type_distribution', 'records'
+            'type_distribution', 'quarantined_records', 'units', 'source_units', 'records'
         ]
 
 
@@ -70,5 +82,5 @@ class DatasetSummarySerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'uploaded_at', 'total_records',
             'avg_flowrate', 'avg_pressure', 'avg_temperature',
-            'type_distribution'
+            'type_distribution', 'quarantined_records', 'units', 'source_units'
         ]
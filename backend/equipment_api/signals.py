@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from equipment_api.authentication import token_cache
+from equipment_api.caching import bump_user_version
+from equipment_api.events import publish
+from equipment_api.models import EquipmentDataset, Token
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+    token_cache.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(pre_delete, sender=User)
+def evict_user_tokens(sender, instance, update_fields=None, **kwargs):
+    """
+    Stop every process trusting cached tokens whenever a user is saved (e.g.
+    deactivated) or deleted. Logins only touch last_login and keep the cache.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        token_cache.delete(key)
+    token_cache.invalidate()
+
+
+@receiver(post_save, sender=EquipmentDataset)
+@receiver(post_delete, sender=EquipmentDataset)
+def invalidate_dataset_responses(sender, instance, **kwargs):
+    # Until the commit other connections still read the old rows; a version bumped
+    # earlier would let them cache those rows under the new version.
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_user_version(user_id))
+
+
+@receiver(post_save, sender=EquipmentDataset)
+def announce_saved_dataset(sender, instance, created, **kwargs):
+    # Streaming ingests create the dataset first and fill it in the same transaction,
+    # so clients are told once, after the commit, when it is readable.
+    if created:
+        instance._announce_pending = True
+    elif getattr(instance, '_announce_pending', False):
+        return
+    kind = 'dataset_added' if created else 'dataset_updated'
+    payload = {'id': instance.pk, 'name': instance.name}
+
+    def send():
+        instance._announce_pending = False
+        publish(instance.user_id, kind, **payload)
+    transaction.on_commit(send)
+
+
+@receiver(post_delete, sender=EquipmentDataset)
+def announce_deleted_dataset(sender, instance, **kwargs):
+    payload = {'id': instance.pk, 'name': instance.name}
+    transaction.on_commit(lambda: publish(instance.user_id, 'dataset_deleted', **payload))
@@ -0,0 +1,207 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from equipment_api.caching import response_cache, user_version
+from equipment_api.models import EquipmentDataset, EquipmentReading
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'chemviz-tests'}}
+
+
+class ReadingResampleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('analyst', password='secret-pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.dataset = EquipmentDataset.objects.create(user=self.user, name='year.csv')
+        start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        EquipmentReading.objects.bulk_create([
+            EquipmentReading(dataset=self.dataset, equipment_name='Pump-1', ts=start + timedelta(days=day),
+                             flowrate=100.0 + day, pressure=5.0, temperature=80.0)
+            for day in range(0, 366, 61)
+        ])
+        self.url = reverse('dataset-readings-resample', args=[self.dataset.id])
+
+    def test_resamples_within_limits(self):
+        response = self.client.get(self.url, {'interval': '1D'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 6)
+
+    def test_rejects_interval_below_minimum(self):
+        response = self.client.get(self.url, {'interval': '1ms'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('at least', response.data['error'])
+
+    def test_rejects_negative_interval(self):
+        response = self.client.get(self.url, {'interval': '-1min'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(RESAMPLE_MAX_BUCKETS=1000)
+    def test_rejects_too_many_buckets(self):
+        response = self.client.get(self.url, {'interval': '1min'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('buckets', response.data['error'])
+
+    @override_settings(RESAMPLE_MAX_BUCKETS=1000)
+    def test_narrower_range_fits_under_cap(self):
+        response = self.client.get(self.url, {'interval': '1min', 'start': '2024-03-02T00:00:00Z',
+                                              'end': '2024-03-02T00:00:01Z'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.user = User.objects.create_user('analyst', password='secret-pass')
+        self.client = APIClient()
+        self.client.login(username='analyst', password='secret-pass')
+        self.dataset = EquipmentDataset.objects.create(user=self.user, name='before.csv')
+        self.url = reverse('dataset-history')
+
+    def history_names(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [dataset['name'] for dataset in response.json()]
+
+    def test_version_moves_only_when_the_write_commits(self):
+        self.assertEqual(self.history_names(), ['before.csv'])
+        version = user_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dataset.name = 'after.csv'
+            self.dataset.save()
+            # Readers on other connections still see the committed rows, and so does the cache.
+            self.assertEqual(user_version(self.user.pk), version)
+            self.assertEqual(self.history_names(), ['before.csv'])
+
+        self.assertNotEqual(user_version(self.user.pk), version)
+        self.assertEqual(self.history_names(), ['after.csv'])
+
+    def test_rolled_back_write_keeps_the_cache(self):
+        self.history_names()
+        version = user_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.dataset.delete()
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(user_version(self.user.pk), version)
+
+
+class MetricsAccessTests(TestCase):
+    def test_local_scrape_without_token(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, 200)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, 403)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.0.5', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'chemviz_requests_total', response.content)
+
+
+def equipment_csv(rows, bad_rows=()):
+    lines = ['Equipment Name,Type,Flowrate (L/min),Pressure (bar),Temperature (°C)']
+    for i in range(rows):
+        lines.append(f'Pump-{i % 7},Pump,{100 + i % 13}.5,{5 + i % 3}.1,{40 + i % 11}.2' if i not in bad_rows
+                     else f'Pump-{i % 7},Pump,,{5 + i % 3}.1,{40 + i % 11}.2')
+    return ('\n'.join(lines) + '\n').encode()
+
+
+@override_settings(CACHES=TEST_CACHES, SLOW_REQUEST_MS=60_000)
+class UploadProfilingTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.user = User.objects.create_user('analyst', password='secret-pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, content, name='plant.csv'):
+        upload = SimpleUploadedFile(name, content, content_type='text/csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('upload-csv') + '?debug=1', {'file': upload}, format='multipart')
+
+    def stage_names(self, response):
+        self.assertEqual(response.status_code, 201, response.content)
+        return [stage['name'] for stage in response.data['debug']['stages']]
+
+    def test_in_memory_upload_reports_parse_stages(self):
+        names = self.stage_names(self.upload(equipment_csv(50)))
+        self.assertEqual(names, ['read', 'decode', 'parse_csv', 'compute_summary', 'bulk_create', 'enforce_max_datasets'])
+
+    @override_settings(INGEST_IN_MEMORY_MAX_BYTES=0)
+    def test_streamed_upload_reports_per_chunk_stages(self):
+        response = self.upload(equipment_csv(500, bad_rows={3, 250}))
+        names = self.stage_names(response)
+        for name in ('read', 'parsed_chunks', 'quarantine', 'bulk_create', 'update_summary', 'stream_ingest',
+                     'enforce_max_datasets'):
+            self.assertIn(name, names)
+        stages = {stage['name']: stage for stage in response.data['debug']['stages']}
+        self.assertEqual(stages['bulk_create']['rows'], 498)
+        self.assertEqual(stages['quarantine']['rows'], 2)
+        self.assertGreaterEqual(stages['parsed_chunks']['calls'], 1)
+
+    @override_settings(INGEST_IN_MEMORY_MAX_BYTES=0, PARALLEL_PARSE_MIN_BYTES=0, PARALLEL_PARSE_RANGE_BYTES=4096)
+    def test_parallel_upload_reports_merge_stage(self):
+        names = self.stage_names(self.upload(equipment_csv(500)))
+        self.assertIn('merge_summaries', names)
+        self.assertIn('parsed_chunks', names)
+
+
+def timestamped_csv(rows, bad_rows=range(0)):
+    lines = ['Timestamp,Equipment Name,Type,Flowrate,Pressure,Temperature']
+    start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    for i in range(rows):
+        ts = 'not-a-date' if i in bad_rows else (start + timedelta(minutes=i)).isoformat()
+        lines.append(f'{ts},Pump-{i % 3},Pump,{100 + i % 13}.5,5.1,40.2')
+    return ('\n'.join(lines) + '\n').encode()
+
+
+@override_settings(CACHES=TEST_CACHES, SLOW_REQUEST_MS=60_000)
+class TimestampQuarantineTests(TestCase):
+    def setUp(self):
+        response_cache().clear()
+        self.user = User.objects.create_user('analyst', password='secret-pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, content):
+        upload = SimpleUploadedFile('series.csv', content, content_type='text/csv')
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('upload-csv'), {'file': upload}, format='multipart')
+
+    @override_settings(INGEST_IN_MEMORY_MAX_BYTES=0)
+    def test_undated_chunk_in_the_middle_is_quarantined(self):
+        # 120k rows parse as three 50k-row chunks; the whole second chunk has bad dates.
+        response = self.upload(timestamped_csv(120_000, bad_rows=range(50_000, 100_000)))
+        self.assertEqual(response.status_code, 201, response.content)
+        dataset = EquipmentDataset.objects.get(pk=response.data['id'])
+        self.assertEqual(dataset.quarantined_records, 50_000)
+        self.assertEqual(dataset.readings.count(), 70_000)
+        self.assertEqual(dataset.quarantined_rows.first().reasons, ['timestamp: not a date'])
+
+    @override_settings(INGEST_IN_MEMORY_MAX_BYTES=0, PARALLEL_PARSE_MIN_BYTES=0, PARALLEL_PARSE_RANGE_BYTES=16 * 1024)
+    def test_undated_range_is_quarantined_in_parallel(self):
+        response = self.upload(timestamped_csv(3000, bad_rows=range(1000, 2000)))
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(EquipmentDataset.objects.get(pk=response.data['id']).quarantined_records, 1000)
+
+    def test_file_without_any_date_is_refused(self):
+        response = self.upload(timestamped_csv(20, bad_rows=range(20)))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Timestamp column contains no valid dates.')
+
+    @override_settings(INGEST_IN_MEMORY_MAX_BYTES=0)
+    def test_streamed_file_without_any_date_is_refused(self):
+        response = self.upload(timestamped_csv(20, bad_rows=range(20)))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EquipmentDataset.objects.exists())
@@ -1,16 +1,34 @@
 from django.urls import path
 from equipment_api.views import (
     UploadCSVView,
+    BatchUploadView,
+    AppendCSVView,
     DatasetHistoryView,
     DatasetDetailView,
+    DatasetSummaryView,
+    DatasetRecordsView,
+    DatasetValidationView,
     DatasetDeleteView,
+    DatasetExportView,
     GeneratePDFView,
+    ReadingRangeView,
+    ReadingResampleView,
+    event_stream,
 )
 
 urlpatterns = [
     path('upload/', UploadCSVView.as_view(), name='upload-csv'),
+    path('upload/batch/', BatchUploadView.as_view(), name='upload-batch'),
+    path('dataset/<int:dataset_id>/append/', AppendCSVView.as_view(), name='dataset-append'),
     path('history/', DatasetHistoryView.as_view(), name='dataset-history'),
     path('dataset/<int:dataset_id>/', DatasetDetailView.as_view(), name='dataset-detail'),
+    path('dataset/<int:dataset_id>/summary/', DatasetSummaryView.as_view(), name='dataset-summary'),
+    path('dataset/<int:dataset_id>/records/', DatasetRecordsView.as_view(), name='dataset-records'),
+    path('dataset/<int:dataset_id>/validation/', DatasetValidationView.as_view(), name='dataset-validation'),
     path('dataset/<int:dataset_id>/delete/', DatasetDeleteView.as_view(), name='dataset-delete'),
+    path('dataset/<int:dataset_id>/export/', DatasetExportView.as_view(), name='dataset-export'),
     path('dataset/<int:dataset_id>/report/', GeneratePDFView.as_view(), name='dataset-report'),
+    path('dataset/<int:dataset_id>/readings/', ReadingRangeView.as_view(), name='dataset-readings'),
+    path('dataset/<int:dataset_id>/readings/resample/', ReadingResampleView.as_view(), name='dataset-readings-resample'),
+    path('events/', event_stream, name='events'),
 ]
@@ -1,84 +1,715 @@
 import pandas as pd
+import asyncio
+import csv
 import io
 import os
-from datetime import datetime
+import shutil
+import hashlib
+import gzip
+import json
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack, asynccontextmanager
+import multiprocessing
+import threading
+import time
+
+from asgiref.sync import sync_to_async
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.db import transaction, IntegrityError, DatabaseError
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from django.utils import timezone
+from django.db.models import Count, Max, Min
+from django.views import View
+from django.views.decorators.http import require_GET
+
+from chemviz_core.parsing import (
+    parse_csv,
+    iter_csv_chunks,
+    latest_snapshot,
+    compute_summary,
+    parse_upload,
+    merge_summaries,
+    iter_parallel,
+    read_header_units,
+    dated_rows,
+    NO_VALID_DATES,
+)
+from chemviz_core.validation import RULES
 
-from django.http import HttpResponse
-from django.db import transaction
+from equipment_api.authentication import authenticate_async
 
-from equipment_api.models import EquipmentDataset, EquipmentRecord
+from equipment_api.caching import AsyncCachedResponseMixin, CachedResponseMixin
+from equipment_api.events import EVENTS_POLL_SECONDS, broker, events_since, publish
+from equipment_api.profiling import StageProfiler
+from equipment_api.reports import RECORD_FIELDS, Report, render_pdf
+from equipment_api.models import EquipmentDataset, EquipmentRecord, EquipmentReading, DatasetAppend, QuarantinedRow
 from equipment_api.serializers import (
     EquipmentDatasetSerializer,
     DatasetSummarySerializer,
+    EquipmentRecordSerializer,
+    EquipmentReadingSerializer,
+    QuarantinedRowSerializer,
+)
+
+
+def read_and_hash(file) -> tuple:
+    """Read an uploaded file chunk by chunk, hashing the raw bytes as they stream in."""
+    hasher = hashlib.blake2b(digest_size=32)
+    parts = []
+    for chunk in file.chunks():
+        hasher.update(chunk)
+        parts.append(chunk)
+    return b''.join(parts), hasher.hexdigest()
+
+
+def spool_upload(source):
+    """
+    Return a seekable file holding the upload. Multipart files are already
+    spooled by Django; raw request bodies are copied into a
+    SpooledTemporaryFile so large bodies go to disk.
+    """
+    if hasattr(source, 'chunks'):
+        source.seek(0)
+        return source
+    spooled = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    shutil.copyfileobj(source, spooled, 64 * 1024)
+    spooled.seek(0)
+    return spooled
+
+
+def hash_stream(stream, copy_to=None) -> tuple:
+    """Return ``(hexdigest, size)`` of everything left in ``stream``, optionally copying it to ``copy_to``."""
+    hasher = hashlib.blake2b(digest_size=32)
+    size = 0
+    while chunk := stream.read(64 * 1024):
+        hasher.update(chunk)
+        size += len(chunk)
+        if copy_to is not None:
+            copy_to.write(chunk)
+    return hasher.hexdigest(), size
+
+
+def open_decompressed(fileobj, name, encoding=''):
+    """
+    Wrap an upload in a streaming decompressor picked from its Content-Encoding
+    or file extension. Returns ``(stream, dataset name)``.
+    """
+    if encoding == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode='rb'), name.removesuffix('.gz')
+    if name.endswith('.gz'):
+        return gzip.GzipFile(fileobj=fileobj, mode='rb'), name[:-len('.gz')]
+    if name.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("Server cannot read .zst files: the 'zstandard' package is not installed.")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj), name[:-len('.zst')]
+    if name.endswith('.zip'):
+        archive = zipfile.ZipFile(fileobj)
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.endswith('.csv') and not info.filename.startswith('__MACOSX/')
+        ]
+        if len(members) != 1:
+            raise ValueError('A .zip upload must contain exactly one .csv file; use /upload/batch/ for several.')
+        return archive.open(members[0]), os.path.basename(members[0].filename)
+    return fileobj, name
+
+
+def trim_datasets(user, keep):
+    """Delete all but the newest ``keep`` datasets of a user; returns the deleted ids."""
+    datasets = EquipmentDataset.objects.filter(user=user).order_by('-uploaded_at', '-id')
+    evicted = []
+    for ds in datasets[keep:]:
+        evicted.append(ds.id)
+        ds.delete()
+    return evicted
+
+
+SUMMARY_FIELDS = (
+    'total_records', 'sum_flowrate', 'sum_pressure', 'sum_temperature',
+    'avg_flowrate', 'avg_pressure', 'avg_temperature', 'type_distribution',
 )
 
 
-def parse_csv(file_content: str) -> pd.DataFrame:
-    """Parse CSV content into a cleaned DataFrame."""
-    df = pd.read_csv(io.StringIO(file_content))
-    # Normalize column names
-    df.columns = df.columns.str.strip()
-    # Map expected columns (flexible matching)
-    col_map = {}
-    for col in df.columns:
-        lower = col.lower().replace(' ', '_').replace('(', '').replace(')', '').replace('°c', '').replace('l/min', '').replace('bar', '').strip('_')
-        if 'equipment_name' in lower or 'name' in lower:
-            col_map[col] = 'equipment_name'
-        elif 'type' in lower:
-            col_map[col] = 'equipment_type'
-        elif 'flowrate' in lower or 'flow' in lower:
-            col_map[col] = 'flowrate'
-        elif 'pressure' in lower:
-            col_map[col] = 'pressure'
-        elif 'temperature' in lower or 'temp' in lower:
-            col_map[col] = 'temperature'
-    df.rename(columns=col_map, inplace=True)
-
-    required = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
-    missing = [c for c in required if c not in df.columns]
-    if missing:
-        raise ValueError(f"Missing required columns: {', '.join(missing)}")
-
-    df[['flowrate', 'pressure', 'temperature']] = df[['flowrate', 'pressure', 'temperature']].apply(
-        pd.to_numeric, errors='coerce'
-    ).fillna(0.0)
-    df['equipment_name'] = df['equipment_name'].astype(str).str.strip()
-    df['equipment_type'] = df['equipment_type'].astype(str).str.strip()
-
-    return df
-
-
-def compute_summary(df: pd.DataFrame) -> dict:
-    """Compute summary statistics from the parsed DataFrame."""
-    type_dist = df['equipment_type'].value_counts().to_dict()
-    return {
-        'total_records': len(df),
-        'avg_flowrate': round(df['flowrate'].mean(), 2),
-        'avg_pressure': round(df['pressure'].mean(), 2),
-        'avg_temperature': round(df['temperature'].mean(), 2),
-        'type_distribution': type_dist,
-    }
-
-
-def enforce_max_datasets(user, max_count=5):
-    """Keep only the last N datasets for a user, deleting oldest if needed."""
-    datasets = EquipmentDataset.objects.filter(user=user).order_by('-uploaded_at')
-    count = datasets.count()
-    if count >= max_count:
-        to_delete = datasets[max_count - 1:]
-        for ds in to_delete:
-            ds.delete()
-
-
-class UploadCSVView(APIView):
+def set_summary(dataset, summary):
+    """Store a ``compute_summary``/``merge_summaries`` result on a dataset (unsaved)."""
+    for field in SUMMARY_FIELDS:
+        setattr(dataset, field, summary[field])
+
+
+def apply_summary_delta(dataset, added: pd.DataFrame, removed=()):
+    """
+    Fold added (and replaced) records into the dataset's stored sums and
+    counts, then refresh the averages from them. No records are re-read.
+    """
+    dist = dict(dataset.type_distribution)
+    for rec in removed:
+        dataset.sum_flowrate -= rec.flowrate
+        dataset.sum_pressure -= rec.pressure
+        dataset.sum_temperature -= rec.temperature
+        dist[rec.equipment_type] = dist.get(rec.equipment_type, 0) - 1
+    for etype, count in added['equipment_type'].value_counts().items():
+        dist[etype] = dist.get(etype, 0) + int(count)
+
+    dataset.total_records += len(added) - len(removed)
+    dataset.sum_flowrate += float(added['flowrate'].sum())
+    dataset.sum_pressure += float(added['pressure'].sum())
+    dataset.sum_temperature += float(added['temperature'].sum())
+    dataset.type_distribution = {t: c for t, c in dist.items() if c > 0}
+
+    total = dataset.total_records
+    dataset.avg_flowrate = round(dataset.sum_flowrate / total, 2) if total else 0.0
+    dataset.avg_pressure = round(dataset.sum_pressure / total, 2) if total else 0.0
+    dataset.avg_temperature = round(dataset.sum_temperature / total, 2) if total else 0.0
+
+
+def build_records(dataset, df: pd.DataFrame) -> list:
+    return [
+        EquipmentRecord(
+            dataset=dataset,
+            equipment_name=row.equipment_name,
+            equipment_type=row.equipment_type,
+            flowrate=row.flowrate,
+            pressure=row.pressure,
+            temperature=row.temperature,
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+
+def build_readings(dataset, df: pd.DataFrame) -> list:
+    return [
+        EquipmentReading(
+            dataset=dataset,
+            equipment_name=row.equipment_name,
+            ts=row.timestamp.to_pydatetime(),
+            flowrate=row.flowrate,
+            pressure=row.pressure,
+            temperature=row.temperature,
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+
+def build_quarantine(dataset, source, rejected: pd.DataFrame) -> list:
+    # Cells are kept as text: pandas reads a column as numbers or strings depending on the rest of the chunk.
+    values = rejected.drop(columns=['row', 'reasons'])
+    values = values.astype(str).astype(object).where(values.notna(), None)
+    return [
+        QuarantinedRow(dataset=dataset, source=source, row=row, reasons=reasons, values=cells)
+        for row, reasons, cells in zip(rejected['row'].tolist(), rejected['reasons'], values.to_dict('records'))
+    ]
+
+
+def quarantine(dataset, source, rejected: pd.DataFrame) -> int:
+    """Store the rows of ``source`` that failed validation and count them on the dataset (unsaved)."""
+    if rejected.empty:
+        return 0
+    QuarantinedRow.objects.bulk_create(build_quarantine(dataset, source, rejected), batch_size=5000)
+    dataset.quarantined_records += len(rejected)
+    return len(rejected)
+
+
+def create_dataset(user, name, content_hash, df, readings_df, summary, rejected, source_units=None):
+    """Insert a parsed upload as a new dataset; call inside a transaction."""
+    dataset = EquipmentDataset.objects.create(
+        user=user,
+        name=name,
+        content_hash=content_hash,
+        quarantined_records=len(rejected),
+        source_units=source_units or {},
+        **{field: summary[field] for field in SUMMARY_FIELDS},
+    )
+    EquipmentRecord.objects.bulk_create(build_records(dataset, df), batch_size=5000)
+    if readings_df is not None:
+        EquipmentReading.objects.bulk_create(build_readings(dataset, readings_df), batch_size=5000)
+    QuarantinedRow.objects.bulk_create(build_quarantine(dataset, name, rejected), batch_size=5000)
+    return dataset
+
+
+def append_chunk(dataset, df: pd.DataFrame, profile=None) -> int:
+    """
+    Insert one parsed chunk into an existing dataset and update its summary.
+    Timestamped chunks go to the readings table and only replace a snapshot
+    record when they are newer than every stored reading for that equipment.
+    """
+    profile = profile or StageProfiler()
+    if 'timestamp' not in df.columns:
+        with profile.repeated('bulk_create', rows=len(df)):
+            EquipmentRecord.objects.bulk_create(build_records(dataset, df), batch_size=5000)
+        with profile.repeated('update_summary', rows=len(df)):
+            apply_summary_delta(dataset, df)
+        return len(df)
+
+    with profile.repeated('latest_snapshot', rows=len(df)):
+        snapshot = latest_snapshot(df)
+        names = list(snapshot['equipment_name'])
+        latest = dict(
+            EquipmentReading.objects.filter(dataset=dataset, equipment_name__in=names)
+            .values('equipment_name').annotate(ts=Max('ts')).values_list('equipment_name', 'ts')
+        )
+        newer = snapshot[[
+            name not in latest or ts.to_pydatetime() >= latest[name]
+            for name, ts in zip(snapshot['equipment_name'], snapshot['timestamp'])
+        ]]
+
+    with profile.repeated('bulk_create', rows=len(df)):
+        EquipmentReading.objects.bulk_create(build_readings(dataset, df), batch_size=5000)
+    if not newer.empty:
+        with profile.repeated('update_summary', rows=len(newer)):
+            replaced = list(dataset.records.filter(equipment_name__in=list(newer['equipment_name'])))
+            EquipmentRecord.objects.filter(id__in=[r.id for r in replaced]).delete()
+            EquipmentRecord.objects.bulk_create(build_records(dataset, newer))
+            apply_summary_delta(dataset, newer, removed=replaced)
+    return len(df)
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def worker_pool():
+    """
+    Process pool for CPU-bound work: batch and large upload parsing, and
+    report rendering. Workers are spawned rather than forked so they never
+    inherit the server's threads or DB connections.
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'BATCH_PARSE_WORKERS', None),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _worker_pool
+
+
+_ingest_slots = threading.BoundedSemaphore(getattr(settings, 'INGEST_MAX_CONCURRENT', 2))
+
+
+class IngestSlotMixin:
+    """
+    Let at most INGEST_MAX_CONCURRENT write requests per process run at once;
+    the rest wait their turn. Under ASGI every sync view gets a thread of its
+    own, so without this a burst of uploads turns into as many concurrent
+    write transactions, most of which SQLite turns away as locked.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with _ingest_slots:
+            return super().dispatch(request, *args, **kwargs)
+
+
+@asynccontextmanager
+async def aingest_slot():
+    """Hold an ingest slot from async code. Polls: a thread blocked in acquire() can't be cancelled."""
+    while not _ingest_slots.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+    try:
+        yield
+    finally:
+        _ingest_slots.release()
+
+
+def parsed_chunks(path, stats):
+    """
+    Yield ``(chunk, rejected, summary or None)`` for a CSV file: chunk by
+    chunk on this core, or for files of PARALLEL_PARSE_MIN_BYTES or more, in
+    byte ranges on the worker pool.
+    """
+    if os.path.getsize(path) < getattr(settings, 'PARALLEL_PARSE_MIN_BYTES', 64 * 1024 * 1024):
+        for chunk, rejected in iter_csv_chunks(path, memory_map=True):
+            yield chunk, rejected, None
+        return
+    stats['parallel_ranges'] = 0
+    for parsed in iter_parallel(path, worker_pool(), getattr(settings, 'PARALLEL_PARSE_RANGE_BYTES', 8 * 1024 * 1024),
+                                getattr(settings, 'PARALLEL_PARSE_QUEUE', 8)):
+        stats['parallel_ranges'] += 1
+        yield parsed
+
+
+def ingest_file(dataset, path, stats, on_progress=None, profile=None):
+    """
+    Insert every row of a CSV file into a new, empty dataset and store its
+    summary; call inside a transaction. ``stats`` gets the row count, not
+    counting rows that failed validation and were quarantined. ``profile``
+    gets the time spent in each per-chunk step: parsed_chunks (parsing and
+    validation, or waiting on the worker pool), quarantine, bulk_create and
+    the summary updates.
+    """
+    profile = profile or StageProfiler()
+    dataset.source_units = read_header_units(path)
+    stats['rows'] = 0
+    summaries = []
+    timestamped, dated = False, 0
+    for chunk, rejected, summary in profile.timed('parsed_chunks', parsed_chunks(path, stats)):
+        if 'timestamp' in chunk.columns:
+            timestamped, dated = True, dated + dated_rows(chunk, rejected)
+        with profile.repeated('quarantine', rows=len(rejected)):
+            quarantine(dataset, dataset.name, rejected)
+        if summary is None:
+            stats['rows'] += append_chunk(dataset, chunk, profile)
+        else:
+            # The worker already summarised the chunk; the parts are merged once at the end.
+            with profile.repeated('bulk_create', rows=len(chunk)):
+                EquipmentRecord.objects.bulk_create(build_records(dataset, chunk), batch_size=5000)
+            summaries.append(summary)
+            stats['rows'] += len(chunk)
+        if on_progress:
+            on_progress(stats['rows'])
+    if timestamped and not dated:
+        raise ValueError(NO_VALID_DATES)
+    if summaries:
+        with profile.stage('merge_summaries', rows=len(summaries)):
+            set_summary(dataset, merge_summaries(summaries))
+    dataset.save()
+
+
+UPLOAD_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst', '.zip')
+
+
+class UploadCSVView(IngestSlotMixin, APIView):
+    """
+    Upload a CSV as a multipart 'file' field, or send the CSV as the raw
+    request body (name it with ?name=). .csv.gz, .csv.zst and single-CSV
+    .zip files, as well as bodies sent with Content-Encoding: gzip, are
+    decompressed as a stream straight into the chunked parser. Tag the
+    upload with ?upload_id= to get upload_progress events on /api/events/.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        if request.content_type.startswith('multipart/'):
+            file = request.FILES.get('file')
+            if not file:
+                return Response({'error': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
+            name, source, encoding = file.name, file, ''
+        else:
+            name = request.query_params.get('name') or 'upload.csv'
+            source, encoding = request.stream, request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+            if source is None:
+                return Response({'error': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if encoding not in ('', 'identity', 'gzip'):
+            return Response({'error': f'Unsupported Content-Encoding: {encoding}.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not name.endswith(UPLOAD_SUFFIXES):
+            return Response({'error': 'Only .csv, .csv.gz, .csv.zst and .zip files are allowed.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only small plain files are parsed from memory; everything else streams from disk in chunks.
+        if source is not request.stream and encoding in ('', 'identity') and name.endswith('.csv') \
+                and file.size < getattr(settings, 'INGEST_IN_MEMORY_MAX_BYTES', 1024 * 1024):
+            return self._ingest_in_memory(request, file)
+        return self._ingest_streaming(request, name, source, encoding)
+
+    def _progress(self, request, name, stage, **data):
+        upload_id = request.query_params.get('upload_id')
+        if upload_id:
+            publish(request.user.pk, 'upload_progress', upload_id=upload_id, name=name, stage=stage, **data)
+
+    def _duplicate_response(self, dataset):
+        # Identical bytes were already ingested: skip parsing and keep the retention window intact.
+        data = EquipmentDatasetSerializer(dataset).data
+        data['duplicate'] = True
+        return Response(data, status=status.HTTP_200_OK)
+
+    def _created_response(self, request, dataset):
+        data = EquipmentDatasetSerializer(dataset).data
+        if request.query_params.get('debug') in ('1', 'true'):
+            data['debug'] = dataset.ingest_timings
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def _ingest_in_memory(self, request, file):
+        profile = StageProfiler()
+        with profile.stage('read') as stage:
+            raw, content_hash = read_and_hash(file)
+            stage['bytes'] = len(raw)
+        self._progress(request, file.name, 'read', bytes=len(raw))
+        duplicate = EquipmentDataset.objects.filter(user=request.user, content_hash=content_hash).first()
+        if duplicate:
+            return self._duplicate_response(duplicate)
+
+        try:
+            df, readings_df, summary, rejected = self._parse(raw, profile)
+            source_units = read_header_units(raw)
+        except Exception as e:
+            self._progress(request, file.name, 'failed', error=str(e))
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        self._progress(request, file.name, 'saving', rows=len(df))
+
+        try:
+            with transaction.atomic():
+                with profile.stage('bulk_create') as stage:
+                    dataset = create_dataset(request.user, file.name, content_hash, df, readings_df, summary, rejected,
+                                             source_units)
+                    stage['rows'] = len(df) + (len(readings_df) if readings_df is not None else 0) + len(rejected)
+        except Exception as e:
+            self._progress(request, file.name, 'failed', error=f'Database error: {e}')
+            return Response({'error': f'Database error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        # Retention runs after a successful insert so a failed one never evicts anything.
+        with profile.stage('enforce_max_datasets'):
+            trim_datasets(request.user, keep=5)
+        dataset.ingest_timings = profile.as_dict()
+        EquipmentDataset.objects.filter(pk=dataset.pk).update(ingest_timings=dataset.ingest_timings)
+        self._progress(request, file.name, 'done', rows=len(df), dataset_id=dataset.id)
+        return self._created_response(request, dataset)
+
+    def _parse(self, raw, profile):
+        with profile.stage('decode'):
+            content = raw.decode('utf-8')
+        with profile.stage('parse_csv') as stage:
+            df, rejected = parse_csv(content)
+            readings_df = None
+            if 'timestamp' in df.columns:
+                readings_df = df
+                df = latest_snapshot(df)
+            stage['rows'] = len(readings_df if readings_df is not None else df)
+        with profile.stage('compute_summary', rows=len(df)):
+            summary = compute_summary(df)
+        return df, readings_df, summary, rejected
+
+    def _ingest_streaming(self, request, name, source, encoding):
+        with tempfile.NamedTemporaryFile(suffix='.csv') as decompressed:
+            return self._ingest_file(request, name, source, encoding, decompressed)
+
+    def _ingest_file(self, request, name, source, encoding, decompressed):
+        """
+        Ingest an upload from a plain CSV file on disk: the upload itself when
+        Django already spooled it there, else ``decompressed``, which the hash
+        pass fills.
+        """
+        profile = StageProfiler()
+        try:
+            with profile.stage('read') as stage:
+                spooled = spool_upload(source)
+                stream, name = open_decompressed(spooled, name, encoding)
+                if stream is source and hasattr(source, 'temporary_file_path'):
+                    path, copy_to = source.temporary_file_path(), None
+                else:
+                    path, copy_to = decompressed.name, decompressed
+                # Hash the decompressed CSV so dedup matches plain uploads and ignores gzip header mtimes.
+                content_hash, stage['bytes'] = hash_stream(stream, copy_to)
+                decompressed.flush()
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        self._progress(request, name, 'read', bytes=stage['bytes'])
+        duplicate = EquipmentDataset.objects.filter(user=request.user, content_hash=content_hash).first()
+        if duplicate:
+            return self._duplicate_response(duplicate)
+
+        try:
+            with transaction.atomic():
+                with profile.stage('stream_ingest') as stage:
+                    dataset = EquipmentDataset.objects.create(user=request.user, name=name, content_hash=content_hash)
+                    ingest_file(dataset, path, stage, lambda rows: self._progress(request, name, 'ingesting', rows=rows),
+                                profile)
+        except DatabaseError as e:
+            self._progress(request, name, 'failed', error=f'Database error: {e}')
+            return Response({'error': f'Database error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except Exception as e:
+            self._progress(request, name, 'failed', error=str(e))
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Retention runs after a successful ingest so a bad file never evicts anything.
+        with profile.stage('enforce_max_datasets'):
+            trim_datasets(request.user, keep=5)
+        dataset.ingest_timings = profile.as_dict()
+        EquipmentDataset.objects.filter(pk=dataset.pk).update(ingest_timings=dataset.ingest_timings)
+        self._progress(request, name, 'done', rows=dataset.total_records, dataset_id=dataset.id)
+        return self._created_response(request, dataset)
+
+
+def collect_batch_files(request) -> list:
+    """
+    List the CSVs sent as 'files' fields or inside ZIPs as ``(name, upload,
+    ZIP member or None)``. Only the ZIPs' central directories are read, so
+    the file limit is checked before any CSV data is.
+    """
+    uploads = request.FILES.getlist('files') or request.FILES.getlist('file')
+    files = []
+    for upload in uploads:
+        if upload.name.endswith('.zip'):
+            with zipfile.ZipFile(upload) as archive:
+                for info in archive.infolist():
+                    base = os.path.basename(info.filename)
+                    if info.is_dir() or not base.endswith('.csv') or info.filename.startswith('__MACOSX/'):
+                        continue
+                    files.append((base, upload, info))
+        elif upload.name.endswith('.csv'):
+            files.append((upload.name, upload, None))
+        else:
+            raise ValueError(f'{upload.name}: only .csv and .zip files are allowed.')
+    return files
+
+
+def spool_batch_file(upload, info, stack) -> tuple:
+    """
+    Hash one batch file and return ``(path, content hash)`` of it as a CSV on
+    disk for the worker pool: the upload's own temporary file when Django
+    spooled it there, else a copy made chunk by chunk and removed when
+    ``stack`` closes.
+    """
+    upload.seek(0)
+    if info is None and hasattr(upload, 'temporary_file_path'):
+        return upload.temporary_file_path(), hash_stream(upload)[0]
+    copy = stack.enter_context(tempfile.NamedTemporaryFile(suffix='.csv'))
+    if info is None:
+        content_hash, _ = hash_stream(upload, copy)
+    else:
+        with zipfile.ZipFile(upload) as archive, archive.open(info) as member:
+            content_hash, _ = hash_stream(member, copy)
+    copy.flush()
+    return copy.name, content_hash
+
+
+def batch_duplicate(user, name, content_hash, seen):
+    """The NDJSON payload for a file already stored or earlier in the batch, else None."""
+    duplicate = EquipmentDataset.objects.filter(user=user, content_hash=content_hash).first()
+    if duplicate:
+        return {'file': name, 'status': 'duplicate', 'dataset': DatasetSummarySerializer(duplicate).data}
+    if content_hash in seen:
+        return {'file': name, 'status': 'duplicate', 'duplicate_of': seen[content_hash]}
+    seen[content_hash] = name
+    return None
+
+
+def save_batch_file(user, name, content_hash, path, future) -> dict:
+    """Insert a batch file whose parse ``future`` is done, in its own transaction; returns its NDJSON payload."""
+    try:
+        df, readings_df, summary, rejected = future.result()
+        source_units = read_header_units(path)
+    except Exception as e:
+        return {'file': name, 'status': 'error', 'error': str(e)}
+    try:
+        with transaction.atomic():
+            dataset = create_dataset(user, name, content_hash, df, readings_df, summary, rejected, source_units)
+    except Exception as e:
+        return {'file': name, 'status': 'error', 'error': f'Database error: {e}'}
+    return {'file': name, 'status': 'created', 'dataset': DatasetSummarySerializer(dataset).data}
+
+
+def ndjson_line(payload) -> str:
+    return json.dumps(payload, cls=JSONEncoder) + '\n'
+
+
+class BatchUploadView(APIView):
+    """
+    Upload many CSVs (or one ZIP of CSVs) at once. Each file is copied to
+    disk while it is hashed, then parsed in the process pool, with at most
+    PARALLEL_PARSE_QUEUE files parsed ahead of the database writer; each
+    dataset is inserted in its own transaction. The response is NDJSON with
+    one line per file, written as each file finishes, then a final line once
+    retention has been applied. The stream holds an ingest slot (see
+    IngestSlotMixin) from its first line to its last. Under ASGI it is an
+    async generator, so each line is sent as soon as it is written.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            files = collect_batch_files(request)
+        except (ValueError, zipfile.BadZipFile) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not files:
+            return Response({'error': 'No CSV files provided.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_files = getattr(settings, 'BATCH_MAX_FILES', 50)
+        if len(files) > max_files:
+            return Response({'error': f'At most {max_files} files per batch.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Django reads a sync iterator to the end before sending any of it under ASGI.
+        stream = self._astream if isinstance(request._request, ASGIRequest) else self._stream
+        return StreamingHttpResponse(stream(request.user, files), content_type='application/x-ndjson')
+
+    def _stream(self, user, files):
+        pool, queue_size = worker_pool(), getattr(settings, 'PARALLEL_PARSE_QUEUE', 8)
+        pending, seen, created = {}, {}, 0
+        with _ingest_slots, ExitStack() as stack:
+            try:
+                files = iter(files)
+                while True:
+                    while len(pending) < queue_size and (file := next(files, None)):
+                        name, upload, info = file
+                        path, content_hash = spool_batch_file(upload, info, stack)
+                        duplicate = batch_duplicate(user, name, content_hash, seen)
+                        if duplicate:
+                            yield ndjson_line(duplicate)
+                        else:
+                            pending[pool.submit(parse_upload, path)] = (name, content_hash, path)
+                    if not pending:
+                        break
+                    for future in wait(pending, return_when=FIRST_COMPLETED).done:
+                        payload = save_batch_file(user, *pending.pop(future), future)
+                        created += payload['status'] == 'created'
+                        yield ndjson_line(payload)
+
+                evicted = trim_datasets(user, keep=5)
+                yield ndjson_line({'done': True, 'created': created, 'evicted': evicted})
+            finally:
+                # The client may disconnect mid-stream; don't leave queued parses running.
+                for future in pending:
+                    future.cancel()
+
+    async def _astream(self, user, files):
+        pool, queue_size = worker_pool(), getattr(settings, 'PARALLEL_PARSE_QUEUE', 8)
+        pending, seen, created = {}, {}, 0
+        async with aingest_slot():
+            stack = ExitStack()
+            try:
+                files = iter(files)
+                while True:
+                    while len(pending) < queue_size and (file := next(files, None)):
+                        name, upload, info = file
+                        path, content_hash = await sync_to_async(spool_batch_file, thread_sensitive=False)(
+                            upload, info, stack)
+                        duplicate = await sync_to_async(batch_duplicate)(user, name, content_hash, seen)
+                        if duplicate:
+                            yield ndjson_line(duplicate)
+                        else:
+                            pending[asyncio.wrap_future(pool.submit(parse_upload, path))] = (name, content_hash, path)
+                    if not pending:
+                        break
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        payload = await sync_to_async(save_batch_file)(user, *pending.pop(future), future)
+                        created += payload['status'] == 'created'
+                        yield ndjson_line(payload)
+
+                evicted = await sync_to_async(trim_datasets)(user, keep=5)
+                yield ndjson_line({'done': True, 'created': created, 'evicted': evicted})
+            finally:
+                for future in pending:
+                    future.cancel()
+                stack.close()
+
+
+class AppendCSVView(IngestSlotMixin, APIView):
+    """
+    Append rows from a CSV to an existing dataset without re-uploading it.
+    Send an Idempotency-Key header so a retried request is applied only once.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, dataset_id):
         file = request.FILES.get('file')
         if not file:
             return Response({'error': 'No file provided.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -86,66 +717,216 @@ class UploadCSVView(APIView):
         if not file.name.endswith('.csv'):
             return Response({'error': 'Only .csv files are allowed.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        key = request.META.get('HTTP_IDEMPOTENCY_KEY', '').strip()
+        if len(key) > 255:
+            return Response({'error': 'Idempotency-Key is too long.'}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            content = file.read().decode('utf-8')
-            df = parse_csv(content)
-            summary = compute_summary(df)
-        except Exception as e:
+            with transaction.atomic():
+                try:
+                    dataset = EquipmentDataset.objects.select_for_update().get(id=dataset_id, user=request.user)
+                except EquipmentDataset.DoesNotExist:
+                    return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+                if key:
+                    previous = DatasetAppend.objects.filter(dataset=dataset, key=key).first()
+                    if previous:
+                        return self._response(dataset, previous.rows_appended, replayed=True)
+
+                is_timeseries = dataset.readings.exists()
+                appended, dated = 0, 0
+                for chunk, rejected in iter_csv_chunks(file):
+                    if ('timestamp' in chunk.columns) != is_timeseries:
+                        raise ValueError(
+                            "Timestamped rows can only be appended to a time-series dataset, and vice versa."
+                        )
+                    if is_timeseries:
+                        dated += dated_rows(chunk, rejected)
+                    quarantine(dataset, file.name, rejected)
+                    appended += append_chunk(dataset, chunk)
+                if is_timeseries and not dated:
+                    raise ValueError(NO_VALID_DATES)
+                # The stored rows no longer match the originally uploaded bytes.
+                dataset.content_hash = ''
+                dataset.save()
+                if key:
+                    DatasetAppend.objects.create(dataset=dataset, key=key, rows_appended=appended)
+        except IntegrityError:
+            # A concurrent retry with the same key committed first.
+            previous = DatasetAppend.objects.select_related('dataset').get(dataset_id=dataset_id, key=key)
+            return self._response(previous.dataset, previous.rows_appended, replayed=True)
+        except (ValueError, UnicodeDecodeError) as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Enforce max 5 datasets
-        enforce_max_datasets(request.user, max_count=5)
+        return self._response(dataset, appended, replayed=False)
+
+    def _response(self, dataset, appended, replayed):
+        data = DatasetSummarySerializer(dataset).data
+        data['appended'] = appended
+        data['replayed'] = replayed
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def json_response(data, status=200):
+    """A response rendered exactly as DRF's JSONRenderer renders it."""
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
 
+
+class AsyncReadView(View):
+    """
+    Base for read-only endpoints served as coroutines, so under ASGI a
+    request waiting on the database or on a slow client holds no worker
+    thread. DRF views can't be coroutines, so these authenticate with
+    authenticate_async and answer in JSON only. Under WSGI Django runs them
+    in an event loop of their own.
+    """
+    http_method_names = ['get', 'head', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
         try:
-            with transaction.atomic():
-                dataset = EquipmentDataset.objects.create(
-                    user=request.user,
-                    name=file.name,
-                    total_records=summary['total_records'],
-                    avg_flowrate=summary['avg_flowrate'],
-                    avg_pressure=summary['avg_pressure'],
-                    avg_temperature=summary['avg_temperature'],
-                    type_distribution=summary['type_distribution'],
-                )
-                records = [
-                    EquipmentRecord(
-                        dataset=dataset,
-                        equipment_name=row['equipment_name'],
-                        equipment_type=row['equipment_type'],
-                        flowrate=row['flowrate'],
-                        pressure=row['pressure'],
-                        temperature=row['temperature'],
-                    )
-                    for _, row in df.iterrows()
-                ]
-                EquipmentRecord.objects.bulk_create(records)
-        except Exception as e:
-            return Response({'error': f'Database error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            user = await authenticate_async(request)
+        except AuthenticationFailed as e:
+            return json_response({'detail': e.detail}, status=status.HTTP_403_FORBIDDEN)
+        if user is None:
+            return json_response({'detail': 'Authentication credentials were not provided.'},
+                                 status=status.HTTP_403_FORBIDDEN)
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get_dataset(self, request, dataset_id):
+        try:
+            return await EquipmentDataset.objects.aget(id=dataset_id, user=request.user)
+        except EquipmentDataset.DoesNotExist:
+            return None
+
+
+def not_found():
+    return json_response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = EquipmentDatasetSerializer(dataset)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+def render_detail(dataset, records):
+    """Same bytes as EquipmentDatasetSerializer, from records fetched up front."""
+    data = DatasetSummarySerializer(dataset).data
+    data['records'] = EquipmentRecordSerializer(records, many=True).data
+    return json_response(data)
 
-class DatasetHistoryView(APIView):
+
+class DatasetHistoryView(AsyncCachedResponseMixin, AsyncReadView):
+    async def get(self, request):
+        return await self.cached_response(request, ('history',), lambda: self._build(request))
+
+    async def _build(self, request):
+        datasets = [d async for d in EquipmentDataset.objects.filter(user=request.user).order_by('-uploaded_at')[:5]]
+        return json_response(DatasetSummarySerializer(datasets, many=True).data), None
+
+
+class DatasetDetailView(AsyncCachedResponseMixin, AsyncReadView):
+    async def get(self, request, dataset_id):
+        return await self.cached_response(request, ('detail', dataset_id), lambda: self._build(request, dataset_id))
+
+    async def _build(self, request, dataset_id):
+        dataset = await self.get_dataset(request, dataset_id)
+        if dataset is None:
+            return not_found(), None
+
+        records = [r async for r in dataset.records.all()]
+        # Serializing thousands of records would stall every other request on the loop.
+        response = await sync_to_async(render_detail, thread_sensitive=False)(dataset, records)
+        return response, dataset.updated_at.timestamp()
+
+
+class DatasetSummaryView(AsyncCachedResponseMixin, AsyncReadView):
+    """Dataset metadata and aggregates without records, for clients that page records separately."""
+
+    async def get(self, request, dataset_id):
+        return await self.cached_response(request, ('summary', dataset_id), lambda: self._build(request, dataset_id))
+
+    async def _build(self, request, dataset_id):
+        dataset = await self.get_dataset(request, dataset_id)
+        if dataset is None:
+            return not_found(), None
+
+        return json_response(DatasetSummarySerializer(dataset).data), dataset.updated_at.timestamp()
+
+
+class RecordPagination(PageNumberPagination):
+    page_size = 500
+    page_size_query_param = 'page_size'
+    max_page_size = 5000
+
+
+class DatasetRecordsView(CachedResponseMixin, APIView):
+    """
+    Records of a dataset, one page at a time, in the same order as the detail
+    view unless ``?ordering=`` names a column (``-`` prefix for descending).
+    """
     permission_classes = [IsAuthenticated]
+    ordering_fields = ('equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature')
+
+    def get(self, request, dataset_id):
+        return self.cached_response(request, ('records', dataset_id), lambda: self._build(request, dataset_id))
+
+    def _build(self, request, dataset_id):
+        try:
+            dataset = EquipmentDataset.objects.get(id=dataset_id, user=request.user)
+        except EquipmentDataset.DoesNotExist:
+            return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND), None
 
-    def get(self, request):
-        datasets = EquipmentDataset.objects.filter(user=request.user).order_by('-uploaded_at')[:5]
-        serializer = DatasetSummarySerializer(datasets, many=True)
-        return Response(serializer.data)
+        ordering = request.query_params.get('ordering', 'equipment_name')
+        if ordering.lstrip('-') not in self.ordering_fields:
+            return Response({'error': f'Cannot order by {ordering!r}.'}, status=status.HTTP_400_BAD_REQUEST), None
+        records = dataset.records.order_by(ordering, 'id')
+        paginator = RecordPagination()
+        page = paginator.paginate_queryset(records, request, view=self)
+        serializer = EquipmentRecordSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data), dataset.updated_at.timestamp()
 
 
-class DatasetDetailView(APIView):
+class QuarantinePagination(PageNumberPagination):
+    page_size = 500
+    page_size_query_param = 'page_size'
+    max_page_size = 5000
+
+
+class DatasetValidationView(CachedResponseMixin, APIView):
+    """
+    Validation report of a dataset: the rules rows are checked against, how
+    many quarantined rows failed each check, and the quarantined rows
+    themselves, one page at a time in the order they were read.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, dataset_id):
+        return self.cached_response(request, ('validation', dataset_id), lambda: self._build(request, dataset_id))
+
+    def _build(self, request, dataset_id):
         try:
             dataset = EquipmentDataset.objects.get(id=dataset_id, user=request.user)
         except EquipmentDataset.DoesNotExist:
-            return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND), None
+
+        # Rows usually fail in a handful of ways, so group by the whole reason list first.
+        failures = {}
+        combos = dataset.quarantined_rows.order_by().values('reasons').annotate(count=Count('id'))
+        for reasons, count in combos.values_list('reasons', 'count'):
+            for reason in reasons:
+                failures[reason] = failures.get(reason, 0) + count
 
-        serializer = EquipmentDatasetSerializer(dataset)
-        return Response(serializer.data)
+        paginator = QuarantinePagination()
+        page = paginator.paginate_queryset(dataset.quarantined_rows.order_by('id'), request, view=self)
+        response = paginator.get_paginated_response(QuarantinedRowSerializer(page, many=True).data)
+        response.data = {
+            'dataset_id': dataset.id,
+            'total_records': dataset.total_records,
+            'quarantined_records': dataset.quarantined_records,
+            'failures': dict(sorted(failures.items(), key=lambda item: -item[1])),
+            'rules': {
+                column: {key: value for key, value in rule._asdict().items() if value is not None}
+                for column, rule in RULES.items()
+            },
+            **response.data,
+        }
+        return response, dataset.updated_at.timestamp()
 
 
 class DatasetDeleteView(APIView):
@@ -160,7 +941,36 @@ class DatasetDeleteView(APIView):
             return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class GeneratePDFView(APIView):
+class ReadingPagination(PageNumberPagination):
+    page_size = 500
+    page_size_query_param = 'page_size'
+    max_page_size = 5000
+
+
+def filter_readings(request, dataset):
+    """
+    Apply the equipment/start/end query params to a dataset's readings.
+    Filters are ordered to match the (dataset, equipment_name, ts) index so a
+    range for one equipment is an index seek rather than a dataset scan.
+    """
+    readings = EquipmentReading.objects.filter(dataset=dataset)
+    equipment = request.GET.get('equipment')
+    if equipment:
+        readings = readings.filter(equipment_name=equipment)
+    for param, lookup in (('start', 'ts__gte'), ('end', 'ts__lt')):
+        value = request.GET.get(param)
+        if not value:
+            continue
+        ts = parse_datetime(value)
+        if ts is None:
+            raise ValueError(f"Invalid '{param}' timestamp: {value}")
+        if timezone.is_naive(ts):
+            ts = timezone.make_aware(ts)
+        readings = readings.filter(**{lookup: ts})
+    return readings
+
+
+class ReadingRangeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, dataset_id):
@@ -170,188 +980,241 @@ class GeneratePDFView(APIView):
             return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.colors import HexColor
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.units import inch
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        except ImportError:
-            # Fallback: generate a simple text-based PDF using basic bytes
-            return self._generate_simple_pdf(dataset)
-
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=0.6 * inch,
-            leftMargin=0.6 * inch,
-            topMargin=0.6 * inch,
-            bottomMargin=0.6 * inch,
-        )
+            readings = filter_readings(request, dataset).order_by('equipment_name', 'ts')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Title'],
-            fontSize=22,
-            textColor=HexColor('#1a2332'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold',
-        )
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=HexColor('#5a6a7a'),
-            spaceAfter=16,
-            alignment=TA_CENTER,
-        )
-        section_style = ParagraphStyle(
-            'Section',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=HexColor('#2c5f8a'),
-            spaceBefore=18,
-            spaceAfter=8,
-            fontName='Helvetica-Bold',
-        )
-        body_style = ParagraphStyle(
-            'Body',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=HexColor('#333333'),
-            spaceAfter=4,
-        )
+        paginator = ReadingPagination()
+        page = paginator.paginate_queryset(readings, request, view=self)
+        serializer = EquipmentReadingSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-        story = []
-
-        # Title
-        story.append(Paragraph("Chemical Equipment Parameter Report", title_style))
-        story.append(Paragraph(f"Dataset: {dataset.name} &nbsp;|&nbsp; Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} &nbsp;|&nbsp; User: {request.user.username}", subtitle_style))
-        story.append(Spacer(1, 8))
-
-        # Summary Section
-        story.append(Paragraph("Summary Statistics", section_style))
-        summary_data = [
-            ['Metric', 'Value'],
-            ['Total Equipment', str(dataset.total_records)],
-            ['Avg Flowrate', f"{dataset.avg_flowrate} L/min"],
-            ['Avg Pressure', f"{dataset.avg_pressure} bar"],
-            ['Avg Temperature', f"{dataset.avg_temperature} °C"],
-        ]
-        summary_table = Table(summary_data, colWidths=[2.5 * inch, 2.5 * inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5f8a')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f0f4f8')),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#c8d6e0')),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 12))
-
-        # Type Distribution
-        story.append(Paragraph("Equipment Type Distribution", section_style))
-        dist_data = [['Equipment Type', 'Count', 'Percentage']]
-        total = dataset.total_records or 1
-        for etype, count in sorted(dataset.type_distribution.items()):
-            pct = round((count / total) * 100, 1)
-            dist_data.append([etype, str(count), f"{pct}%"])
-        dist_table = Table(dist_data, colWidths=[2.8 * inch, 1.0 * inch, 1.2 * inch])
-        dist_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5f8a')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f0f4f8')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#f0f4f8'), HexColor('#ffffff')]),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9.5),
-            ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#c8d6e0')),
-            ('TOPPADDING', (0, 0), (-1, -1), 5),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-            ('LEFTPADDING', (0, 1), (0, -1), 8),
-        ]))
-        story.append(dist_table)
-
-        # Equipment Records Table
-        story.append(PageBreak())
-        story.append(Paragraph("Equipment Records", section_style))
-
-        records = dataset.records.all()
-        header = ['#', 'Equipment Name', 'Type', 'Flowrate (L/min)', 'Pressure (bar)', 'Temp (°C)']
-        table_data = [header]
-        for i, rec in enumerate(records, 1):
-            table_data.append([
-                str(i),
-                rec.equipment_name,
-                rec.equipment_type,
-                f"{rec.flowrate:.1f}",
-                f"{rec.pressure:.1f}",
-                f"{rec.temperature:.1f}",
-            ])
-
-        col_widths = [0.4 * inch, 2.2 * inch, 1.2 * inch, 1.1 * inch, 1.1 * inch, 1.0 * inch]
-        rec_table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        rec_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#2c5f8a')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), HexColor('#ffffff')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-            ('ALIGN', (2, 1), (-1, -1), 'CENTER'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#f7f9fb'), HexColor('#ffffff')]),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8.5),
-            ('GRID', (0, 0), (-1, -1), 0.4, HexColor('#c8d6e0')),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('LEFTPADDING', (1, 1), (1, -1), 6),
-        ]))
-        story.append(rec_table)
-
-        doc.build(story)
-        buffer.seek(0)
-
-        filename = f"report_{dataset.name.replace('.csv', '')}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
+
+def offset_width(freq) -> pd.Timedelta:
+    """Average length of one ``freq`` period; exact for fixed frequencies such as ``1min``."""
+    origin = pd.Timestamp('2000-01-01', tz='UTC')
+    return ((origin + 100 * freq) - origin) / 100
+
+
+class ReadingResampleView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, dataset_id):
+        try:
+            dataset = EquipmentDataset.objects.get(id=dataset_id, user=request.user)
+        except EquipmentDataset.DoesNotExist:
+            return Response({'error': 'Dataset not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        interval = request.query_params.get('interval', '1min')
+        try:
+            freq = pd.tseries.frequencies.to_offset(interval)
+            width = offset_width(freq)
+            readings = filter_readings(request, dataset)
+        except (ValueError, OverflowError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # The resample allocates a row per bucket per equipment, so refuse intervals that would be huge.
+        min_seconds = getattr(settings, 'RESAMPLE_MIN_INTERVAL_SECONDS', 1)
+        if width < pd.Timedelta(seconds=min_seconds):
+            return Response({'error': f'Interval must be at least {min_seconds} seconds.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        span = readings.aggregate(start=Min('ts'), end=Max('ts'), equipment=Count('equipment_name', distinct=True))
+        if span['start'] is not None:
+            buckets = (int((span['end'] - span['start']) / width) + 1) * span['equipment']
+            max_buckets = getattr(settings, 'RESAMPLE_MAX_BUCKETS', 100_000)
+            if buckets > max_buckets:
+                return Response({'error': f'Interval {interval} gives {buckets} buckets; at most {max_buckets} '
+                                          f'are allowed. Use a longer interval or a narrower range.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        fields = ['equipment_name', 'ts', 'flowrate', 'pressure', 'temperature']
+        df = pd.DataFrame.from_records(readings.values_list(*fields), columns=fields)
+        if df.empty:
+            return Response({'interval': interval, 'results': []})
+
+        df['ts'] = pd.to_datetime(df['ts'], utc=True)
+        grouped = df.set_index('ts').groupby('equipment_name').resample(freq)
+        means = grouped[['flowrate', 'pressure', 'temperature']].mean().round(2)
+        means['samples'] = grouped.size()
+        means = means[means['samples'] > 0].reset_index()
+        means['ts'] = means['ts'].map(lambda t: t.isoformat())
+
+        return Response({'interval': interval, 'results': means.to_dict(orient='records')})
+
+
+EXPORT_CHUNK_ROWS = 2000
+EXPORTS = {
+    'records': (RECORD_FIELDS, ('Equipment Name', 'Type', 'Flowrate (L/min)', 'Pressure (bar)', 'Temperature (°C)')),
+    'readings': (('ts', 'equipment_name', 'flowrate', 'pressure', 'temperature'),
+                 ('Timestamp', 'Equipment Name', 'Flowrate (L/min)', 'Pressure (bar)', 'Temperature (°C)')),
+}
+
+
+def csv_lines(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def export_chunks(rows, header):
+    yield csv_lines([header])
+    batch = []
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_ROWS):
+        batch.append(row.values())
+        if len(batch) == EXPORT_CHUNK_ROWS:
+            yield csv_lines(batch)
+            batch = []
+    if batch:
+        yield csv_lines(batch)
+
+
+async def aexport_chunks(rows, header):
+    yield csv_lines([header])
+    batch = []
+    async for row in rows.aiterator(chunk_size=EXPORT_CHUNK_ROWS):
+        batch.append(row.values())
+        if len(batch) == EXPORT_CHUNK_ROWS:
+            yield csv_lines(batch)
+            batch = []
+    if batch:
+        yield csv_lines(batch)
+
+
+class DatasetExportView(AsyncReadView):
+    """
+    Download a dataset's records as CSV, or its readings with ``?kind=readings``
+    (filtered like /readings/). Rows are streamed EXPORT_CHUNK_ROWS at a time;
+    under ASGI they come from the async ORM, so a slow download holds no
+    worker, and under WSGI from a server-side cursor.
+    """
+
+    async def get(self, request, dataset_id):
+        dataset = await self.get_dataset(request, dataset_id)
+        if dataset is None:
+            return not_found()
+
+        kind = request.GET.get('kind', 'records')
+        if kind not in EXPORTS:
+            return json_response({'error': f'Unknown export {kind!r}.'}, status=status.HTTP_400_BAD_REQUEST)
+        fields, header = EXPORTS[kind]
+        if kind == 'readings':
+            try:
+                rows = filter_readings(request, dataset).order_by('equipment_name', 'ts')
+            except ValueError as e:
+                return json_response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = dataset.records.order_by('equipment_name', 'id')
+        # values() rather than values_list(): aiterator() runs values_list queries on the event loop thread.
+        rows = rows.values(*fields)
+
+        chunks = aexport_chunks(rows, header) if isinstance(request, ASGIRequest) else export_chunks(rows, header)
+        response = StreamingHttpResponse(chunks, content_type='text/csv')
+        filename = f"{dataset.name.removesuffix('.csv')}_{kind}.csv"
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         return response
 
-    def _generate_simple_pdf(self, dataset):
-        """Fallback plain-text PDF if reportlab is not installed."""
-        lines = []
-        lines.append("Chemical Equipment Parameter Report")
-        lines.append(f"Dataset: {dataset.name}")
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        lines.append("")
-        lines.append("=== Summary ===")
-        lines.append(f"Total Records: {dataset.total_records}")
-        lines.append(f"Avg Flowrate: {dataset.avg_flowrate} L/min")
-        lines.append(f"Avg Pressure: {dataset.avg_pressure} bar")
-        lines.append(f"Avg Temperature: {dataset.avg_temperature} °C")
-        lines.append("")
-        lines.append("=== Type Distribution ===")
-        for t, c in dataset.type_distribution.items():
-            lines.append(f"  {t}: {c}")
-        lines.append("")
-        lines.append("=== Records ===")
-        for rec in dataset.records.all():
-            lines.append(f"  {rec.equipment_name} | {rec.equipment_type} | Flow: {rec.flowrate} | Press: {rec.pressure} | Temp: {rec.temperature}")
-
-        content = "\n".join(lines)
-        filename = f"report_{dataset.name.replace('.csv', '')}.txt"
-        response = HttpResponse(content, content_type='text/plain')
+
+class GeneratePDFView(AsyncReadView):
+    """
+    PDF report of a dataset. The records are read with the async ORM and the
+    document is built in the worker pool, so neither the event loop nor a
+    server thread is busy while reportlab runs.
+    """
+
+    async def get(self, request, dataset_id):
+        dataset = await self.get_dataset(request, dataset_id)
+        if dataset is None:
+            return not_found()
+
+        # A report only changes with its dataset, so clients holding a copy skip the render entirely.
+        etag = '"report-%d-%d"' % (dataset.id, dataset.updated_at.timestamp() * 1_000_000)
+        last_modified = int(dataset.updated_at.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            await sync_to_async(publish)(request.user.pk, 'report_started', dataset_id=dataset.id)
+            response = await self._render(request, dataset)
+            await sync_to_async(publish)(request.user.pk, 'report_ready', dataset_id=dataset.id)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    async def _render(self, request, dataset):
+        report = Report(
+            name=dataset.name,
+            username=request.user.username,
+            total_records=dataset.total_records,
+            avg_flowrate=dataset.avg_flowrate,
+            avg_pressure=dataset.avg_pressure,
+            avg_temperature=dataset.avg_temperature,
+            type_distribution=dataset.type_distribution,
+            records=[r async for r in dataset.records.values_list(*RECORD_FIELDS)],
+        )
+        content, content_type, filename = await asyncio.wrap_future(worker_pool().submit(render_pdf, report))
+        response = HttpResponse(content, content_type=content_type)
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         return response
+
+
+def format_event(event) -> str:
+    data = json.dumps(event['data'], cls=JSONEncoder)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+async def stream_events(user_id, last_id, keep_open):
+    """
+    Server-sent events for one user. Open streams wait on the loop's broker
+    and send a comment line as a heartbeat; long-poll responses end after the
+    first batch of events or EVENTS_LONG_POLL_SECONDS.
+    """
+    yield f"retry: {getattr(settings, 'EVENTS_RETRY_MS', 2000)}\n\n"
+    heartbeat = getattr(settings, 'EVENTS_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + getattr(settings, 'EVENTS_LONG_POLL_SECONDS', 25)
+    loop_broker = broker() if keep_open else None
+    wake = loop_broker.subscribe(user_id) if keep_open else None
+    try:
+        while True:
+            if wake:
+                wake.clear()
+            events = await sync_to_async(events_since)(user_id, last_id)
+            for event in events:
+                last_id = max(last_id, event['id'])
+                yield format_event(event)
+            if keep_open:
+                try:
+                    await asyncio.wait_for(wake.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': ping\n\n'
+            elif events or time.monotonic() >= deadline:
+                return
+            else:
+                await asyncio.sleep(EVENTS_POLL_SECONDS)
+    finally:
+        if wake:
+            loop_broker.unsubscribe(user_id, wake)
+
+
+@require_GET
+async def event_stream(request):
+    """
+    Push channel for upload progress, report and dataset events. Under ASGI
+    the stream stays open; under WSGI, or with ``?poll=1``, each response
+    is one long poll and the EventSource ``retry`` reconnects. Resume with
+    the Last-Event-ID header (or ``?since=``); a new connection starts from now.
+    """
+    try:
+        user = await authenticate_async(request)
+    except AuthenticationFailed:
+        user = None
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.GET.get('since') or time.time_ns() // 1000)
+    except ValueError:
+        return JsonResponse({'error': 'Last-Event-ID must be an event id.'}, status=400)
+
+    keep_open = isinstance(request, ASGIRequest) and request.GET.get('poll') not in ('1', 'true')
+    response = StreamingHttpResponse(stream_events(user.pk, last_id, keep_open), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # keep nginx from buffering the stream
+    return response
@@ -0,0 +1,6 @@
+"""
+CSV parsing, validation and unit conversion shared by the ChemViz backend
+and the desktop app. Depends on pandas and NumPy only, never on Django, so
+the server's worker processes and the desktop app's local preview import it
+directly.
+"""
@@ -0,0 +1,245 @@
+"""
+CSV parsing and summary logic for equipment datasets.
+
+Only pandas and the validation rules are imported here, so the module can
+be loaded by worker processes that never configure Django.
+"""
+
+import io
+import os
+from collections import deque
+
+import pandas as pd
+
+from chemviz_core.units import BRACKETED, header_units
+from chemviz_core.validation import RULES, validate_frame
+
+
+NO_VALID_DATES = "Timestamp column contains no valid dates."
+
+
+def parse_csv(file_content: str) -> tuple:
+    """Parse CSV content into ``(df, rejected)``; see ``clean_frame`` and ``require_dates``."""
+    return require_dates(*clean_frame(pd.read_csv(io.StringIO(file_content))))
+
+
+def iter_csv_chunks(stream, chunksize=50_000, memory_map=False):
+    """
+    Yield ``clean_frame`` results ``(df, rejected)`` from a binary CSV stream
+    or file path, one chunk at a time. ``memory_map`` maps an uncompressed file path into memory
+    instead of reading it through a buffer. Chunks are not checked with
+    ``require_dates``; callers sum ``dated_rows`` over the file instead.
+    """
+    for chunk in pd.read_csv(stream, chunksize=chunksize, encoding='utf-8', memory_map=memory_map):
+        yield clean_frame(chunk)
+
+
+def column_map(columns) -> dict:
+    """
+    Map flexible (already stripped) column names onto the canonical schema.
+    Bracketed units are left out of the match; ``header_units`` reads them.
+    """
+    col_map = {}
+    for col in columns:
+        lower = BRACKETED.sub('', col).strip().lower().replace(' ', '_').strip('_')
+        if 'timestamp' in lower or lower in ('time', 'ts', 'date', 'datetime'):
+            col_map[col] = 'timestamp'
+        elif 'equipment_name' in lower or 'name' in lower:
+            col_map[col] = 'equipment_name'
+        elif 'type' in lower:
+            col_map[col] = 'equipment_type'
+        elif 'flowrate' in lower or 'flow' in lower:
+            col_map[col] = 'flowrate'
+        elif 'pressure' in lower:
+            col_map[col] = 'pressure'
+        elif 'temperature' in lower or 'temp' in lower:
+            col_map[col] = 'temperature'
+    return col_map
+
+
+def clean_frame(df: pd.DataFrame, col_map=None) -> tuple:
+    """
+    Map flexible column names onto the canonical schema, coerce types,
+    convert numbers to the canonical units and validate the rows. Returns
+    ``(df, rejected)`` as ``validate_frame`` does: rows that fail a rule are
+    split off rather than zero-filled.
+    Pass ``col_map`` to reuse a map already built from the file's header.
+    """
+    # Normalize column names
+    df.columns = df.columns.str.strip()
+    if col_map is None:
+        col_map = column_map(df.columns)
+    units = header_units(col_map)
+    df.rename(columns=col_map, inplace=True)
+
+    required = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    return validate_frame(df, coerce_frame(df, units))
+
+
+def read_header_units(source) -> dict:
+    """Symbols of the units a CSV header names, as ``{canonical column: symbol}``; ``source`` is a path or bytes."""
+    columns = pd.read_csv(io.BytesIO(source) if isinstance(source, bytes) else source, nrows=0, encoding='utf-8').columns
+    return {column: unit.symbol for column, unit in header_units(column_map(columns.str.strip())).items()}
+
+
+def coerce_frame(df: pd.DataFrame, units=None) -> dict:
+    """
+    Coerce the canonical columns of a renamed frame in place; unparseable
+    cells become NaN/NaT for ``validate_frame`` to report. Numbers in a
+    column whose header named a unit (``units``, from ``header_units``) are
+    converted to the canonical unit. Returns the columns as they were read.
+    """
+    raw = {column: df[column] for column in RULES if column in df.columns}
+    df[['flowrate', 'pressure', 'temperature']] = df[['flowrate', 'pressure', 'temperature']].apply(
+        pd.to_numeric, errors='coerce'
+    )
+    for column, unit in (units or {}).items():
+        if not unit.is_canonical:
+            df[column] = unit.to_canonical(df[column].to_numpy(dtype=float, copy=True))
+    df['equipment_name'] = df['equipment_name'].astype(str).str.strip()
+    df['equipment_type'] = df['equipment_type'].astype(str).str.strip()
+
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', utc=True)
+    return raw
+
+
+def dated_rows(df: pd.DataFrame, rejected: pd.DataFrame) -> int:
+    """
+    Rows of a ``clean_frame`` result whose timestamp parsed, whether they
+    were kept or quarantined for another reason. Rows without one are
+    quarantined like any other bad row, so a file is only refused as a whole
+    when this sums to 0 over all of its chunks.
+    """
+    if rejected.empty:
+        return len(df)
+    undated = rejected['reasons'].map(lambda reasons: any(r.startswith('timestamp:') for r in reasons))
+    return len(df) + len(rejected) - int(undated.sum())
+
+
+def require_dates(df: pd.DataFrame, rejected: pd.DataFrame) -> tuple:
+    """Refuse a whole timestamped file (not one chunk of it) in which no timestamp parsed."""
+    if 'timestamp' in df.columns and dated_rows(df, rejected) == 0:
+        raise ValueError(NO_VALID_DATES)
+    return df, rejected
+
+
+def latest_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    """Reduce timestamped readings to the most recent row per equipment."""
+    return df.sort_values('timestamp').groupby('equipment_name', sort=False).tail(1)
+
+
+def compute_summary(df: pd.DataFrame) -> dict:
+    """Compute summary statistics from the parsed DataFrame."""
+    type_dist = df['equipment_type'].value_counts().to_dict()
+    total = len(df)
+    return {
+        'total_records': total,
+        'sum_flowrate': float(df['flowrate'].sum()),
+        'sum_pressure': float(df['pressure'].sum()),
+        'sum_temperature': float(df['temperature'].sum()),
+        'avg_flowrate': round(df['flowrate'].mean(), 2) if total else 0.0,
+        'avg_pressure': round(df['pressure'].mean(), 2) if total else 0.0,
+        'avg_temperature': round(df['temperature'].mean(), 2) if total else 0.0,
+        'type_distribution': type_dist,
+    }
+
+
+def merge_summaries(summaries) -> dict:
+    """Combine ``compute_summary`` results of disjoint chunks into the summary of all their rows."""
+    total = sum(s['total_records'] for s in summaries)
+    merged = {'total_records': total, 'type_distribution': {}}
+    for field in ('flowrate', 'pressure', 'temperature'):
+        merged[f'sum_{field}'] = sum(s[f'sum_{field}'] for s in summaries)
+        merged[f'avg_{field}'] = round(merged[f'sum_{field}'] / total, 2) if total else 0.0
+    for s in summaries:
+        for equipment_type, count in s['type_distribution'].items():
+            merged['type_distribution'][equipment_type] = merged['type_distribution'].get(equipment_type, 0) + int(count)
+    merged['type_distribution'] = dict(sorted(merged['type_distribution'].items(), key=lambda item: -item[1]))
+    return merged
+
+
+def parse_upload(source) -> tuple:
+    """
+    Parse and summarise one uploaded file, given as bytes or a path. Returns
+    ``(df, readings_df, summary, rejected)``; ``readings_df`` is only set for
+    timestamped files, whose ``df`` is reduced to the latest snapshot per
+    equipment.
+    """
+    if isinstance(source, bytes):
+        df, rejected = parse_csv(source.decode('utf-8'))
+    else:
+        df, rejected = require_dates(*clean_frame(pd.read_csv(source, encoding='utf-8')))
+    readings_df = None
+    if 'timestamp' in df.columns:
+        readings_df = df
+        df = latest_snapshot(df)
+    return df, readings_df, compute_summary(df), rejected
+
+
+def split_ranges(path, range_bytes) -> list:
+    """
+    Split the data rows of a CSV file (everything after the header line) into
+    ``(start, end)`` byte ranges of about ``range_bytes``, each ending on a
+    newline. Quoted fields must not contain newlines, which holds for the
+    equipment exports this app reads.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + range_bytes, size))
+            f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(path, start, end, columns, col_map) -> tuple:
+    """
+    Parse one byte range of a CSV file in a worker process. Returns
+    ``(df, rejected, summary)``; row numbers in ``rejected`` count from the
+    start of the range, and the summary is None for timestamped files, whose
+    summary depends on rows in other ranges.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df, rejected = clean_frame(pd.read_csv(io.BytesIO(data), header=None, names=columns, encoding='utf-8'), col_map)
+    return df, rejected, (None if 'timestamp' in df.columns else compute_summary(df))
+
+
+def iter_parallel(path, pool, range_bytes, queue_size):
+    """
+    Yield ``parse_range`` results for a whole CSV file in file order, parsing
+    ranges on ``pool``. The header is read once here and its column map is
+    shared with every worker. At most ``queue_size`` ranges are submitted but
+    not yet taken by the caller, so a slow consumer (the DB writer) holds
+    back the parse instead of letting parsed frames pile up in memory.
+    Rejected rows are renumbered from the start of the file.
+    """
+    columns = list(pd.read_csv(path, nrows=0, encoding='utf-8').columns)
+    col_map = column_map([c.strip() for c in columns])
+    ranges = iter(split_ranges(path, range_bytes))
+    pending = deque()
+    offset = 0
+    try:
+        while True:
+            while len(pending) < queue_size and (span := next(ranges, None)):
+                pending.append(pool.submit(parse_range, path, *span, columns, col_map))
+            if not pending:
+                return
+            df, rejected, summary = pending.popleft().result()
+            rejected['row'] += offset
+            offset += len(df) + len(rejected)
+            yield df, rejected, summary
+    finally:
+        for future in pending:
+            future.cancel()
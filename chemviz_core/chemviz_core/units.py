@@ -0,0 +1,107 @@
+"""
+Unit registry for the numeric equipment columns.
+
+Records are stored in one canonical unit per column (CANONICAL_UNITS). A CSV
+may name another unit in a column header ("Pressure (psi)", "temp_F") or
+after a single value ("30 psi"); such values are converted on ingest with the
+unit's scale and offset, so sites exporting °F, psi or m³/h land in the same
+averages as everyone else.
+
+Like ``parsing``, this module does not import Django.
+"""
+
+import re
+from typing import NamedTuple
+
+import numpy as np
+
+CANONICAL_UNITS = {'flowrate': 'L/min', 'pressure': 'bar', 'temperature': '°C'}
+
+
+class Unit(NamedTuple):
+    quantity: str  # the column it measures
+    symbol: str
+    # canonical value = value * scale + offset
+    scale: float = 1.0
+    offset: float = 0.0
+
+    @property
+    def is_canonical(self):
+        return self.scale == 1.0 and self.offset == 0.0
+
+    def to_canonical(self, values: np.ndarray) -> np.ndarray:
+        """Convert a float array in place: one multiply, plus one add for offset units such as °F."""
+        if self.scale != 1.0:
+            np.multiply(values, self.scale, out=values)
+        if self.offset:
+            np.add(values, self.offset, out=values)
+        return values
+
+
+REGISTRY = [
+    (('l/min', 'lpm'), Unit('flowrate', 'L/min')),
+    (('l/s', 'lps'), Unit('flowrate', 'L/s', 60.0)),
+    (('l/h', 'lph'), Unit('flowrate', 'L/h', 1 / 60)),
+    (('m3/h', 'm3/hr'), Unit('flowrate', 'm³/h', 1000 / 60)),
+    (('m3/min',), Unit('flowrate', 'm³/min', 1000.0)),
+    (('m3/s',), Unit('flowrate', 'm³/s', 60_000.0)),
+    (('gpm', 'gal/min'), Unit('flowrate', 'gal/min', 3.785411784)),  # US gallons
+    (('cfm', 'ft3/min'), Unit('flowrate', 'ft³/min', 28.316846592)),
+    # Gauge and absolute readings (barg, psia) are kept as read, not converted into each other.
+    (('bar', 'barg', 'bara'), Unit('pressure', 'bar')),
+    (('mbar',), Unit('pressure', 'mbar', 0.001)),
+    (('pa',), Unit('pressure', 'Pa', 1e-5)),
+    (('kpa',), Unit('pressure', 'kPa', 0.01)),
+    (('mpa',), Unit('pressure', 'MPa', 10.0)),
+    (('psi', 'psig', 'psia'), Unit('pressure', 'psi', 0.0689475729)),
+    (('atm',), Unit('pressure', 'atm', 1.01325)),
+    (('°c', 'c', 'celsius'), Unit('temperature', '°C')),
+    (('°f', 'f', 'fahrenheit'), Unit('temperature', '°F', 5 / 9, -32 * 5 / 9)),
+    (('k', 'kelvin'), Unit('temperature', 'K', 1.0, -273.15)),
+]
+UNITS = {alias: unit for aliases, unit in REGISTRY for alias in aliases}
+
+# A unit in brackets anywhere in a header, or as its last word: "Flow (m³/h)", "pressure_psi".
+BRACKETED = re.compile(r'[(\[]\s*([^)\]]*?)\s*[)\]]')
+LAST_WORD = re.compile(r'[\s_]+(\S+)$')
+
+
+def unit_key(label: str) -> str:
+    return (
+        label.strip().lower().replace(' ', '').replace('³', '3').replace('^', '').replace('º', '°')
+        .replace('℃', '°c').replace('℉', '°f').replace('deg', '°')
+    )
+
+
+def lookup(label):
+    """The registered unit for a label such as 'psi' or 'm³/h', or None."""
+    return UNITS.get(unit_key(label))
+
+
+def header_unit(header: str, quantity: str):
+    """
+    The unit a column header names for ``quantity``, or None when it names
+    none. A bracketed label that is not a unit of that quantity is an error,
+    rather than a reason to store the column unconverted.
+    """
+    match = BRACKETED.search(header)
+    if match is None:
+        match = LAST_WORD.search(header.strip())
+        unit = lookup(match.group(1)) if match else None
+        return unit if unit is not None and unit.quantity == quantity else None
+    unit = lookup(match.group(1))
+    if unit is None or unit.quantity != quantity:
+        supported = ', '.join(u.symbol for _, u in REGISTRY if u.quantity == quantity)
+        raise ValueError(f"Unknown {quantity} unit '{match.group(1)}' in column '{header}' (supported: {supported}).")
+    return unit
+
+
+def header_units(col_map: dict) -> dict:
+    """``{canonical column: Unit}`` for the numeric columns whose header names a unit."""
+    units = {}
+    for header, column in col_map.items():
+        if column in CANONICAL_UNITS:
+            unit = header_unit(header, column)
+            if unit is not None:
+                units[column] = unit
+    return units
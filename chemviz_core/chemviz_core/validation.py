@@ -0,0 +1,147 @@
+"""
+Row validation for parsed equipment CSVs.
+
+Each canonical column has a ``Rule``. Once ``parsing.clean_frame`` has
+coerced a chunk, the chunk is checked against every rule at once: each check
+is a boolean NumPy mask over the chunk's rows, and only the rows that fail
+some check are looked at one by one, to spell out their reasons. Failing
+rows are returned as they were read, for the quarantine table, instead of
+being zero-filled into the summary.
+
+Like ``parsing``, this module does not import Django.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from chemviz_core import units
+
+
+class Rule(NamedTuple):
+    kind: str  # 'text', 'number' or 'timestamp'
+    required: bool = True
+    # Canonical unit of a number column. A value may name any unit of the column's
+    # quantity as a suffix ("4.2 bar", "60 psi") and is converted from it.
+    unit: str = None
+    min: float = None
+    max: float = None
+
+
+RULES = {
+    'equipment_name': Rule('text'),
+    'equipment_type': Rule('text'),
+    'flowrate': Rule('number', unit=units.CANONICAL_UNITS['flowrate'], min=0.0),
+    'pressure': Rule('number', unit=units.CANONICAL_UNITS['pressure'], min=0.0),
+    'temperature': Rule('number', unit=units.CANONICAL_UNITS['temperature'], min=-273.15),
+    'timestamp': Rule('timestamp'),
+}
+
+# A number, optionally followed by a unit: "12", "-3.5e2", "4.2 bar", "20°C".
+NUMBER_WITH_UNIT = r'^([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(\S.*)?$'
+
+
+def missing_cells(values):
+    """NaN cells of a column. Comparing the array with itself is several times faster than isna() on text."""
+    cells = np.asarray(values)
+    return cells != cells
+
+
+def check_text(column, values, raw, rule):
+    if not rule.required:
+        return values, []
+    return values, [(f'{column}: missing', missing_cells(raw) | (np.asarray(values) == ''))]
+
+
+def check_number(column, values, raw, rule):
+    numbers = values.to_numpy(dtype=float, copy=True)
+    missing = missing_cells(raw)
+    not_number = np.zeros(len(values), dtype=bool)
+    wrong_unit = np.zeros(len(values), dtype=bool)
+
+    # Only cells that were read but did not parse as plain numbers are looked at again.
+    retry = np.flatnonzero(np.isnan(numbers) & ~missing)
+    if len(retry):
+        text = raw.iloc[retry].astype(str).str.strip()
+        parts = text.str.extract(NUMBER_WITH_UNIT)
+        number = pd.to_numeric(parts[0]).to_numpy(dtype=float)
+        blank = (text == '').to_numpy()
+        unparsed = np.isnan(number) & ~blank
+        # Few distinct labels, so each is looked up once.
+        found = {label: units.lookup(label) for label in parts[1].dropna().unique()}
+        found = {label: unit for label, unit in found.items() if unit is not None and unit.quantity == column}
+        labels = parts[1].to_numpy(dtype=object)
+        other_unit = parts[1].notna().to_numpy() & ~unparsed & ~np.isin(labels, list(found))
+        for label, unit in found.items():
+            at = labels == label
+            number[at] = unit.to_canonical(number[at])
+        missing[retry[blank]] = True
+        not_number[retry[unparsed]] = True
+        wrong_unit[retry[other_unit]] = True
+        keep = ~(blank | unparsed | other_unit)
+        numbers[retry[keep]] = number[keep]
+        values = pd.Series(numbers, index=values.index)
+    not_number |= np.isinf(numbers)
+
+    checks = [(f'{column}: not a number', not_number)]
+    if rule.required:
+        checks.append((f'{column}: missing', missing))
+    if rule.unit is not None:
+        checks.append((f'{column}: unknown unit', wrong_unit))
+    if rule.min is not None:
+        checks.append((f'{column}: below {rule.min:g}', numbers < rule.min))
+    if rule.max is not None:
+        checks.append((f'{column}: above {rule.max:g}', numbers > rule.max))
+    return values, checks
+
+
+def check_timestamp(column, values, raw, rule):
+    missing = missing_cells(raw)
+    checks = [(f'{column}: not a date', values.isna().to_numpy() & ~missing)]
+    if rule.required:
+        checks.append((f'{column}: missing', missing))
+    return values, checks
+
+
+CHECKS = {'text': check_text, 'number': check_number, 'timestamp': check_timestamp}
+
+
+def failure_reasons(checks, failed) -> list:
+    """The messages of the checks each failing row did not pass, in rule order."""
+    rows = np.flatnonzero(failed)
+    reasons = [[] for _ in rows]
+    for message, mask in checks:
+        for i in np.flatnonzero(mask[rows]):
+            reasons[i].append(message)
+    return reasons
+
+
+def validate_frame(df: pd.DataFrame, raw: dict, rules=RULES) -> tuple:
+    """
+    Check the coerced canonical columns of ``df`` against ``rules`` and split
+    off the rows that break one. ``raw`` maps each column to the values as
+    read, before coercion. Returns ``(valid, rejected)``: ``valid`` holds the
+    rows that passed; ``rejected`` holds the others as read, with their
+    1-based data row number (from the frame's index) in ``row`` and a list of
+    messages in ``reasons``.
+    """
+    columns = [c for c in rules if c in df.columns]
+    checks = []
+    for column in columns:
+        rule, values = rules[column], df[column]
+        checked, column_checks = CHECKS[rule.kind](column, values, raw[column], rule)
+        if checked is not values:
+            df[column] = checked  # numbers read with their unit
+        checks.extend(column_checks)
+
+    failed = np.zeros(len(df), dtype=bool)
+    for _, mask in checks:
+        failed |= mask
+    if not failed.any():
+        return df, pd.DataFrame(columns=['row', 'reasons', *columns])
+
+    rejected = pd.DataFrame({column: raw[column][failed] for column in columns})
+    rejected.insert(0, 'row', df.index[failed] + 1)
+    rejected.insert(1, 'reasons', failure_reasons(checks, failed))
+    return df[~failed], rejected
@@ -1,27 +1,39 @@
 
+import time
+_LAUNCHED = time.perf_counter()  # before the imports, so the startup benchmark counts them
+
 import sys
 import os
-import requests
+import gzip
+import json
+import shutil
+import sqlite3
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from urllib.parse import urlencode
 from datetime import datetime
-import numpy as np
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QLineEdit, QFileDialog, QTableWidget,
-    QTableWidgetItem, QFrame, QSplitter, QMessageBox,
+    QPushButton, QLabel, QLineEdit, QFileDialog, QTableView,
+    QStyledItemDelegate, QStyle, QFrame, QSplitter, QMessageBox,
     QSizePolicy, QHeaderView, QListWidget, QListWidgetItem,
-    QStackedWidget, QGridLayout, QScrollArea
+    QStackedWidget, QGridLayout, QScrollArea, QCheckBox
+)
+from PyQt5.QtCore import (
+    Qt, QObject, QRunnable, QThread, QThreadPool, QTimer, QEvent, pyqtSignal, QSize, QAbstractTableModel, QModelIndex, QRectF
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize
-from PyQt5.QtGui import QColor, QFont, QCursor, QIcon
+from PyQt5.QtGui import QColor, QFont, QCursor, QIcon, QFontMetrics, QPainter
 
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+# Matplotlib, NumPy, pandas and requests are imported where first used (see warm_imports), keeping
+# a few hundred milliseconds of imports off the path to the first window.
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 BASE_URL = os.environ.get('CHEMVIZ_API_URL', 'http://localhost:8000/api')
+CACHE_MAX_MB = int(os.environ.get('CHEMVIZ_CACHE_MB', '200'))
+REPORT_CACHE_MAX_MB = int(os.environ.get('CHEMVIZ_REPORT_CACHE_MB', '100'))
 
 # ─── Theme: Slate Dark Mode ──────────────────────────────────────────────────
 C = {
@@ -91,7 +103,7 @@ STYLE_SHEET = f"""
     QLineEdit:focus {{ border: 1px solid {C['primary']}; }}
 
     /* Tables */
-    QTableWidget {{ 
+    QTableView {{ 
         background-color: {C['bg_card']}; border: none; border-radius: 8px; 
         gridline-color: rgba(255,255,255,0.05); 
     }}
@@ -99,8 +111,8 @@ STYLE_SHEET = f"""
         background-color: {C['bg_app']}; color: {C['text_sec']}; border: none; 
         padding: 12px; font-size: 11px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.5px;
     }}
-    QTableWidget::item {{ padding: 10px; border-bottom: 1px solid {C['border']}; }}
-    QTableWidget::item:selected {{ background-color: rgba(59, 130, 246, 0.1); }}
+    QTableView::item {{ padding: 10px; border-bottom: 1px solid {C['border']}; }}
+    QTableView::item:selected {{ background-color: rgba(59, 130, 246, 0.1); }}
 
     /* Navigation */
     .NavBtn {{
@@ -111,22 +123,337 @@ STYLE_SHEET = f"""
 """
 
 # ─── Logic Workers ───────────────────────────────────────────────────────────
-class APIWorker(QThread):
-    result = pyqtSignal(object)
-    error  = pyqtSignal(str)
-    def __init__(self, func, *args, **kwargs):
+def make_session():
+    """One keep-alive session for every API call, retrying idempotent requests on flaky connections."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    retry = Retry(total=3, connect=2, read=2, backoff_factor=0.3,
+                  status_forcelist=(502, 503, 504), allowed_methods=frozenset({'GET', 'HEAD'}))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+_session, _session_lock = None, threading.Lock()
+
+def http():
+    """The shared session, created (and ``requests`` imported) on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+def warm_imports():
+    """Import the heavy modules on a pool thread once the login window is up, ahead of first use."""
+    import numpy, pandas  # noqa: F401
+    from matplotlib.backends import backend_qt5agg  # noqa: F401
+    from matplotlib.figure import Figure  # noqa: F401
+    http()
+
+class TaskSignals(QObject):
+    done = pyqtSignal(object, bool, object)  # task, ok, result or error message
+
+class Task(QRunnable):
+    def __init__(self, key, func, args):
         super().__init__()
-        self.func, self.args, self.kwargs = func, args, kwargs
+        self.setAutoDelete(False)
+        self.key, self.func, self.args = key, func, args
+        self.subscribers, self.cancelled = [], False
+        self.signals = TaskSignals()
+
     def run(self):
+        if self.cancelled:
+            return
         try:
-            self.result.emit(self.func(*self.args, **self.kwargs))
+            self.signals.done.emit(self, True, self.func(*self.args))
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.done.emit(self, False, str(e))
+
+class TaskScheduler(QObject):
+    """
+    Runs blocking API calls on a bounded QThreadPool and delivers results on
+    the UI thread.
+
+    - ``key``: a call whose key is already in flight joins that task instead
+      of starting another one.
+    - ``group``: ``cancel(group)`` (or ``submit(..., replace=True)``) marks
+      everything submitted to the group so far as stale. Queued tasks are
+      pulled from the pool, and results that still arrive are dropped.
+    """
+    def __init__(self, max_threads=4):
+        super().__init__()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.inflight, self.generations = {}, {}
+
+    def submit(self, func, *args, key=None, group=None, replace=False, on_result=None, on_error=None):
+        if group is not None and replace:
+            self.cancel(group)
+        subscriber = (group, self.generations.get(group, 0), on_result, on_error)
+        task = self.inflight.get(key) if key is not None else None
+        if task is None or task.cancelled:
+            task = Task(key, func, args)
+            task.signals.done.connect(self._finished)
+            self.inflight[key if key is not None else task] = task
+            self.pool.start(task)
+        task.subscribers.append(subscriber)
+        return task
+
+    def cancel(self, group):
+        self.generations[group] = self.generations.get(group, 0) + 1
+        for slot, task in list(self.inflight.items()):
+            if not any(self._live(sub) for sub in task.subscribers) and self.pool.tryTake(task):
+                task.cancelled = True
+                del self.inflight[slot]
+
+    def _live(self, subscriber):
+        group, generation = subscriber[:2]
+        return group is None or self.generations.get(group, 0) == generation
+
+    def _finished(self, task, ok, value):
+        slot = task.key if task.key is not None else task
+        if self.inflight.get(slot) is task:
+            del self.inflight[slot]
+        for subscriber in task.subscribers:
+            if not self._live(subscriber):
+                continue  # superseded while running
+            callback = subscriber[2] if ok else subscriber[3]
+            if callback:
+                callback(value)
+
+tasks = None  # TaskScheduler, created once the QApplication exists
+
+class FirstPaint(QObject):
+    """Calls ``callback`` once, right after ``widget`` has painted its first frame."""
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, self.callback)  # queued, so it runs once the whole frame is drawn
+        return False
+
+class LocalAnalysis(QThread):
+    """
+    Reads a CSV from disk in chunks with chemviz_core.parsing, which the
+    server parses uploads with too, and emits a running summary after each
+    chunk, so a file is on screen before (or without) uploading it. Timestamped files are reduced to the latest
+    reading per equipment as they stream, like the server does.
+    """
+    progress = pyqtSignal(object, object, bool)  # summary, rows, rows replace the previous ones
+    failed = pyqtSignal(str)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path, self.stopped = path, False
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        try:
+            from chemviz_core import parsing  # imports pandas, so not at startup
+            import pandas as pd
+            summaries, snapshot, dated = [], None, 0
+            # Only an uncompressed file can be memory-mapped; pandas infers .gz/.zst/.zip from the name.
+            chunks = parsing.iter_csv_chunks(self.path, memory_map=self.path.endswith('.csv'))
+            for chunk, rejected in chunks:
+                if self.stopped:
+                    return
+                if 'timestamp' in chunk.columns:
+                    dated += parsing.dated_rows(chunk, rejected)
+                    merged = chunk if snapshot is None else pd.concat([snapshot, chunk])
+                    snapshot = parsing.latest_snapshot(merged)
+                    summary = parsing.compute_summary(snapshot)
+                    self.progress.emit(summary, snapshot, True)
+                else:
+                    summaries.append(parsing.compute_summary(chunk))
+                    summary = parsing.merge_summaries(summaries)
+                    self.progress.emit(summary, chunk, False)
+            if snapshot is not None and not dated:
+                raise ValueError(parsing.NO_VALID_DATES)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class EventStream(QThread):
+    """
+    Follows the server's /api/events/ stream and re-emits each event on the
+    UI thread, so the app hears about new datasets and upload progress
+    without polling. Reconnects with Last-Event-ID after a drop, and at once
+    when a long-poll response ends.
+    """
+    event = pyqtSignal(str, object)  # event type, data
+
+    def __init__(self):
+        super().__init__()
+        self.stopped, self.last_id, self.response = False, None, None
+
+    def stop(self):
+        self.stopped = True
+        if self.response is not None:
+            self.response.close()  # unblocks the read
+
+    def run(self):
+        retry = 2.0
+        while not self.stopped:
+            ended = False
+            try:
+                headers = {'Accept': 'text/event-stream'}
+                if self.last_id: headers['Last-Event-ID'] = self.last_id
+                self.response = r = http().get(f'{BASE_URL}/events/', headers=headers, stream=True, timeout=(10, 60))
+                if r.status_code == 401:
+                    return
+                r.raise_for_status()
+                kind, data = 'message', []
+                for line in r.iter_lines(chunk_size=None, decode_unicode=True):
+                    if not line:
+                        if data: self.event.emit(kind, json.loads('\n'.join(data)))
+                        kind, data = 'message', []
+                        continue
+                    field, _, value = line.partition(':')
+                    value = value[1:] if value.startswith(' ') else value
+                    if field == 'data': data.append(value)
+                    elif field == 'event': kind = value
+                    elif field == 'id': self.last_id = value
+                    elif field == 'retry': retry = int(value) / 1000
+                ended = True
+            except Exception:
+                pass
+            finally:
+                if self.response is not None: self.response.close()
+            if not self.stopped:
+                self.msleep(int((0.1 if ended else retry) * 1000))
+
+def gzip_file(path):
+    """Compress a file in chunks into a spooled temp file, rewound for sending."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    with open(path, 'rb') as src, gzip.GzipFile(fileobj=spooled, mode='wb', compresslevel=6, mtime=0) as gz:
+        shutil.copyfileobj(src, gz, 1024 * 1024)
+    spooled.seek(0)
+    return spooled
 
 class AppState:
     token, username = None, None
+    offline = False
 state = AppState()
 
+# ─── Local Cache ─────────────────────────────────────────────────────────────
+def user_cache_dir():
+    if os.environ.get('CHEMVIZ_CACHE_DIR'):
+        return os.environ['CHEMVIZ_CACHE_DIR']
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+    return os.path.join(base, 'chemviz')
+
+class LocalCache:
+    """
+    SQLite store of API responses keyed by user and request path, with the
+    server's ETag/Last-Modified for revalidation. Least recently used entries
+    are evicted once the bodies exceed ``max_bytes``.
+    """
+    def __init__(self, path, max_bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "body BLOB, size INTEGER, accessed REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self.db.commit()
+
+    def get(self, key):
+        """Return ``(etag, last_modified, body)`` or None, marking the entry as recently used."""
+        with self.lock:
+            row = self.db.execute("SELECT etag, last_modified, body FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+                self.db.commit()
+            return row
+
+    def put(self, key, etag, last_modified, body):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, len(body), time.time()),
+            )
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from the least recently used entry until the rest fits.
+                evict = []
+                for old_key, size in self.db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((old_key,))
+                    total -= size
+                self.db.executemany("DELETE FROM entries WHERE key = ?", evict)
+            self.db.commit()
+
+_caches, _caches_lock = {}, threading.Lock()
+
+def local_cache(name='responses'):
+    """
+    The 'responses' or 'reports' cache, opened on first use so startup never
+    touches the disk. PDF reports get their own store and size cap, so a few
+    large reports can't evict the history and summaries.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            max_mb = REPORT_CACHE_MAX_MB if name == 'reports' else CACHE_MAX_MB
+            _caches[name] = LocalCache(os.path.join(user_cache_dir(), f'{name}.sqlite3'), max_mb * 1024 * 1024)
+        return _caches[name]
+
+def cache_key(path, params=None):
+    query = f"?{urlencode(sorted(params.items()))}" if params else ''
+    return f"{state.username}|{BASE_URL}{path}{query}"
+
+def cached_get(path, params=None, cache='responses'):
+    """
+    GET an API path through the named local cache and return ``(body, changed)``.
+    A stored copy is revalidated with If-None-Match/If-Modified-Since; when the
+    server can't be reached it is served as-is and the app goes offline.
+    ``changed`` is False when the stored body was returned.
+    """
+    import requests
+    key = cache_key(path, params)
+    store = local_cache(cache)
+    entry = store.get(key)
+    headers = {}
+    if entry:
+        etag, last_modified, _ = entry
+        if etag: headers['If-None-Match'] = etag
+        if last_modified: headers['If-Modified-Since'] = last_modified
+    try:
+        r = http().get(f'{BASE_URL}{path}', params=params, headers=headers, timeout=30)
+    except (requests.ConnectionError, requests.Timeout):
+        if entry is None:
+            raise
+        state.offline = True
+        return entry[2], False
+    state.offline = False
+    if r.status_code == 304 and entry:
+        return entry[2], False
+    r.raise_for_status()
+    if r.headers.get('ETag') or r.headers.get('Last-Modified'):
+        store.put(key, r.headers.get('ETag'), r.headers.get('Last-Modified'), r.content)
+    return r.content, True
+
+def peek_cached(path, params=None):
+    """Stored body for a path without touching the network, or None."""
+    entry = local_cache().get(cache_key(path, params))
+    return entry[2] if entry else None
+
 # ─── Custom Components ───────────────────────────────────────────────────────
 
 class StatCard(QFrame):
@@ -205,6 +532,11 @@ class UploadWidget(QFrame):
         self.btn.clicked.connect(self.clicked.emit)
         layout.addWidget(self.btn)
 
+        self.upload_chk = QCheckBox("Upload to server in the background")
+        self.upload_chk.setChecked(True)
+        self.upload_chk.setStyleSheet(f"color: {C['text_sec']}; font-size: 12px;")
+        layout.addWidget(self.upload_chk)
+
     def mousePressEvent(self, e):
         self.clicked.emit()
 
@@ -269,6 +601,400 @@ class HistoryListItem(QFrame):
         r3.addStretch()
         layout.addLayout(r3)
 
+# ─── Record Table (model/view) ───────────────────────────────────────────────
+# (keyword, badge background, badge text); the first keyword found in the type wins.
+BADGE_COLORS = [
+    ('Valve', QColor(16, 185, 129, 38), QColor('#34d399')),
+    ('Pump', QColor(59, 130, 246, 38), QColor('#60a5fa')),
+    ('Tower', QColor(139, 92, 246, 38), QColor('#a78bfa')),
+    ('Comp', QColor(6, 182, 212, 38), QColor('#22d3ee')),
+    ('Heat', QColor(245, 158, 11, 38), QColor('#fbbf24')),
+    ('Sep', QColor(239, 68, 68, 38), QColor('#f87171')),
+]
+BADGE_DEFAULT = (QColor('#1e293b'), QColor('#cbd5e1'))
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Records of one dataset, fetched from /dataset/<id>/records/ a page at a
+    time. Rows are added through canFetchMore/fetchMore as the view scrolls,
+    and the next page is prefetched as soon as one arrives. Each page is held
+    as column arrays (names, types, one float array for the readings) in an
+    LRU of at most MAX_PAGES; a page that was evicted is fetched again when
+    its rows come back into view.
+
+    In local mode (set_local) pages are sliced from DataFrames handed over by
+    add_frame while a file on disk is being analysed.
+    """
+    HEADERS = ['EQUIPMENT NAME', 'TYPE', 'FLOWRATE', 'PRESSURE', 'TEMP']
+    NUMERIC = ('flowrate', 'pressure', 'temperature')
+    PAGE_SIZE = 500
+    MAX_PAGES = 20
+
+    first_page = pyqtSignal(list)
+
+    def __init__(self, headers=None, parent=None):
+        super().__init__(parent)
+        self.headers = headers or self.HEADERS
+        self.dataset_id, self.total, self.loaded, self.wanted = None, 0, 0, 0
+        self.pages, self.pending = OrderedDict(), set()
+        self.frames, self.offsets = None, None
+        self.group = f'records:{id(self)}'
+        self.name_font = QFont("Segoe UI", 9, QFont.Bold)
+        self.name_color, self.value_color = QColor("#f8fafc"), QColor(C['text_pri'])
+        self.placeholder_color = QColor(C['text_sec'])
+
+    def set_dataset(self, dataset_id):
+        self.beginResetModel()
+        tasks.cancel(self.group)  # pages of the previous dataset are no longer wanted
+        self.dataset_id, self.total, self.loaded, self.wanted = dataset_id, 0, 0, 1
+        self.pages.clear(); self.pending.clear()
+        self.frames, self.offsets = None, None
+        self.endResetModel()
+        self.request_page(1)
+
+    def set_local(self, key):
+        """Show rows supplied in-process through add_frame; ``key`` identifies the analysis."""
+        self.beginResetModel()
+        tasks.cancel(self.group)
+        self.dataset_id, self.total, self.loaded, self.wanted = key, 0, 0, 1
+        self.pages.clear(); self.pending.clear()
+        self.frames, self.offsets = [], [0]
+        self.endResetModel()
+
+    def add_frame(self, frame):
+        partial = self.total // self.PAGE_SIZE + 1 if self.total % self.PAGE_SIZE else None
+        self.frames.append(frame)
+        self.offsets.append(self.offsets[-1] + len(frame))
+        self.total = self.offsets[-1]
+        if partial:
+            self.pages.pop(partial, None)  # the rest of its rows just arrived
+        if self.loaded < min(self.wanted * self.PAGE_SIZE, self.total):
+            self.request_page(self.wanted)
+
+    def _local_page(self, page):
+        import numpy as np
+        import pandas as pd
+        start = (page - 1) * self.PAGE_SIZE
+        stop = min(start + self.PAGE_SIZE, self.total)
+        i = int(np.searchsorted(self.offsets, start, side='right')) - 1
+        parts = []
+        while start < stop:
+            frame, lo = self.frames[i], start - self.offsets[i]
+            hi = min(len(frame), lo + stop - start)
+            parts.append(frame.iloc[lo:hi])
+            start, i = start + hi - lo, i + 1
+        df = parts[0] if len(parts) == 1 else pd.concat(parts)
+        cols = (df['equipment_name'].tolist(), df['equipment_type'].tolist(), df[list(self.NUMERIC)].to_numpy(dtype=float))
+        rows = df[['equipment_name', 'equipment_type', *self.NUMERIC]].to_dict('records') if page == 1 else None
+        return cols, rows, stop < self.total
+
+    def _fetch(self, dataset_id, page):
+        """Revalidate a page; None when the locally cached copy is still current."""
+        body, changed = cached_get(f'/dataset/{dataset_id}/records/', {'page': page, 'page_size': self.PAGE_SIZE})
+        return json.loads(body) if changed else None
+
+    def request_page(self, page):
+        if page in self.pending or page in self.pages:
+            return
+        if self.frames is not None:
+            if (page - 1) * self.PAGE_SIZE < self.total:
+                cols, rows, has_next = self._local_page(page)
+                self._page_ready(page, cols, rows, has_next)
+            return
+        dataset_id = self.dataset_id
+        cached = peek_cached(f'/dataset/{dataset_id}/records/', {'page': page, 'page_size': self.PAGE_SIZE})
+        if cached is not None:
+            self.page_loaded(dataset_id, page, json.loads(cached))  # show the disk copy now, revalidate below
+        self.pending.add(page)
+        tasks.submit(
+            self._fetch, dataset_id, page, key=('records', dataset_id, page), group=self.group,
+            on_result=lambda data: self.page_loaded(dataset_id, page, data),
+            on_error=lambda _: self.pending.discard(page),
+        )
+
+    def page_loaded(self, dataset_id, page, data):
+        if dataset_id != self.dataset_id:
+            return  # a page of a dataset that is no longer shown
+        self.pending.discard(page)
+        if data is None:
+            return  # revalidated: the cached copy already shown is current
+        import numpy as np
+        rows = data['results']
+        self.total = data['count']
+        cols = (
+            [r['equipment_name'] for r in rows],
+            [r['equipment_type'] for r in rows],
+            np.array([[r[k] for k in self.NUMERIC] for r in rows], dtype=float).reshape(-1, 3),
+        )
+        self._page_ready(page, cols, rows, bool(data.get('next')))
+
+    def _page_ready(self, page, cols, rows, has_next):
+        self.pages[page] = cols
+        while len(self.pages) > self.MAX_PAGES:
+            self.pages.popitem(last=False)
+
+        first = (page - 1) * self.PAGE_SIZE
+        if page == 1 and rows is not None:
+            self.first_page.emit(rows)
+        if first < self.loaded:
+            # A refetched page: its rows are already in the view, only their cells change.
+            last = min(first + len(cols[0]), self.loaded) - 1
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.headers) - 1))
+        if page <= self.wanted:
+            self._insert_wanted()
+        if page == self.wanted and has_next:
+            self.request_page(page + 1)  # prefetch, shown on the next fetchMore
+
+    def _insert_wanted(self):
+        """Insert rows for every page fetchMore has asked for that is loaded, in order."""
+        while self.loaded < self.total:
+            page = self.loaded // self.PAGE_SIZE + 1
+            if page > self.wanted or page not in self.pages:
+                break
+            last = min(page * self.PAGE_SIZE, self.total)
+            self.beginInsertRows(QModelIndex(), self.loaded, last - 1)
+            self.loaded = last
+            self.endInsertRows()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        self.wanted = self.loaded // self.PAGE_SIZE + 1
+        if self.wanted in self.pages:
+            # Already prefetched: show it now and prefetch the one after.
+            self._insert_wanted()
+            if self.loaded < self.total:
+                self.request_page(self.wanted + 1)
+        else:
+            self.request_page(self.wanted)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        row, col = index.row(), index.column()
+        page, offset = divmod(row, self.PAGE_SIZE)
+        cols = self.pages.get(page + 1)
+        if cols is None:
+            self.request_page(page + 1)
+            if role == Qt.DisplayRole and col == 0: return "Loading…"
+            if role == Qt.ForegroundRole: return self.placeholder_color
+            return None
+        self.pages.move_to_end(page + 1)
+        names, types, values = cols
+        if role == Qt.DisplayRole:
+            if col == 0: return names[offset]
+            if col == 1: return types[offset]
+            return f"{values[offset, col - 2]:.1f}"
+        if role == Qt.ForegroundRole:
+            return self.name_color if col == 0 else self.value_color
+        if role == Qt.FontRole and col == 0:
+            return self.name_font
+        return None
+
+class BadgeDelegate(QStyledItemDelegate):
+    """Paints the equipment type as a rounded badge instead of a per-row QLabel widget."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont("Segoe UI", 8, QFont.Bold)
+        self.metrics = QFontMetrics(self.font)
+        self.colors = {}
+
+    def badge_colors(self, text):
+        if text not in self.colors:
+            self.colors[text] = next(((bg, fg) for key, bg, fg in BADGE_COLORS if key in text), BADGE_DEFAULT)
+        return self.colors[text]
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, QColor(59, 130, 246, 25))
+        text = index.data(Qt.DisplayRole)
+        if not text:
+            return  # page still loading
+        bg, fg = self.badge_colors(text)
+        width = min(self.metrics.horizontalAdvance(text) + 16, option.rect.width() - 8)
+        height = self.metrics.height() + 8
+        rect = QRectF(option.rect.x() + 4, option.rect.center().y() - height / 2 + 1, width, height)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(bg)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(fg)
+        painter.setFont(self.font)
+        painter.drawText(rect, Qt.AlignCenter, self.metrics.elidedText(text, Qt.ElideRight, int(width) - 8))
+        painter.restore()
+
+def make_record_table(headers=None):
+    table = QTableView()
+    table.setModel(RecordTableModel(headers, table))
+    table.setItemDelegateForColumn(1, BadgeDelegate(table))
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    # Fixed row heights let the view skip measuring rows, so scrolling 100k records stays cheap.
+    table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    table.verticalHeader().setDefaultSectionSize(36)
+    table.verticalHeader().setVisible(False)
+    table.setShowGrid(False)
+    table.setSelectionBehavior(QTableView.SelectRows)
+    return table
+
+# ─── Charts ──────────────────────────────────────────────────────────────────
+LINE_POINTS = 60
+BAR_TYPES = 6
+
+def nice_ceiling(value):
+    """Round up to 1, 2 or 5 times a power of ten so axis limits rarely change between datasets."""
+    if value <= 0:
+        return 1.0
+    import numpy as np
+    exp = 10 ** np.floor(np.log10(value))
+    return float(next(m * exp for m in (1, 2, 5, 10) if m * exp >= value))
+
+def downsample(y, points):
+    """Bucket means of ``y``, at most ``points`` of them; returns (bucket centers, means)."""
+    import numpy as np
+    y = np.asarray(y, dtype=float)
+    if len(y) <= points:
+        return np.arange(len(y), dtype=float), y
+    edges = np.linspace(0, len(y), points + 1).astype(int)
+    means = np.add.reduceat(y, edges[:-1]) / np.diff(edges)
+    return (edges[:-1] + edges[1:] - 1) / 2, means
+
+def summary_chart_data(summary):
+    """Donut and bar geometry from a dataset summary. Pure NumPy, safe to run off the GUI thread."""
+    import numpy as np
+    dist = summary['type_distribution']
+    labels = list(dist)
+    counts = np.fromiter(dist.values(), dtype=float, count=len(dist))
+    bounds = 90 + 360 * np.concatenate(([0.0], np.cumsum(counts))) / max(counts.sum(), 1)
+    types = labels[:BAR_TYPES]
+    return {
+        'pie': (labels, bounds[:-1], bounds[1:]),
+        'bar': (types, 150 + 10 * np.arange(len(types), dtype=float)),
+    }
+
+def line_chart_data(records):
+    """Downsampled temperature and scaled pressure series from a page of records."""
+    import numpy as np
+    temp = np.fromiter((r['temperature'] for r in records), dtype=float, count=len(records))
+    press = np.fromiter((r['pressure'] for r in records), dtype=float, count=len(records)) * 10
+    x, temp = downsample(temp, LINE_POINTS)
+    _, press = downsample(press, LINE_POINTS)
+    return x, temp, press
+
+class BlitChart:
+    """
+    A Matplotlib canvas whose axes and artists are built once. Updates change
+    artist data in place. When the axes' decorations are unchanged, only the
+    animated artists are redrawn over a cached background (blitting).
+    Otherwise a full draw is queued and the background is captured again.
+    """
+    def __init__(self, figsize):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        self.fig = Figure(figsize=figsize, facecolor=C['bg_card'])
+        self.canvas = FigureCanvas(self.fig)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_facecolor(C['bg_card'])
+        self.artists, self.background = [], None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def style_axes(self):
+        self.ax.tick_params(colors=C['text_sec'])
+        for s in self.ax.spines.values(): s.set_visible(False)
+
+    def _on_draw(self, event):
+        # Animated artists are skipped by a full draw; capture the background, then paint them on top.
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for a in self.artists:
+            if a.get_visible(): self.ax.draw_artist(a)
+
+    def refresh(self, full=False):
+        if full or self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        for a in self.artists:
+            if a.get_visible(): self.ax.draw_artist(a)
+        self.canvas.blit(self.fig.bbox)
+
+class DonutChart(BlitChart):
+    def __init__(self, figsize):
+        super().__init__(figsize)
+        self.ax.set_xlim(-1.1, 1.1); self.ax.set_ylim(-1.1, 1.1)
+        self.ax.set_aspect('equal'); self.ax.axis('off')
+        self.fig.subplots_adjust(left=0.02, right=0.6, top=0.95, bottom=0.05)
+        self.labels = None
+
+    def update(self, labels, theta1, theta2):
+        from matplotlib.patches import Wedge
+        while len(self.artists) < len(labels):
+            color = CHART_COLORS[len(self.artists) % len(CHART_COLORS)]
+            self.artists.append(self.ax.add_patch(
+                Wedge((0, 0), 1, 0, 0, width=0.5, facecolor=color, edgecolor=C['bg_card'], animated=True)
+            ))
+        for i, wedge in enumerate(self.artists):
+            wedge.set_visible(i < len(labels))
+            if i < len(labels):
+                wedge.set_theta1(theta1[i]); wedge.set_theta2(theta2[i])
+        full = labels != self.labels
+        if full:
+            if self.ax.get_legend(): self.ax.get_legend().remove()
+            self.ax.legend(self.artists[:len(labels)], labels, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1),
+                           frameon=False, labelcolor=C['text_sec'])
+            self.labels = labels
+        self.refresh(full)
+
+class BarChart(BlitChart):
+    def __init__(self, figsize):
+        super().__init__(figsize)
+        self.style_axes()
+        self.artists = list(self.ax.bar(range(BAR_TYPES), [0.0] * BAR_TYPES, color=CHART_COLORS[:BAR_TYPES], animated=True))
+        self.ax.set_xlim(-0.6, BAR_TYPES - 0.4)
+        self.labels, self.ymax = None, None
+
+    def update(self, labels, values):
+        for i, bar in enumerate(self.artists):
+            bar.set_visible(i < len(values))
+            if i < len(values): bar.set_height(values[i])
+        ymax = nice_ceiling(values.max() * 1.05 if len(values) else 1)
+        full = labels != self.labels or ymax != self.ymax
+        if full:
+            self.ax.set_xticks(range(len(labels)), labels)
+            self.ax.set_ylim(0, ymax)
+            self.labels, self.ymax = labels, ymax
+        self.refresh(full)
+
+class LineChart(BlitChart):
+    def __init__(self, figsize):
+        super().__init__(figsize)
+        self.style_axes()
+        self.temp, = self.ax.plot([], [], color=C['red'], marker='o', markersize=3, animated=True)
+        self.press, = self.ax.plot([], [], color=C['blue'], marker='o', markersize=3, animated=True)
+        self.artists = [self.temp, self.press]
+        self.limits = None
+
+    def update(self, x, temp, press):
+        self.temp.set_data(x, temp)
+        self.press.set_data(x, press)
+        top = max(temp.max(initial=0), press.max(initial=0))
+        limits = (max(x[-1], 1) if len(x) else 1, nice_ceiling(top * 1.05))
+        full = limits != self.limits
+        if full:
+            self.ax.set_xlim(0, limits[0]); self.ax.set_ylim(0, limits[1])
+            self.limits = limits
+        self.refresh(full)
+
 # ─── Auth Window ────────────────────────────────────────────────────────────
 class AuthWindow(QWidget):
     auth_success = pyqtSignal()
@@ -279,6 +1005,8 @@ class AuthWindow(QWidget):
         self.setFixedSize(400, 560)
         # FORCE DARK BACKGROUND
         self.setStyleSheet(f"background-color: {C['bg_app']}; color: {C['text_pri']}; font-family: 'Segoe UI';")
+        # While the user types, load what the login request and the main window will need.
+        FirstPaint(self, lambda: tasks.submit(warm_imports, key='warm_imports'))
         
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignCenter)
@@ -361,11 +1089,12 @@ class AuthWindow(QWidget):
         if self.mode == 'register': payload['email'] = e
 
         try:
-            r = requests.post(f'{BASE_URL}/auth/{endpoint}/', json=payload)
+            r = http().post(f'{BASE_URL}/auth/{endpoint}/', json=payload, timeout=30)
             r.raise_for_status()
             data = r.json()
             state.token = data['token']
             state.username = data['username']
+            http().headers['Authorization'] = f'Token {state.token}'
             self.auth_success.emit()
         except Exception as err:
             QMessageBox.critical(self, "Error", f"{self.mode.title()} failed.\n{str(err)}")
@@ -374,6 +1103,13 @@ class AuthWindow(QWidget):
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        # The history request runs on the pool while the window is built; the list is filled on first visit.
+        self.history, self.page_hist = None, None
+        self.refresh_history_list()
+        self.upload_id = None
+        self.events = EventStream()
+        self.events.event.connect(self.on_server_event)
+        self.events.start()
         self.setWindowTitle("ChemViz Studio")
         self.resize(1400, 900)
         # FORCE DARK BACKGROUND ON MAIN WINDOW
@@ -385,18 +1121,18 @@ class MainWindow(QMainWindow):
         self.main_layout.setContentsMargins(0, 0, 0, 0)
         self.main_layout.setSpacing(0)
 
+        self.local_job, self.local_jobs = None, set()
         self.build_navbar()
 
         self.stack = QStackedWidget()
         self.page_dash = self.build_dashboard_page()
-        self.page_hist = self.build_history_page()
-        
         self.stack.addWidget(self.page_dash)
-        self.stack.addWidget(self.page_hist)
+        self.stack.addWidget(QWidget())  # history page placeholder, see ensure_history_page
         self.main_layout.addWidget(self.stack)
 
-        self.refresh_history_list()
         self.switch_page(0)
+        # Chart canvases (and Matplotlib) come in after the first frame is painted.
+        FirstPaint(self, self.ensure_charts)
 
     def build_navbar(self):
         nav = QFrame()
@@ -423,6 +1159,11 @@ class MainWindow(QMainWindow):
         nl.addWidget(self.btn_hist)
         nl.addStretch()
 
+        self.offline_lbl = QLabel("●  Offline: showing cached data")
+        self.offline_lbl.setStyleSheet(f"color: {C['amber']}; font-weight: 600;")
+        self.offline_lbl.setVisible(False)
+        nl.addWidget(self.offline_lbl)
+
         user = QLabel(f"👤  {state.username}")
         user.setStyleSheet(f"color: {C['text_sec']}; font-weight: 600;")
         nl.addWidget(user)
@@ -436,6 +1177,8 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(nav)
 
     def switch_page(self, idx):
+        if idx == 1:
+            self.ensure_history_page()
         self.stack.setCurrentIndex(idx)
         self.btn_dash.setProperty("active", str(idx == 0).lower())
         self.btn_hist.setProperty("active", str(idx == 1).lower())
@@ -486,18 +1229,12 @@ class MainWindow(QMainWindow):
         pie_card.setMinimumHeight(350)
         pl = QVBoxLayout(pie_card)
         pl.addWidget(QLabel("Type Distribution"))
-        self.fig_pie = Figure(figsize=(4, 3), facecolor=C['bg_card'])
-        self.can_pie = FigureCanvas(self.fig_pie)
-        pl.addWidget(self.can_pie)
         r2.addWidget(pie_card)
 
         bar_card = QFrame()
         bar_card.setProperty("class", "Card")
         bl = QVBoxLayout(bar_card)
         bl.addWidget(QLabel("Avg Metrics by Type"))
-        self.fig_bar = Figure(figsize=(5, 3), facecolor=C['bg_card'])
-        self.can_bar = FigureCanvas(self.fig_bar)
-        bl.addWidget(self.can_bar)
         r2.addWidget(bar_card)
 
         r2.setSizes([400, 600])
@@ -508,10 +1245,8 @@ class MainWindow(QMainWindow):
         line_card.setMinimumHeight(300)
         ll = QVBoxLayout(line_card)
         ll.addWidget(QLabel("Parameter Trends"))
-        self.fig_line = Figure(figsize=(8, 3), facecolor=C['bg_card'])
-        self.can_line = FigureCanvas(self.fig_line)
-        ll.addWidget(self.can_line)
         layout.addWidget(line_card)
+        self.chart_layouts, self.pie_chart = (pl, bl, ll), None
 
         table_card = QFrame()
         table_card.setProperty("class", "Card")
@@ -522,18 +1257,32 @@ class MainWindow(QMainWindow):
         th.setStyleSheet("font-size: 14px; font-weight: 700; padding: 15px;")
         tl.addWidget(th)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(['EQUIPMENT NAME', 'TYPE', 'FLOWRATE', 'PRESSURE', 'TEMP'])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setShowGrid(False)
+        self.table = make_record_table()
+        self.table.model().first_page.connect(self.render_line_chart)
         self.table.setMinimumHeight(300)
         tl.addWidget(self.table)
         
         layout.addWidget(table_card)
         return scroll
 
+    def ensure_charts(self):
+        if self.pie_chart is not None:
+            return
+        pl, bl, ll = self.chart_layouts
+        self.pie_chart = DonutChart(figsize=(4, 3)); pl.addWidget(self.pie_chart.canvas)
+        self.bar_chart = BarChart(figsize=(5, 3)); bl.addWidget(self.bar_chart.canvas)
+        self.line_chart = LineChart(figsize=(8, 3)); ll.addWidget(self.line_chart.canvas)
+
+    def ensure_history_page(self):
+        if self.page_hist is not None:
+            return
+        self.page_hist = self.build_history_page()
+        placeholder = self.stack.widget(1)
+        self.stack.insertWidget(1, self.page_hist)
+        self.stack.removeWidget(placeholder); placeholder.deleteLater()
+        if self.history is not None:
+            self.fill_history_list()
+
     def build_history_page(self):
         page = QWidget()
         layout = QHBoxLayout(page)
@@ -552,6 +1301,7 @@ class MainWindow(QMainWindow):
         self.hist_list = QListWidget()
         self.hist_list.setStyleSheet("background: transparent; border: none;")
         self.hist_list.setSpacing(12)
+        self.hist_list.itemClicked.connect(self.load_history_detail)
         ll.addWidget(self.hist_list)
         layout.addWidget(left)
 
@@ -576,15 +1326,13 @@ class MainWindow(QMainWindow):
 
         self.h_pie_card = QFrame(); self.h_pie_card.setProperty("class", "Card"); self.h_pie_card.setMinimumHeight(300)
         hpl = QVBoxLayout(self.h_pie_card)
-        self.h_fig_pie = Figure(figsize=(5,3), facecolor=C['bg_card'])
-        self.h_can_pie = FigureCanvas(self.h_fig_pie)
-        hpl.addWidget(self.h_can_pie)
+        self.h_pie_chart = DonutChart(figsize=(5, 3))
+        hpl.addWidget(self.h_pie_chart.canvas)
         rp_layout.addWidget(self.h_pie_card)
 
         self.h_table_card = QFrame(); self.h_table_card.setProperty("class", "Card")
         htl = QVBoxLayout(self.h_table_card); htl.setContentsMargins(0,0,0,0)
-        self.h_table = QTableWidget(); self.h_table.setColumnCount(5); self.h_table.setHorizontalHeaderLabels(['EQUIPMENT', 'TYPE', 'FLOW', 'PRESS', 'TEMP'])
-        self.h_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch); self.h_table.verticalHeader().setVisible(False); self.h_table.setShowGrid(False)
+        self.h_table = make_record_table(['EQUIPMENT', 'TYPE', 'FLOW', 'PRESS', 'TEMP'])
         self.h_table.setMinimumHeight(400)
         htl.addWidget(self.h_table)
         rp_layout.addWidget(self.h_table_card)
@@ -593,136 +1341,176 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.right_panel, 1)
         return page
 
+    def update_offline_badge(self):
+        self.offline_lbl.setVisible(state.offline)
+
     def upload_flow(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "*.csv")
-        if path:
-            self.upload_widget.text.setText(f"Uploading {os.path.basename(path)}...")
-            self.upload_widget.btn.setEnabled(False)
-            self.worker = APIWorker(self._upload_api, path)
-            self.worker.result.connect(self.on_upload_success)
-            self.worker.start()
-
-    def _upload_api(self, path):
-        with open(path, 'rb') as f:
-            r = requests.post(f'{BASE_URL}/upload/', files={'file': f}, headers={'Authorization': f'Token {state.token}'})
-            r.raise_for_status()
-            return r.json()
+        path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "CSV files (*.csv *.csv.gz *.csv.zst *.zip)")
+        if not path:
+            return
+        # The file is analysed locally right away; the upload is optional and runs alongside.
+        self.start_local_analysis(path)
+        if not self.upload_widget.upload_chk.isChecked():
+            return
+        if state.offline:
+            # Read-only while offline; refreshing history checks whether the server is back.
+            self.upload_widget.text.setText(f"Offline: showing {os.path.basename(path)} locally, not uploaded")
+            self.refresh_history_list()
+            return
+        self.upload_widget.text.setText(f"Analyzing {os.path.basename(path)} locally, uploading in the background...")
+        self.upload_widget.btn.setEnabled(False)
+        self.upload_id = uuid.uuid4().hex
+        tasks.submit(self._upload_api, path, self.upload_id, key=('upload', path),
+                     on_result=self.on_upload_success, on_error=self.on_upload_failed)
+
+    def start_local_analysis(self, path):
+        if self.local_job:
+            self.local_job.stop()
+        job = self.local_job = LocalAnalysis(path)
+        self.local_jobs.add(job)  # keeps a superseded thread alive until it notices stop()
+        self.table.model().set_local(job)
+        job.progress.connect(lambda summary, rows, replace: self.on_local_progress(job, summary, rows, replace))
+        job.failed.connect(lambda err: self.on_local_failed(job, err))
+        job.finished.connect(lambda: self.local_jobs.discard(job))
+        job.start()
+        self.switch_page(0)
+
+    def on_local_progress(self, job, summary, rows, replace):
+        if job is not self.local_job:
+            return  # a newer file or an upload result replaced this analysis
+        model = self.table.model()
+        if replace:
+            model.set_local(job)
+        model.add_frame(rows)
+        self.populate_dashboard(summary, is_history=False)
+
+    def on_local_failed(self, job, err):
+        if job is self.local_job:
+            QMessageBox.critical(self, "Error", f"Could not read the file.\n{err}")
+
+    def _upload_api(self, path, upload_id):
+        if path.endswith('.csv'):
+            # Plain CSVs compress ~5-10x, so gzip them on the fly and send the body raw.
+            with gzip_file(path) as body:
+                r = http().post(
+                    f'{BASE_URL}/upload/', data=body, params={'name': os.path.basename(path), 'upload_id': upload_id},
+                    headers={'Content-Type': 'text/csv', 'Content-Encoding': 'gzip'},
+                )
+        else:
+            with open(path, 'rb') as f:
+                r = http().post(f'{BASE_URL}/upload/', files={'file': f}, params={'upload_id': upload_id})
+        r.raise_for_status()
+        return r.json()
 
     def on_upload_success(self, data):
+        if self.local_job:
+            self.local_job.stop()
+            self.local_job = None
         self.upload_widget.text.setText("Drag & drop your .csv file here")
         self.upload_widget.btn.setEnabled(True)
+        self.upload_id = None
         self.populate_dashboard(data, is_history=False)
-        self.refresh_history_list()
-        self.switch_page(0)
+        self.render_table(self.table, data['id'])
+        self.switch_page(0)  # the history list follows from the dataset_added event
+
+    def on_server_event(self, kind, data):
+        if kind in ('dataset_added', 'dataset_updated', 'dataset_deleted', 'resync'):
+            self.refresh_history_list()
+        elif kind == 'upload_progress' and data.get('upload_id') == self.upload_id:
+            rows = f" {data['rows']:,} rows" if data.get('rows') else ''
+            self.upload_widget.text.setText(f"Uploading {data['name']}: {data['stage']}{rows}...")
+
+    def closeEvent(self, event):
+        self.events.stop()
+        self.events.wait(2000)
+        super().closeEvent(event)
+
+    def on_upload_failed(self, err):
+        self.upload_id = None
+        self.upload_widget.text.setText("Drag & drop your .csv file here")
+        self.upload_widget.btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Upload failed.\n{err}")
 
     def populate_dashboard(self, data, is_history=False):
+        """Fill stat cards and charts from summary fields; the table pages its records in separately."""
         eq, fl, pr, te = (self.hs_eq, self.hs_fl, self.hs_pr, self.hs_te) if is_history else (self.stat_eq, self.stat_fl, self.stat_pr, self.stat_te)
-        table = self.h_table if is_history else self.table
-        
+
         eq.set_value(data['total_records'])
         fl.set_value(f"{data['avg_flowrate']:.1f}")
         pr.set_value(f"{data['avg_pressure']:.2f}")
         te.set_value(f"{data['avg_temperature']:.0f}")
 
         self.render_charts(data, is_history)
-        self.render_table(table, data['records'])
 
     def render_charts(self, data, is_history):
-        fig = self.h_fig_pie if is_history else self.fig_pie
-        can = self.h_can_pie if is_history else self.can_pie
-        
-        fig.clf()
-        ax = fig.add_subplot(111)
-        dist = data['type_distribution']
-        labels, sizes = list(dist.keys()), list(dist.values())
-        
-        wedges, _ = ax.pie(sizes, colors=CHART_COLORS, startangle=90, wedgeprops={'width': 0.5, 'edgecolor': C['bg_card']})
-        ax.legend(wedges, labels, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1), frameon=False, labelcolor=C['text_sec'])
-        fig.tight_layout()
-        can.draw()
-
-        if is_history: return 
-
-        self.fig_bar.clf()
-        ax = self.fig_bar.add_subplot(111)
-        types = list(data['type_distribution'].keys())[:6]
-        vals = [150 + i*10 for i in range(len(types))]
-        ax.bar(types, vals, color=CHART_COLORS[:len(types)])
-        ax.set_facecolor(C['bg_card'])
-        ax.tick_params(colors=C['text_sec'])
-        for s in ax.spines.values(): s.set_visible(False)
-        self.can_bar.draw()
-
-        self.fig_line.clf()
-        ax = self.fig_line.add_subplot(111)
-        recs = data['records'][:20]
-        ax.plot([r['temperature'] for r in recs], color=C['red'], marker='o')
-        ax.plot([r['pressure']*10 for r in recs], color=C['blue'], marker='o')
-        ax.set_facecolor(C['bg_card'])
-        ax.tick_params(colors=C['text_sec'])
-        for s in ax.spines.values(): s.set_visible(False)
-        self.can_line.draw()
-
-    def render_table(self, table, records):
-        table.setRowCount(len(records))
-        for i, r in enumerate(records):
-            t_name = QTableWidgetItem(r['equipment_name'])
-            t_name.setForeground(QColor("#f8fafc"))
-            t_name.setFont(QFont("Segoe UI", 9, QFont.Bold))
-            table.setItem(i, 0, t_name)
-            
-            table.setCellWidget(i, 1, self.create_badge(r['equipment_type']))
-            
-            for j, k in enumerate(['flowrate', 'pressure', 'temperature'], 2):
-                it = QTableWidgetItem(f"{r[k]:.1f}")
-                it.setForeground(QColor(C['text_pri']))
-                table.setItem(i, j, it)
-
-    def create_badge(self, text):
-        lbl = QLabel(text)
-        lbl.setAlignment(Qt.AlignCenter)
-        bg, fg = "#1e293b", "#cbd5e1"
-        if 'Valve' in text: bg, fg = "rgba(16, 185, 129, 0.15)", "#34d399"
-        elif 'Pump' in text: bg, fg = "rgba(59, 130, 246, 0.15)", "#60a5fa"
-        elif 'Tower' in text: bg, fg = "rgba(139, 92, 246, 0.15)", "#a78bfa"
-        elif 'Comp' in text: bg, fg = "rgba(6, 182, 212, 0.15)", "#22d3ee"
-        elif 'Heat' in text: bg, fg = "rgba(245, 158, 11, 0.15)", "#fbbf24"
-        elif 'Sep' in text: bg, fg = "rgba(239, 68, 68, 0.15)", "#f87171"
-
-        lbl.setStyleSheet(f"background: {bg}; color: {fg}; border-radius: 4px; padding: 4px 8px; font-weight: 700; font-size: 10px;")
-        w = QWidget(); l = QHBoxLayout(w); l.setContentsMargins(0,2,0,2); l.addWidget(lbl); l.addStretch()
-        return w
+        # Geometry is computed on the pool; a newer dataset supersedes a pending one.
+        tasks.submit(summary_chart_data, data, group=f'charts:{is_history}', replace=True,
+                     on_result=lambda chart: self.apply_charts(chart, is_history))
+
+    def apply_charts(self, chart, is_history):
+        self.ensure_charts()
+        (self.h_pie_chart if is_history else self.pie_chart).update(*chart['pie'])
+        if not is_history:
+            self.bar_chart.update(*chart['bar'])
+
+    def render_line_chart(self, recs):
+        tasks.submit(line_chart_data, recs, group='charts:line', replace=True,
+                     on_result=self.apply_line_chart)
+
+    def apply_line_chart(self, series):
+        self.ensure_charts()
+        self.line_chart.update(*series)
+
+    def render_table(self, table, dataset_id):
+        table.model().set_dataset(dataset_id)
+        table.scrollToTop()
 
     def refresh_history_list(self):
-        self.hist_list.clear()
-        self.worker_h = APIWorker(self._hist_api)
-        self.worker_h.result.connect(self.on_hist_loaded)
-        self.worker_h.start()
+        tasks.submit(self._hist_api, key='history', group='history', replace=True, on_result=self.on_hist_loaded)
 
     def _hist_api(self):
-        r = requests.get(f'{BASE_URL}/history/', headers={'Authorization': f'Token {state.token}'})
-        return r.json()
+        return json.loads(cached_get('/history/')[0])
 
     def on_hist_loaded(self, data):
+        self.update_offline_badge()
         # Handle potential dictionary pagination response
         if isinstance(data, dict):
             data = data.get('results', [])
             
         data.sort(key=lambda x: x['uploaded_at'], reverse=True)
-        for ds in data:
+        self.history = data
+        if self.page_hist is not None:
+            self.fill_history_list()
+
+    def fill_history_list(self):
+        self.hist_list.clear()
+        for ds in self.history:
             item = QListWidgetItem(self.hist_list)
             item.setSizeHint(QSize(300, 110))
             cw = HistoryListItem(ds, {'pdf': self.export_pdf, 'del': self.delete_ds})
             self.hist_list.setItemWidget(item, cw)
             item.setData(Qt.UserRole, ds['id'])
-        self.hist_list.itemClicked.connect(self.load_history_detail)
 
     def load_history_detail(self, item):
         ds_id = item.data(Qt.UserRole)
         self.right_panel.setVisible(True)
-        self.worker_det = APIWorker(lambda: requests.get(f'{BASE_URL}/dataset/{ds_id}/', headers={'Authorization': f'Token {state.token}'}).json())
-        self.worker_det.result.connect(lambda d: self.populate_dashboard(d, is_history=True))
-        self.worker_det.start()
+        # Summary and the first record page are fetched in parallel; cards and charts don't wait for records.
+        self.render_table(self.h_table, ds_id)
+        cached = peek_cached(f'/dataset/{ds_id}/summary/')
+        if cached is not None:
+            self.populate_dashboard(json.loads(cached), is_history=True)
+        # A newer click supersedes this one, so a slow response can't overwrite the dataset now shown.
+        tasks.submit(self._summary_api, ds_id, key=('summary', ds_id), group='detail', replace=True,
+                     on_result=self.on_summary_loaded)
+
+    def _summary_api(self, ds_id):
+        body, changed = cached_get(f'/dataset/{ds_id}/summary/')
+        return json.loads(body) if changed else None
+
+    def on_summary_loaded(self, data):
+        self.update_offline_badge()
+        if data:
+            self.populate_dashboard(data, is_history=True)
 
     # ─── REAL PDF Download Logic ────────────────────────────────────────────
     def export_pdf(self, ds):
@@ -736,17 +1524,15 @@ class MainWindow(QMainWindow):
         if not save_path:
             return
 
-        self.worker_pdf = APIWorker(self._do_download_pdf, ds['id'])
-        self.worker_pdf.result.connect(lambda content: self.save_pdf_file(content, save_path))
-        self.worker_pdf.error.connect(lambda e: QMessageBox.critical(self, "Error", f"Failed to download PDF.\n{e}"))
-        self.worker_pdf.start()
+        tasks.submit(
+            self._do_download_pdf, ds['id'], key=('report', ds['id']),
+            on_result=lambda content: self.save_pdf_file(content, save_path),
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to download PDF.\n{e}"),
+        )
 
     def _do_download_pdf(self, ds_id):
-        # Assumes endpoint /dataset/{id}/report/ returns the PDF binary
-        url = f'{BASE_URL}/dataset/{ds_id}/report/'
-        r = requests.get(url, headers={'Authorization': f'Token {state.token}'}, stream=True)
-        r.raise_for_status()
-        return r.content
+        # Reports carry an ETag, so a report saved before is only re-rendered if its dataset changed.
+        return cached_get(f'/dataset/{ds_id}/report/', cache='reports')[0]
 
     def save_pdf_file(self, content, path):
         try:
@@ -760,11 +1546,52 @@ class MainWindow(QMainWindow):
         # Mock delete - in real app, call DELETE endpoint
         self.refresh_history_list()
 
+# ─── Startup Benchmark ──────────────────────────────────────────────────────
+def run_startup_benchmark(app):
+    """
+    ``app.py --startup-benchmark``: time the cold start without a login, print
+    the timings as JSON and quit. ``login_frame`` runs from interpreter start
+    (or CHEMVIZ_LAUNCHED, a time.time() stamp taken by a harness before
+    spawning the process) to the painted login window. ``main_frame`` runs
+    from a successful login to the painted main window, and ``main_charts``
+    until its deferred chart canvases exist.
+    """
+    now = time.perf_counter()
+    launched = os.environ.get('CHEMVIZ_LAUNCHED')
+    offset = time.time() - float(launched) - (now - _LAUNCHED) if launched else 0.0
+    timings = {'imports': offset + now - _LAUNCHED}
+    windows = {'auth': AuthWindow()}
+
+    def login_painted():
+        timings['login_frame'] = offset + time.perf_counter() - _LAUNCHED
+        state.token, state.username = 'startup-benchmark', 'benchmark'
+        start = time.perf_counter()
+        windows['auth'].close()
+        windows['main'] = MainWindow()
+
+        def main_painted():
+            timings['main_frame'] = time.perf_counter() - start
+            QTimer.singleShot(0, charts_built)  # queued behind the window's own ensure_charts
+
+        def charts_built():
+            timings['main_charts'] = time.perf_counter() - start
+            print(json.dumps({k: round(v, 4) for k, v in timings.items()}), flush=True)
+            app.quit()
+        FirstPaint(windows['main'], main_painted)
+        windows['main'].show()
+
+    FirstPaint(windows['auth'], login_painted)
+    windows['auth'].show()
+    return app.exec_()
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     font = QFont("Segoe UI", 10)
     app.setFont(font)
+    tasks = TaskScheduler(max_threads=4)
+    if '--startup-benchmark' in sys.argv:
+        sys.exit(run_startup_benchmark(app))
 
     auth = AuthWindow()
     main = None
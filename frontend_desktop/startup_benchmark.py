@@ -0,0 +1,63 @@
+"""
+Measure the desktop app's cold start: time to the first painted login window,
+and from login to the first painted main window.
+
+    cd frontend_desktop
+    python startup_benchmark.py --runs 10 --offscreen --output startup.json
+
+Every run is a fresh interpreter started with ``app.py --startup-benchmark``,
+so imports are paid each time (the OS file cache stays warm after the first
+run). No server is needed: the main window is opened with a placeholder
+token, and its history request fails in the background.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def run_once(env):
+    env = dict(env, CHEMVIZ_LAUNCHED=repr(time.time()))
+    out = subprocess.run([sys.executable, APP, '--startup-benchmark'], env=env,
+                         capture_output=True, text=True, timeout=120)
+    for line in reversed(out.stdout.splitlines()):
+        if line.startswith('{'):
+            return json.loads(line)
+    raise RuntimeError(f'app.py printed no timings (exit {out.returncode}):\n{out.stderr[-2000:]}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--offscreen', action='store_true', help='render with QT_QPA_PLATFORM=offscreen')
+    parser.add_argument('--output', help='write every sample and the medians as JSON')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+
+    run_once(env)  # warm the OS file cache so the runs are comparable
+    samples = [run_once(env) for _ in range(args.runs)]
+
+    summary = {}
+    for metric in samples[0]:
+        values = [s[metric] for s in samples]
+        summary[metric] = {'min': min(values), 'median': round(statistics.median(values), 4), 'max': max(values)}
+        print(f'{metric:<12} median {summary[metric]["median"] * 1000:8.1f} ms   '
+              f'min {min(values) * 1000:8.1f}   max {max(values) * 1000:8.1f}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': args.runs, 'offscreen': args.offscreen, 'summary': summary, 'samples': samples}, f, indent=2)
+        print(f'Wrote {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,41 +1,28 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React from 'react';
 import UploadZone from './UploadZone';
 import SummaryCards from './SummaryCards';
 import DataTable from './DataTable';
 import { TypeDistributionChart, MetricsByTypeChart, TrendChart } from './Charts';
-import { getHistory, getDatasetDetail } from '../services/api';
+import useCachedGet from '../utils/useCachedGet';
 
-const Dashboard = () => {
-  const [dataset, setDataset] = useState(null);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState('');
+// The charts plot the first page of records; the table pages through the rest on demand.
+const CHART_RECORDS = { page: 1, page_size: 500 };
 
-  const fetchLatest = useCallback(async () => {
-    setLoading(true);
-    setError('');
-    try {
-      const histRes = await getHistory();
-      const history = histRes.data;
-      if (history && history.length > 0) {
-        const detailRes = await getDatasetDetail(history[0].id);
-        setDataset(detailRes.data);
-      } else {
-        setDataset(null);
-      }
-    } catch (err) {
-      setError('Failed to load data. Please try uploading a file.');
-    } finally {
-      setLoading(false);
-    }
-  }, []);
+const Dashboard = () => {
+  const { data: history, error: histError, revalidate } = useCachedGet('/history/');
+  const latestId = history && history.length > 0 ? history[0].id : null;
+  const { data: dataset, error: detailError } = useCachedGet(latestId && `/dataset/${latestId}/summary/`);
+  const { data: chartPage } = useCachedGet(latestId && `/dataset/${latestId}/records/`, CHART_RECORDS);
 
-  useEffect(() => { fetchLatest(); }, [fetchLatest]);
+  const loading = (history === undefined && !histError) || (latestId && dataset === undefined && !detailError);
+  const error = histError || detailError ? 'Failed to load data. Please try uploading a file.' : '';
+  const records = chartPage?.results;
 
   return (
     <div>
       {/* Top row: upload + summary */}
       <div style={styles.topGrid}>
-        <UploadZone onUploadSuccess={fetchLatest} />
+        <UploadZone onUploadSuccess={revalidate} />
 
         <div style={styles.rightCol}>
           {loading && <div style={styles.loadingMsg}>Loading…</div>}
@@ -55,16 +42,16 @@ const Dashboard = () => {
         <>
           <div style={{ ...styles.chartsGrid, marginTop: 24 }}>
             <TypeDistributionChart distribution={dataset.type_distribution} />
-            <MetricsByTypeChart records={dataset.records} />
+            <MetricsByTypeChart records={records} />
           </div>
 
           <div style={{ marginTop: 20 }}>
-            <TrendChart records={dataset.records} />
+            <TrendChart records={records} />
           </div>
 
           {/* Data table */}
           <div style={{ marginTop: 20 }}>
-            <DataTable records={dataset.records} />
+            <DataTable datasetId={dataset.id} total={dataset.total_records} />
           </div>
         </>
       )}
@@ -1,4 +1,5 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
+import { getRecordsPage } from '../services/api';
 
 const TYPE_COLORS = {
   'Pump':              { bg: 'rgba(0,200,160,.12)',   text: '#00c8a0' },
@@ -24,37 +25,101 @@ const columns = [
   { key: 'temperature',    label: 'Temp (°C)', align: 'right' },
 ];
 
-const DataTable = ({ records }) => {
+// Rows are rendered only around the viewport and fetched from the records
+// endpoint a page at a time, so the DOM stays small for any dataset size.
+const PAGE_SIZE = 200;
+const KEEP_PAGES = 10;            // pages kept either side of the last one loaded
+const ROW_HEIGHT = 38;
+const VIEWPORT_HEIGHT = 520;
+const OVERSCAN = 8;
+const MAX_SCROLL_HEIGHT = 10000000; // browsers cap element height; taller tables scroll scaled
+
+const numCell = (value) => (typeof value === 'number' ? value.toFixed(1) : '');
+
+const DataTable = ({ datasetId, total }) => {
   const [sortKey, setSortKey] = useState('equipment_name');
   const [sortDir, setSortDir] = useState(1); // 1 asc, -1 desc
+  const [scrollTop, setScrollTop] = useState(0);
+  const [pages, setPages] = useState({});    // page number -> rows
+  const [count, setCount] = useState(total || 0);
+  const scrollRef = useRef(null);
+  const frame = useRef(0);
+  const ordering = sortDir === 1 ? sortKey : `-${sortKey}`;
+
+  // A new dataset or sort order starts again from the top.
+  useEffect(() => {
+    setPages({});
+    setCount(total || 0);
+    setScrollTop(0);
+    if (scrollRef.current) scrollRef.current.scrollTop = 0;
+  }, [datasetId, ordering, total]);
+
+  useEffect(() => () => cancelAnimationFrame(frame.current), []);
 
-  const sorted = useMemo(() => {
-    if (!records) return [];
-    return [...records].sort((a, b) => {
-      const va = a[sortKey], vb = b[sortKey];
-      if (typeof va === 'string') return sortDir * va.localeCompare(vb);
-      return sortDir * (va - vb);
-    });
-  }, [records, sortKey, sortDir]);
+  const scale = Math.max(1, (count * ROW_HEIGHT) / MAX_SCROLL_HEIGHT);
+  const virtualTop = scrollTop * scale;
+  const firstVisible = Math.min(Math.floor(virtualTop / ROW_HEIGHT), Math.max(count - 1, 0));
+  const first = Math.max(0, firstVisible - OVERSCAN);
+  const last = Math.min(count, firstVisible + Math.ceil(VIEWPORT_HEIGHT / ROW_HEIGHT) + OVERSCAN);
+  const firstPage = Math.floor(first / PAGE_SIZE) + 1;
+  const lastPage = Math.max(firstPage, Math.ceil(last / PAGE_SIZE));
+
+  useEffect(() => {
+    if (!datasetId) return undefined;
+    let active = true;
+    for (let page = firstPage; page <= lastPage; page++) {
+      if (pages[page]) continue;
+      // Concurrent calls for the same page share one request, so re-running this effect is cheap.
+      getRecordsPage(datasetId, page, PAGE_SIZE, ordering)
+        .then((data) => {
+          if (!active) return;
+          setCount(data.count);
+          setPages((prev) => {
+            const next = { [page]: data.results };
+            Object.keys(prev).forEach((p) => {
+              if (Math.abs(p - page) <= KEEP_PAGES) next[p] = prev[p];
+            });
+            return next;
+          });
+        })
+        .catch(() => {});
+    }
+    return () => { active = false; };
+  }, [datasetId, ordering, firstPage, lastPage, pages]);
 
   const handleSort = (key) => {
     if (sortKey === key) setSortDir(-sortDir);
     else { setSortKey(key); setSortDir(1); }
   };
 
-  if (!records || records.length === 0) return null;
+  const onScroll = (e) => {
+    const top = e.currentTarget.scrollTop;
+    cancelAnimationFrame(frame.current);
+    frame.current = requestAnimationFrame(() => setScrollTop(top));
+  };
+
+  if (!datasetId || count === 0) return null;
+
+  const rows = [];
+  for (let i = first; i < last; i++) {
+    const page = pages[Math.floor(i / PAGE_SIZE) + 1];
+    rows.push({ index: i, rec: page ? page[i % PAGE_SIZE] : null });
+  }
+  const height = (count * ROW_HEIGHT) / scale;
+  const padTop = Math.max(0, scrollTop - (virtualTop % ROW_HEIGHT) - (firstVisible - first) * ROW_HEIGHT);
+  const padBottom = Math.max(0, height - padTop - rows.length * ROW_HEIGHT);
 
   return (
     <div className="card" style={styles.tableCard}>
       <h3 style={styles.tableTitle}>
         Equipment Records
-        <span style={styles.recordCount}>{records.length} items</span>
+        <span style={styles.recordCount}>{count.toLocaleString()} items</span>
       </h3>
-      <div style={styles.scrollWrapper}>
+      <div ref={scrollRef} style={styles.scrollWrapper} onScroll={onScroll}>
         <table style={styles.table}>
           <thead>
             <tr>
-              <th style={{ ...styles.th, width: 40 }}>#</th>
+              <th style={{ ...styles.th, width: 70 }}>#</th>
               {columns.map(col => (
                 <th
                   key={col.key}
@@ -70,29 +135,33 @@ const DataTable = ({ records }) => {
             </tr>
           </thead>
           <tbody>
-            {sorted.map((rec, i) => {
+            {padTop > 0 && <tr style={{ height: padTop }} />}
+            {rows.map(({ index, rec }) => {
+              if (!rec) {
+                return (
+                  <tr key={`pending-${index}`} style={styles.row}>
+                    <td style={styles.indexTd}>{index + 1}</td>
+                    <td colSpan={columns.length} style={{ ...styles.td, color: '#5a6a7d' }}>…</td>
+                  </tr>
+                );
+              }
               const tc = getTypeStyle(rec.equipment_type);
               return (
-                <tr key={rec.id || i} style={styles.row}>
-                  <td style={{ ...styles.td, color: '#5a6a7d', fontSize: '.78rem' }}>{i + 1}</td>
+                <tr key={rec.id} style={styles.row}>
+                  <td style={styles.indexTd}>{index + 1}</td>
                   <td style={{ ...styles.td, textAlign: 'left' }}>{rec.equipment_name}</td>
                   <td style={{ ...styles.td, textAlign: 'left' }}>
                     <span style={{ ...styles.badge, background: tc.bg, color: tc.text }}>
                       {rec.equipment_type}
                     </span>
                   </td>
-                  <td style={{ ...styles.td, textAlign: 'right', fontFamily: 'JetBrains Mono, monospace', fontSize: '.82rem' }}>
-                    {rec.flowrate.toFixed(1)}
-                  </td>
-                  <td style={{ ...styles.td, textAlign: 'right', fontFamily: 'JetBrains Mono, monospace', fontSize: '.82rem' }}>
-                    {rec.pressure.toFixed(1)}
-                  </td>
-                  <td style={{ ...styles.td, textAlign: 'right', fontFamily: 'JetBrains Mono, monospace', fontSize: '.82rem' }}>
-                    {rec.temperature.toFixed(1)}
-                  </td>
+                  <td style={styles.numTd}>{numCell(rec.flowrate)}</td>
+                  <td style={styles.numTd}>{numCell(rec.pressure)}</td>
+                  <td style={styles.numTd}>{numCell(rec.temperature)}</td>
                 </tr>
               );
             })}
+            {padBottom > 0 && <tr style={{ height: padBottom }} />}
           </tbody>
         </table>
       </div>
@@ -120,7 +189,7 @@ const styles = {
     borderRadius: 12,
     fontWeight: 500,
   },
-  scrollWrapper: { overflowX: 'auto' },
+  scrollWrapper: { overflow: 'auto', height: VIEWPORT_HEIGHT },
   table: {
     width: '100%',
     borderCollapse: 'collapse',
@@ -129,7 +198,7 @@ const styles = {
   },
   th: {
     padding: '10px 14px',
-    background: 'rgba(255,255,255,.03)',
+    background: '#1d2530',  // rgba(255,255,255,.03) over the card, opaque for the sticky header
     color: '#5a6a7d',
     fontSize: '.72rem',
     fontWeight: 600,
@@ -138,16 +207,35 @@ const styles = {
     borderBottom: '1px solid rgba(255,255,255,.07)',
     whiteSpace: 'nowrap',
     userSelect: 'none',
+    position: 'sticky',
+    top: 0,
+    zIndex: 1,
   },
   sortArrow: { color: '#00c8a0' },
   row: {
+    height: ROW_HEIGHT,
     borderBottom: '1px solid rgba(255,255,255,.04)',
     transition: 'background .15s',
   },
   td: {
-    padding: '9px 14px',
+    padding: '0 14px',
     color: '#c8d4e0',
     fontSize: '.84rem',
+    whiteSpace: 'nowrap',
+    overflow: 'hidden',
+    textOverflow: 'ellipsis',
+  },
+  indexTd: {
+    padding: '0 14px',
+    color: '#5a6a7d',
+    fontSize: '.78rem',
+  },
+  numTd: {
+    padding: '0 14px',
+    color: '#c8d4e0',
+    textAlign: 'right',
+    fontFamily: 'JetBrains Mono, monospace',
+    fontSize: '.82rem',
   },
   badge: {
     display: 'inline-block',
@@ -1,51 +1,29 @@
-import React, { useState, useEffect, useCallback } from 'react';
-import { getHistory, getDatasetDetail, deleteDataset, downloadPDF } from '../services/api';
+import React, { useState } from 'react';
+import { deleteDataset, downloadPDF } from '../services/api';
+import useCachedGet from '../utils/useCachedGet';
 import SummaryCards from './SummaryCards';
 import DataTable from './DataTable';
 import { TypeDistributionChart } from './Charts';
 
 const History = () => {
-  const [history, setHistory] = useState([]);
-  const [loading, setLoading] = useState(true);
-  const [selected, setSelected] = useState(null);   // full dataset
   const [selectedId, setSelectedId] = useState(null);
-  const [detailLoading, setDetailLoading] = useState(false);
   const [pdfLoading, setPdfLoading] = useState(null);
+  const { data, error } = useCachedGet('/history/');
+  const history = error ? [] : data || [];
+  const loading = data === undefined && !error;
+  // Summary only; the table fetches its own record pages.
+  const detail = useCachedGet(selectedId && `/dataset/${selectedId}/summary/`);
+  const selected = selectedId && !detail.error ? detail.data : null;
+  const detailLoading = !!selectedId && detail.data === undefined && !detail.error;
 
-  const fetchHistory = useCallback(async () => {
-    setLoading(true);
-    try {
-      const res = await getHistory();
-      setHistory(res.data);
-    } catch {
-      setHistory([]);
-    } finally {
-      setLoading(false);
-    }
-  }, []);
-
-  useEffect(() => { fetchHistory(); }, [fetchHistory]);
-
-  const selectDataset = async (id) => {
-    setSelectedId(id);
-    setDetailLoading(true);
-    try {
-      const res = await getDatasetDetail(id);
-      setSelected(res.data);
-    } catch {
-      setSelected(null);
-    } finally {
-      setDetailLoading(false);
-    }
-  };
+  const selectDataset = (id) => setSelectedId(id);
 
   const handleDelete = async (id, e) => {
     e.stopPropagation();
     if (!window.confirm('Delete this dataset?')) return;
     try {
-      await deleteDataset(id);
-      setHistory(history.filter(h => h.id !== id));
-      if (selectedId === id) { setSelected(null); setSelectedId(null); }
+      await deleteDataset(id);  // revalidates the history list
+      if (selectedId === id) setSelectedId(null);
     } catch {}
   };
 
@@ -141,7 +119,7 @@ const History = () => {
                   <TypeDistributionChart distribution={selected.type_distribution} />
                 </div>
                 <div style={{ marginTop: 16 }}>
-                  <DataTable records={selected.records} />
+                  <DataTable datasetId={selected.id} total={selected.total_records} />
                 </div>
               </>
             )}
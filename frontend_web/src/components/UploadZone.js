@@ -1,13 +1,22 @@
-import React, { useState, useRef } from 'react';
+import React, { useState, useRef, useEffect } from 'react';
 import { uploadCSV } from '../services/api';
+import { onEvent } from '../services/events';
+
+const PROGRESS_LABELS = { read: 'Received', saving: 'Saving', ingesting: 'Ingesting', done: 'Finishing' };
 
 const UploadZone = ({ onUploadSuccess }) => {
   const [dragging, setDragging] = useState(false);
   const [file, setFile] = useState(null);
   const [status, setStatus] = useState('idle'); // idle | uploading | success | error
   const [error, setError] = useState('');
+  const [progress, setProgress] = useState(null);
+  const uploadId = useRef(null);
   const fileRef = useRef();
 
+  useEffect(() => onEvent('upload_progress', (p) => {
+    if (p.upload_id === uploadId.current) setProgress(p);
+  }), []);
+
   const handleFile = (f) => {
     if (!f) return;
     if (!f.name.endsWith('.csv')) {
@@ -30,8 +39,10 @@ const UploadZone = ({ onUploadSuccess }) => {
     if (!file) return;
     setStatus('uploading');
     setError('');
+    setProgress(null);
+    uploadId.current = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
     try {
-      await uploadCSV(file);
+      await uploadCSV(file, uploadId.current);
       setStatus('success');
       setFile(null);
       onUploadSuccess();
@@ -99,7 +110,10 @@ const UploadZone = ({ onUploadSuccess }) => {
           onClick={upload}
           style={styles.uploadBtn}
         >
-          {status === 'uploading' ? '⟳ Uploading…' : 'Upload & Analyze'}
+          {status !== 'uploading' ? 'Upload & Analyze'
+            : progress && PROGRESS_LABELS[progress.stage]
+              ? `⟳ ${PROGRESS_LABELS[progress.stage]}${progress.rows ? ` ${progress.rows.toLocaleString()} rows` : ''}…`
+              : '⟳ Uploading…'}
         </button>
 
         {/* Sample download hint */}
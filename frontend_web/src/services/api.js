@@ -23,20 +23,109 @@ export const register = (username, email, password) =>
 export const login = (username, password) =>
   api.post('/auth/login/', { username, password });
 
+// --- Cached reads ---
+// Responses are kept per URL + params with their ETag. A read younger than
+// FRESH_MS is served from memory; anything older is returned at once (stale)
+// while a revalidation with If-None-Match runs, and a 304 keeps the stored
+// body. Concurrent reads of the same key share one request, and subscribers
+// are told whenever a key gets new data.
+const FRESH_MS = 2000;
+const MAX_ENTRIES = 200;
+
+const cache = new Map();      // key -> { data, etag, time }
+const inflight = new Map();   // key -> Promise of data
+const listeners = new Map();  // key -> Set of callbacks
+
+export const cacheKey = (url, params) =>
+  params ? `${url}?${new URLSearchParams(params).toString()}` : url;
+
+const notify = (key, data) => (listeners.get(key) || []).forEach((fn) => fn(data));
+
+const store = (key, entry) => {
+  cache.delete(key);  // re-insert so Map order stays least recently used first
+  cache.set(key, entry);
+  for (const oldest of cache.keys()) {
+    if (cache.size <= MAX_ENTRIES) break;
+    cache.delete(oldest);
+  }
+};
+
+export const peekCached = (url, params) => cache.get(cacheKey(url, params))?.data;
+
+export const cachedGet = (url, { params, force = false } = {}) => {
+  const key = cacheKey(url, params);
+  const entry = cache.get(key);
+  if (!force && entry && Date.now() - entry.time < FRESH_MS) return Promise.resolve(entry.data);
+  if (inflight.has(key)) return inflight.get(key);
+
+  const request = api
+    .get(url, {
+      params,
+      headers: entry?.etag ? { 'If-None-Match': entry.etag } : {},
+      validateStatus: (s) => (s >= 200 && s < 300) || s === 304,
+    })
+    .then((res) => {
+      const changed = res.status !== 304 || !entry;
+      const data = changed ? res.data : entry.data;
+      store(key, { data, etag: res.headers.etag || entry?.etag, time: Date.now() });
+      if (changed) notify(key, data);
+      return data;
+    })
+    .finally(() => inflight.delete(key));
+  inflight.set(key, request);
+  return request;
+};
+
+export const subscribe = (url, params, fn) => {
+  const key = cacheKey(url, params);
+  if (!listeners.has(key)) listeners.set(key, new Set());
+  listeners.get(key).add(fn);
+  return () => listeners.get(key).delete(fn);
+};
+
+// Revalidate every cached key under a URL prefix that someone is subscribed to; drop the rest
+// (or everything, with drop=true, once the resource is gone).
+export const invalidate = (prefix, { drop = false } = {}) => {
+  for (const key of [...cache.keys()]) {
+    if (!key.startsWith(prefix)) continue;
+    if (!drop && listeners.get(key)?.size) {
+      const [url, query] = key.split('?');
+      cachedGet(url, { params: query ? Object.fromEntries(new URLSearchParams(query)) : undefined, force: true })
+        .catch(() => {});
+    } else {
+      cache.delete(key);
+    }
+  }
+};
+
+export const clearCache = () => cache.clear();
+
 // --- Equipment ---
-export const uploadCSV = (file) => {
+// Pass an uploadId to receive upload_progress events for this upload (see services/events.js).
+export const uploadCSV = (file, uploadId) => {
   const formData = new FormData();
   formData.append('file', file);
   return api.post('/upload/', formData, {
     headers: { 'Content-Type': 'multipart/form-data' },
-  });
+    params: uploadId ? { upload_id: uploadId } : undefined,
+  }).then((res) => { invalidate('/history/'); return res; });
 };
 
-export const getHistory = () => api.get('/history/');
+export const getHistory = () => cachedGet('/history/');
+
+export const getDatasetSummary = (id) => cachedGet(`/dataset/${id}/summary/`);
 
-export const getDatasetDetail = (id) => api.get(`/dataset/${id}/`);
+export const getDatasetDetail = (id) => cachedGet(`/dataset/${id}/`);
 
-export const deleteDataset = (id) => api.delete(`/dataset/${id}/delete/`);
+export const getRecordsPage = (id, page, pageSize, ordering) =>
+  cachedGet(`/dataset/${id}/records/`, { params: { page, page_size: pageSize, ordering } });
+
+export const deleteDataset = (id) =>
+  api.delete(`/dataset/${id}/delete/`).then((res) => {
+    invalidate(`/dataset/${id}/`, { drop: true });
+    invalidate('/history/');
+    return res;
+  });
 
 export const downloadPDF = (id) =>
   api.get(`/dataset/${id}/report/`, { responseType: 'blob' });
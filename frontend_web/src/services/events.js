@@ -0,0 +1,90 @@
+import api, { invalidate } from './api';
+
+// Push channel from /api/events/ (server-sent events). It is read with fetch
+// rather than EventSource so the token can go in the Authorization header.
+// A dropped stream, or a long-poll response that ended, reconnects with
+// Last-Event-ID so nothing published in between is missed.
+const handlers = new Map();  // event type -> Set of callbacks
+let controller = null;
+let lastId = null;
+
+export const onEvent = (type, fn) => {
+  if (!handlers.has(type)) handlers.set(type, new Set());
+  handlers.get(type).add(fn);
+  return () => handlers.get(type).delete(fn);
+};
+
+const dispatch = (type, data) => {
+  // Keep cached reads current before any component hears about the change.
+  if (type === 'dataset_added' || type === 'dataset_updated' || type === 'dataset_deleted' || type === 'resync') {
+    invalidate('/history/');
+  }
+  if (type === 'dataset_updated') invalidate(`/dataset/${data.id}/`);
+  if (type === 'dataset_deleted') invalidate(`/dataset/${data.id}/`, { drop: true });
+  (handlers.get(type) || []).forEach((fn) => fn(data));
+};
+
+const parseBlock = (block) => {
+  const event = { type: 'message', data: [] };
+  block.split('\n').forEach((line) => {
+    if (!line || line.startsWith(':')) return;  // heartbeat comment
+    const i = line.indexOf(':');
+    const field = i < 0 ? line : line.slice(0, i);
+    const value = i < 0 ? '' : line.slice(i + 1).replace(/^ /, '');
+    if (field === 'data') event.data.push(value);
+    else if (field === 'event') event.type = value;
+    else if (field === 'id') event.id = value;
+    else if (field === 'retry') event.retry = parseInt(value, 10);
+  });
+  return event;
+};
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const listen = async (ctrl) => {
+  let retry = 2000;
+  while (!ctrl.signal.aborted) {
+    let ended = false;
+    try {
+      const headers = { Accept: 'text/event-stream', Authorization: `Token ${localStorage.getItem('chemviz_token')}` };
+      if (lastId) headers['Last-Event-ID'] = lastId;
+      const res = await fetch(`${api.defaults.baseURL}/events/`, { headers, signal: ctrl.signal });
+      if (res.status === 401) return;
+      if (!res.ok) throw new Error(`events: HTTP ${res.status}`);
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let end;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+          const event = parseBlock(buffer.slice(0, end));
+          buffer = buffer.slice(end + 2);
+          if (event.retry) retry = event.retry;
+          if (event.id) lastId = event.id;
+          if (event.data.length) dispatch(event.type, JSON.parse(event.data.join('\n')));
+        }
+      }
+      ended = true;
+    } catch (err) {
+      if (ctrl.signal.aborted) return;
+    }
+    // A long poll that ended normally reconnects at once; errors back off.
+    await sleep(ended ? 100 : retry);
+  }
+};
+
+export const startEvents = () => {
+  stopEvents();
+  controller = new AbortController();
+  listen(controller);
+};
+
+export const stopEvents = () => {
+  if (controller) controller.abort();
+  controller = null;
+  lastId = null;
+};
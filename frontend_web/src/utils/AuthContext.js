@@ -1,5 +1,6 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
-import { login as apiLogin, register as apiRegister } from '../services/api';
+import { login as apiLogin, register as apiRegister, clearCache } from '../services/api';
+import { startEvents, stopEvents } from '../services/events';
 
 const AuthContext = createContext(null);
 
@@ -18,11 +19,19 @@ export const AuthProvider = ({ children }) => {
     setLoading(false);
   }, []);
 
+  // One push channel per signed-in user; it keeps the cached history current.
+  useEffect(() => {
+    if (!user) return undefined;
+    startEvents();
+    return stopEvents;
+  }, [user]);
+
   const login = async (username, password) => {
     const res = await apiLogin(username, password);
     const { token, username: uname } = res.data;
     localStorage.setItem('chemviz_token', token);
     localStorage.setItem('chemviz_username', uname);
+    clearCache();
     setUser({ username: uname, token });
     return res.data;
   };
@@ -32,6 +41,7 @@ export const AuthProvider = ({ children }) => {
     const { token, username: uname } = res.data;
     localStorage.setItem('chemviz_token', token);
     localStorage.setItem('chemviz_username', uname);
+    clearCache();
     setUser({ username: uname, token });
     return res.data;
   };
@@ -39,6 +49,7 @@ export const AuthProvider = ({ children }) => {
   const logout = () => {
     localStorage.removeItem('chemviz_token');
     localStorage.removeItem('chemviz_username');
+    clearCache();
     setUser(null);
   };
 
@@ -0,0 +1,42 @@
+import { useState, useEffect, useCallback } from 'react';
+import { cacheKey, cachedGet, peekCached, subscribe } from '../services/api';
+
+/**
+ * Stale-while-revalidate read of an API URL. Cached data (if any) is returned
+ * immediately and replaced when the revalidation brings something newer.
+ * Pass a falsy url to skip the request.
+ */
+const useCachedGet = (url, params) => {
+  const key = url ? cacheKey(url, params) : null;
+  const [state, setState] = useState(() => ({
+    data: url ? peekCached(url, params) : undefined,
+    error: null,
+    validating: !!url,
+  }));
+
+  useEffect(() => {
+    if (!url) {
+      setState({ data: undefined, error: null, validating: false });
+      return undefined;
+    }
+    let active = true;
+    setState({ data: peekCached(url, params), error: null, validating: true });
+    const unsubscribe = subscribe(url, params, (data) => active && setState({ data, error: null, validating: false }));
+    cachedGet(url, { params })
+      .then((data) => active && setState({ data, error: null, validating: false }))
+      .catch((error) => active && setState((s) => ({ ...s, error, validating: false })));
+    return () => { active = false; unsubscribe(); };
+    // `key` already captures url and params.
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [key]);
+
+  const revalidate = useCallback(
+    () => (url ? cachedGet(url, { params, force: true }) : Promise.resolve(undefined)),
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [key],
+  );
+
+  return { ...state, revalidate };
+};
+
+export default useCachedGet;